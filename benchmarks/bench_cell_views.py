@@ -0,0 +1,49 @@
+"""
+Counts lists of cells built by `Field.cells` during one game and memory allocated for them,
+and time of the game.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_cell_views [games]
+"""
+import sys
+import time
+
+from seawar_core.seawar_core import Field
+from seawar_core.density import DensityStrategy
+from seawar_core.simulate import play_game
+
+
+def count_cell_lists(run):
+    """
+    Runs `run()` and returns (number of lists built by Field.cells, their size in bytes)
+    """
+    built = [0, 0]
+    original = Field.__dict__['cells']
+
+    def cells(field):
+        result = original.fget(field)
+        built[0] += 1
+        built[1] += sys.getsizeof(result)
+        return result
+    Field.cells = property(cells)
+    try:
+        run()
+    finally:
+        Field.cells = original
+    return built
+
+
+def main(games=50):
+    print(f'{"strategy":12}{"lists/game":>12}{"KB/game":>10}{"ms/game":>10}')
+    for name, strategy in (('probable', None), ('density', DensityStrategy)):
+        kwargs = dict(strategy=strategy) if strategy else {}
+        lists, size = count_cell_lists(lambda: [play_game(seed, **kwargs) for seed in range(games)])
+        start = time.perf_counter()
+        for seed in range(games):
+            play_game(seed, **kwargs)
+        spent = (time.perf_counter() - start) / games
+        print(f'{name:12}{lists / games:>12.1f}{size / games / 1024:>10.1f}{spent * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
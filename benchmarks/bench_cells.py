@@ -0,0 +1,105 @@
+"""
+Compares memory and attribute access of the cells built by `base_cell`
+with the cells of previous implementation (per-instance __dict__, checking
+`__setattr__` and lambda-backed properties).
+
+Run from the root of the repository:
+    python -m benchmarks.bench_cells
+"""
+import timeit
+import tracemalloc
+
+from seawar_core.seawar_core import CellField, CellTarget, UnknownCellValue
+
+
+def legacy_base_cell(values=None, default=None):
+
+    def decor(_classes=None):
+
+        _classes = _classes and (_classes if type(_classes) is list else [_classes]) or []
+        _values = values or []
+
+        class Cell(*_classes):
+
+            default_value = None
+
+            def is_value(self, value):
+                return self.value == value
+
+            def mark_value(self, value):
+                self.value = value
+
+            def __init__(self, x, y, value=None):
+                super(Cell, self).__init__()
+                self.x = x
+                self.y = y
+                self.value = value or self.default_value
+
+            def __setattr__(self, attr, value):
+                if attr == 'value' and value and self.VALUES and (
+                        value not in self.VALUES and value != self.default_value):
+                    raise UnknownCellValue()
+                return super(Cell, self).__setattr__(attr, value)
+
+        setattr(Cell, 'VALUES', values)
+
+        for v in _values:
+            setattr(Cell, f'is_{v}', property(lambda s, v=v: s.is_value(value=v)))
+            setattr(Cell, f'mark_{v}', (lambda s, v=v: s.mark_value(value=v)))
+            setattr(Cell, 'default_value',  default or values[0] or None)
+        return Cell
+    return decor
+
+
+@legacy_base_cell(['empty', 'ship', 'border'])
+class LegacyCellField:
+
+    def __init__(self):
+        self.is_shooted = False
+
+    def shoot(self):
+        self.is_shooted = True
+        return self.is_ship
+
+
+@legacy_base_cell(['hit', 'border', 'miss', 'probable'], 'empty')
+class LegacyCellTarget:
+    @property
+    def is_empty(self):
+        return self.value in ('empty', 'probable')
+
+    def mark_empty(self):
+        self.mark_value('empty')
+
+
+def memory_per_cell(cell_class, count=10000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    cells = [cell_class(i % 10, i // 10) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return (size - cells.__sizeof__()) / count
+
+
+def access_time(cell_class, statement, number=200000):
+    return timeit.timeit(statement, globals={'cell': cell_class(1, 1)}, number=number) / number * 1e9
+
+
+def main():
+    pairs = [('CellField', LegacyCellField, CellField), ('CellTarget', LegacyCellTarget, CellTarget)]
+    statements = {
+        'CellField': ['cell.value', 'cell.is_ship', 'cell.is_empty', 'cell.mark_ship()', 'cell.value = "border"'],
+        'CellTarget': ['cell.value', 'cell.is_hit', 'cell.is_empty', 'cell.mark_probable()', 'cell.value = "miss"'],
+    }
+    for name, legacy, current in pairs:
+        print(f'{name}')
+        print(f'\t{"memory per cell, bytes":32}{memory_per_cell(legacy):>10.1f}{memory_per_cell(current):>10.1f}')
+        for statement in statements[name]:
+            print(f'\t{statement + ", ns":32}'
+                  f'{access_time(legacy, statement):>10.1f}{access_time(current, statement):>10.1f}')
+
+
+if __name__ == '__main__':
+    print(f'\t{"":32}{"legacy":>10}{"slots":>10}')
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmarks of the hot paths of the core on several sizes of the field.
+Every benchmark is repeated REPEAT times, the best time per call (in microseconds) is reported.
+
+Results are saved as JSON; with --baseline they are compared with the saved results and
+the script fails (exit code 1) if something got slower than the baseline by more than --threshold.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_core --output results.json
+    python -m benchmarks.bench_core --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from seawar_core.seawar_core import STANDART_FLEET, Field, TargetField, ShipService
+from seawar_core.simulate import play_game
+
+REPEAT = 5
+BOARDS = {
+    (8, 8): [4, 3, 2, 2, 1, 1],
+    (10, 10): STANDART_FLEET,
+    (16, 16): STANDART_FLEET + [4, 3, 3, 2, 2],
+}
+
+
+def placed_field(board, fleet, seed=0):
+    field = Field(*board)
+    ShipService.put_ships_random(field, fleet, random.Random(seed))
+    return field
+
+
+def bench_field_init(board, fleet):
+    return lambda: Field(*board), 1
+
+
+def bench_get_available_vectors(board, fleet):
+    field = placed_field(board, fleet[:len(fleet) // 2])
+    return lambda: field.get_available_vectors(max(fleet)), 1
+
+
+def bench_put_ships_random(board, fleet):
+    rng = random.Random(0)
+    return lambda: ShipService.put_ships_random(Field(*board), fleet, rng), 1
+
+
+def bench_shoot_to(board, fleet):
+    # every call shoots to all cells of a new field, time is divided by the number of cells
+    coords = [(x, y) for y in range(board[1]) for x in range(board[0])]
+    fields = iter([placed_field(board, fleet, seed) for seed in range(REPEAT * 10)])
+
+    def run():
+        field = next(fields)
+        for x, y in coords:
+            ShipService.shoot_to(field, x, y)
+    return run, len(coords)
+
+
+def bench_get_ship_if_killed(board, fleet):
+    field = placed_field(board, fleet)
+    cells = [(cell.x, cell.y) for cell in field.cells if cell.is_ship]
+    for x, y in cells[::2]:
+        ShipService.shoot_to(field, x, y)
+
+    def run():
+        for x, y in cells:
+            ShipService.get_ship_if_killed(field, x, y)
+    return run, len(cells)
+
+
+def bench_is_fleet_killed(board, fleet):
+    field = placed_field(board, fleet)
+    return lambda: ShipService.is_fleet_killed(field), 1
+
+
+def bench_select_cell(board, fleet):
+    target = TargetField(*board, rng=random.Random(0))
+    for x, y in [(x, y) for y in range(0, board[1], 3) for x in range(0, board[0], 2)]:
+        target.shoot_response(x, y, False)
+    target.shoot_response(1, 1, True)
+    return target.select_cell, 1
+
+
+def bench_game(board, fleet):
+    seeds = iter(range(10 ** 9))
+    return lambda: play_game(next(seeds), fleet, board), 1
+
+
+BENCHMARKS = {
+    'field_init': (bench_field_init, 200),
+    'get_available_vectors': (bench_get_available_vectors, 50),
+    'put_ships_random': (bench_put_ships_random, 10),
+    'shoot_to': (bench_shoot_to, 1),
+    'get_ship_if_killed': (bench_get_ship_if_killed, 20),
+    'is_fleet_killed': (bench_is_fleet_killed, 10000),
+    'select_cell': (bench_select_cell, 1000),
+    'game': (bench_game, 2),
+}
+
+
+def measure(bench, number, board, fleet) -> float:
+    """
+    :return: best time of one call in microseconds
+    """
+    func, calls = bench(board, fleet)
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        spent = (time.perf_counter() - start) / (number * calls)
+        best = spent if best is None else min(best, spent)
+    return best * 1e6
+
+
+def run(names=None) -> dict:
+    results = {}
+    for (max_x, max_y), fleet in BOARDS.items():
+        for name, (bench, number) in BENCHMARKS.items():
+            if not names or name in names:
+                results[f'{max_x}x{max_y}/{name}'] = round(measure(bench, number, (max_x, max_y), fleet), 3)
+    return dict(
+        meta=dict(python=platform.python_version(), platform=platform.platform(), time=time.time()),
+        results=results)
+
+
+def compare(results, baseline, threshold) -> 'list((name, baseline, current, ratio))':
+    """
+    :return: benchmarks that are slower than in the baseline by more than `threshold` (0.2 - 20%)
+    """
+    return [(name, baseline[name], current, current / baseline[name]) for name, current in results.items()
+            if baseline.get(name) and current > baseline[name] * (1 + threshold)]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of the core hot paths')
+    parser.add_argument('--output', help='file to save results to (JSON)')
+    parser.add_argument('--baseline', help='file with saved results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown (0.2 - 20%%)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='run only these benchmarks')
+    args = parser.parse_args(args)
+
+    report = run(args.only)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    print(f'{"benchmark":36}{"us/call":>12}{"baseline":>12}{"ratio":>8}')
+    for name, current in report['results'].items():
+        old = baseline.get(name)
+        print(f'{name:36}{current:>12.3f}' + (f'{old:>12.3f}{current / old:>8.2f}' if old else ''))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    regressions = compare(report['results'], baseline, args.threshold)
+    for name, old, current, ratio in regressions:
+        print(f'REGRESSION {name}: {old:.3f} -> {current:.3f} us ({ratio:.2f}x)')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Load test of the session server: `sessions` games are played at once over a few connections,
+every game makes `shots` moves of the player. Prints p50 / p99 latency of every command.
+
+The server is started in a thread of this process (with --workers processes placing the ships)
+unless --connect (host:port) or --unix is given.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_server --sessions 10000 --connections 16 --shots 5
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+from seawar_core.server import SessionManager, MAX_LINE
+
+
+class Client:
+    """
+    One connection to the server, requests are pipelined and matched with responses by id
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = count(1)
+        self.waiting = {}
+        self.receiving = asyncio.ensure_future(self.receive())
+
+    @classmethod
+    async def connect(cls, host, port, path=None):
+        if path:
+            return cls(*await asyncio.open_unix_connection(path, limit=MAX_LINE))
+        return cls(*await asyncio.open_connection(host, port, limit=MAX_LINE))
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            self.waiting.pop(response['id']).set_result(response)
+
+    async def request(self, cmd, **kwargs) -> dict:
+        request_id = next(self.ids)
+        future = self.waiting[request_id] = asyncio.get_running_loop().create_future()
+        self.writer.write(json.dumps(dict(kwargs, id=request_id, cmd=cmd)).encode() + b'\n')
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        self.receiving.cancel()
+
+
+async def play(client, latencies, index, shots, board_size):
+    rng = random.Random(index)
+
+    async def timed(cmd, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(cmd, **kwargs)
+        latencies[cmd].append(time.perf_counter() - start)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response
+
+    session = (await timed('create', board_size=board_size, seed=index))['session']
+    cells = [(x, y) for x in range(board_size[0]) for y in range(board_size[1])]
+    rng.shuffle(cells)
+    for x, y in cells[:shots]:
+        if (await timed('shoot', session=session, x=x, y=y))['winner']:
+            break
+    await timed('status', session=session)
+    await timed('close', session=session)
+
+
+def start_server(workers) -> '(host, port)':
+    """
+    Starts the server in the daemon thread with its own event loop
+    """
+    started, address = threading.Event(), []
+
+    async def run():
+        executor = ProcessPoolExecutor(workers) if workers else None
+        server = await SessionManager(placement_executor=executor).start(port=0)
+        address.extend(server.sockets[0].getsockname()[:2])
+        started.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(run(), ), daemon=True).start()
+    started.wait()
+    return tuple(address)
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, len(values) * p // 100)] * 1000
+
+
+async def load(host, port, path, sessions, connections, shots, board_size):
+    clients = [await Client.connect(host, port, path) for _ in range(connections)]
+    latencies = defaultdict(list)
+    start = time.perf_counter()
+    await asyncio.gather(*(play(clients[i % connections], latencies, i, shots, board_size)
+                           for i in range(sessions)))
+    spent = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+
+    print(f'{sessions} sessions over {connections} connections: {spent:.1f} s, '
+          f'{sum(map(len, latencies.values())) / spent:.0f} requests/s')
+    print(f'{"command":10}{"requests":>10}{"p50 ms":>10}{"p99 ms":>10}')
+    for cmd, values in latencies.items():
+        values.sort()
+        print(f'{cmd:10}{len(values):>10}{percentile(values, 50):>10.2f}{percentile(values, 99):>10.2f}')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Load test of the session server')
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--shots', type=int, default=5, help='moves of the player in every game')
+    parser.add_argument('--board', type=int, nargs=2, default=(10, 10))
+    parser.add_argument('--workers', type=int, default=4,
+                        help='processes placing the ships in the started server (0 - threads)')
+    parser.add_argument('--connect', help='host:port of the running server')
+    parser.add_argument('--unix', help='path of the Unix socket')
+    args = parser.parse_args(args)
+
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+    elif args.unix:
+        host, port = None, None
+    else:
+        host, port = start_server(args.workers)
+    asyncio.run(load(host, port and int(port), args.unix, args.sessions, args.connections, args.shots,
+                     list(args.board)))
+
+
+if __name__ == '__main__':
+    main()
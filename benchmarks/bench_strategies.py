@@ -0,0 +1,51 @@
+"""
+Compares targeting strategies of TargetField: average number of shots per game
+and time spent per move (select_cell + apply_outcome).
+
+Run from the root of the repository:
+    python -m benchmarks.bench_strategies [games]
+"""
+import random
+import sys
+import time
+
+from seawar_core.seawar_core import Field, TargetField, ShipService, Outcome, ProbableStrategy
+from seawar_core.density import DensityStrategy
+from seawar_core.sampling import SamplingStrategy
+
+STRATEGIES = {
+    'probable': ProbableStrategy,
+    'density': DensityStrategy,
+    'sampling': SamplingStrategy,
+}
+
+
+def play(field, target):
+    shots, spent = 0, 0.
+    while True:
+        start = time.perf_counter()
+        x, y = target.select_cell()
+        outcome = ShipService.fire(field, x, y)
+        target.apply_outcome(outcome)
+        spent += time.perf_counter() - start
+        shots += 1
+        if outcome.result == Outcome.WIN:
+            return shots, spent
+
+
+def main(games=200):
+    print(f'{"strategy":12}{"shots/game":>12}{"ms/move":>10}')
+    for name, strategy in STRATEGIES.items():
+        random.seed(0)
+        total_shots, total_time = 0, 0.
+        for _ in range(games):
+            field = Field()
+            ShipService.put_ships_random(field)
+            shots, spent = play(field, TargetField(strategy=strategy()))
+            total_shots += shots
+            total_time += spent
+        print(f'{name:12}{total_shots / games:>12.1f}{total_time / total_shots * 1000:>10.3f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1 +1,8 @@
 from .seawar_core import *
+from .bitboard import *
+from .density import *
+
+try:
+    from .array_field import *
+except ImportError:     # numpy is optional
+    pass
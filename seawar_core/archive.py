@@ -0,0 +1,109 @@
+"""
+Archive of pre-generated fleet layouts.
+
+File is a header followed by fixed-size records: every record is `Field.to_bytes()` of the field
+with placed ships. Reader maps the file into memory, so archive of any size is not loaded into RAM
+and a field is restored straight from the mapped record.
+
+Generate the archive from the command line:
+    python -m seawar_core.archive layouts.bin 1000000 --size 10 10 --seed 1
+"""
+import argparse
+import mmap
+from random import Random, randrange
+from struct import Struct
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, STANDART_FLEET, SERIAL_HEADER, Field, ShipService
+
+ARCHIVE_MAGIC = b'SWLA'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = Struct('>4sBHHHIB')    # magic, version, max_x, max_y, record size, count, length of the fleet
+
+
+def record_size(max_x, max_y) -> int:
+    return SERIAL_HEADER.size + (max_x * max_y * Field.cell_bits() + 7) // 8
+
+
+def write_layouts(path, count, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), seed=None) -> int:
+    """
+    Generates `count` random layouts of the `fleet` and writes them to the file `path`.
+    Layouts are placed with `random.Random(seed)`, so the same seed gives the same archive.
+    :return: number of written bytes
+    """
+    fleet = list(fleet or STANDART_FLEET)
+    max_x, max_y = board_size
+    rng = Random(seed)
+    header = ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, max_x, max_y, record_size(max_x, max_y),
+                                 count, len(fleet)) + bytes(fleet)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for _ in range(count):
+            field = Field(max_x, max_y)
+            ShipService.put_ships_random(field, fleet, rng)
+            f.write(field.to_bytes())
+    return len(header) + count * record_size(max_x, max_y)
+
+
+class LayoutArchive:
+    """
+    Reader of the archive written by `write_layouts`. Records are restored with `field_class.unpack_from`
+    directly from the memory-mapped file
+    """
+
+    def __init__(self, path, field_class=Field):
+        self.field_class = field_class
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.max_x, self.max_y, self.record_size, self.count, fleet_size = \
+                ARCHIVE_HEADER.unpack_from(self.mmap)
+            if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+                raise ValueError(f'{path} is not an archive of layouts (version {ARCHIVE_VERSION})')
+            self.offset = ARCHIVE_HEADER.size + fleet_size
+            self.fleet = list(self.mmap[ARCHIVE_HEADER.size:self.offset])
+            if len(self.mmap) < self.offset + self.count * self.record_size:
+                raise ValueError(f'{path} is truncated')
+        except Exception:
+            self.mmap.close()
+            raise
+        self.view = memoryview(self.mmap)
+
+    def __repr__(self):
+        return f'<LayoutArchive (max_x={self.max_x}; max_y={self.max_y}; count={self.count})>'
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def field(self, index) -> Field:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.field_class.unpack_from(self.view, self.offset + index * self.record_size)[0]
+
+    def random_field(self, rng=None) -> Field:
+        return self.field(rng.randrange(self.count) if rng else randrange(self.count))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Generates archive of random fleet layouts')
+    parser.add_argument('path')
+    parser.add_argument('count', type=int)
+    parser.add_argument('--size', type=int, nargs=2, default=(DEFAULT_MAX_X, DEFAULT_MAX_Y), metavar=('X', 'Y'))
+    parser.add_argument('--fleet', type=int, nargs='+', default=STANDART_FLEET)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(args)
+    size = write_layouts(args.path, args.count, args.fleet, tuple(args.size), args.seed)
+    print(f'{args.count} layouts, {size} bytes written to {args.path}')
+
+
+if __name__ == '__main__':
+    main()
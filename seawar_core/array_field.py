@@ -0,0 +1,130 @@
+import numpy as np
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, Field, TargetField, ProxyCellField, ProxyCellTarget, \
+    SnapshotJournal, check_coord
+from .registry import ShipRegistry
+
+
+class ArrayField(SnapshotJournal, Field):
+    """
+    Field that keeps values of the cells in numpy `uint8` matrix (shape is (max_y, max_x)).
+    Every value is stored as its index in `codes`; shoots are kept in separate bool matrix
+    """
+    cell_class = ProxyCellField
+    free_values = ('empty', )
+
+    # noinspection PyMissingConstructor
+    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
+        self.max_x = max_x
+        self.max_y = max_y
+        self.ships = ShipRegistry()
+        default = self.cell_class.default_value
+        self.codes = [default] + [v for v in self.cell_class.VALUES if v != default]
+        self.code_by_value = {v: i for i, v in enumerate(self.codes)}
+        self.free_codes = [self.code_by_value[v] for v in self.free_values]
+        self.grid = np.zeros((max_y, max_x), dtype=np.uint8)
+        self.shot = np.zeros((max_y, max_x), dtype=bool)
+
+    def snapshot(self):
+        return self.grid.copy(), self.shot.copy(), self.ships.copy()
+
+    def restore(self, snapshot):
+        self.grid, self.shot, self.ships = snapshot
+
+    def value_at(self, x, y):
+        return self.codes[self.grid[y, x]]
+
+    def is_ship_code(self, code):
+        return code == self.code_by_value.get('ship')
+
+    def mark_at(self, x, y, value):
+        self.draw_coords([(x, y)], value)
+
+    def is_shooted_at(self, x, y):
+        return bool(self.shot[y, x])
+
+    def shoot_at(self, x, y, is_shooted=True):
+        if self.shot[y, x] != is_shooted:
+            self.shot[y, x] = is_shooted
+            if self.is_ship_code(self.grid[y, x]):
+                self.ships.hit(x, y) if is_shooted else self.ships.restore(x, y)
+
+    @property
+    def alive_cells(self):
+        return int(np.count_nonzero((self.grid == self.code_by_value.get('ship')) & ~self.shot))
+
+    def iter_cells(self):
+        return (self.cell_class(self, x, y) for y in range(self.max_y) for x in range(self.max_x))
+
+    def get(self, x, y):
+        return self.cell_class(self, x, y)
+
+    @check_coord
+    def set(self, x, y, value, is_shooted=False):
+        cell = self.get(x, y)
+        cell.value = value
+        cell.is_shooted = is_shooted
+
+    def draw_coords(self, coords, value):
+        if coords:
+            xs, ys = map(list, zip(*coords))
+            code = self.code_by_value[value]
+            if not self.is_ship_code(code):
+                for x, y in coords:
+                    self.is_ship_code(self.grid[y, x]) and self.ships.discard(x, y)
+            self.grid[ys, xs] = code
+
+    def draw_ship(self, coords):
+        self.draw_coords(coords, 'ship')
+
+    def draw_border(self, coords):
+        self.draw_coords(coords, 'border')
+
+    @property
+    def empty(self):
+        return np.isin(self.grid, self.free_codes)
+
+    def is_suitable_ship_vektor(self, coord_x, coord_y, length, is_vertical=False):
+        end_x, end_y = (coord_x, coord_y + length - 1) if is_vertical else (coord_x + length - 1, coord_y)
+        if length < 1 or not (self.is_correct_coord(coord_x, coord_y) and self.is_correct_coord(end_x, end_y)):
+            return False
+        return bool(self.empty[coord_y:end_y + 1, coord_x:end_x + 1].all())
+
+    @staticmethod
+    def windows(empty, length, axis):
+        """
+        Marks every cell from which `length` empty cells go along the `axis`.
+        Counts empty cells of every window as difference of cumulative sums
+        """
+        size = empty.shape[axis]
+        result = np.zeros(empty.shape, dtype=bool)
+        if 0 < length <= size:
+            total = np.cumsum(empty, axis=axis, dtype=np.int32)
+            total = np.concatenate([np.zeros_like(total.take([0], axis=axis)), total], axis=axis)
+            window = total.take(range(length, size + 1), axis=axis) - total.take(range(0, size - length + 1), axis=axis)
+            index = [slice(None)] * empty.ndim
+            index[axis] = slice(0, size - length + 1)
+            result[tuple(index)] = window == length
+        return result
+
+    def get_available_vectors(self, length):
+        empty = self.empty
+        # last axis is orientation: 0 - vertical, 1 - horizontal. np.nonzero walks the array
+        # in C-order, so vektors come in the same order as from Field.get_available_vectors
+        suitable = np.stack([self.windows(empty, length, 0), self.windows(empty, length, 1)], axis=-1)
+        return [(int(x), int(y), length, not orientation) for y, x, orientation in zip(*np.nonzero(suitable))]
+
+
+class ArrayTargetField(ArrayField, TargetField):
+    cell_class = ProxyCellTarget
+    free_values = ('empty', 'probable')
+
+    def select_cell(self):
+        probable = self.grid == self.code_by_value['probable']
+        ys, xs = np.nonzero(probable if probable.any() else self.empty)
+        return self.choice([(int(x), int(y)) for y, x in zip(ys, xs)])
+
+    def mark_killed(self, border, ship=None):
+        self.events is not None and self.events.kill(border, ship)
+        empty = self.empty
+        self.draw_coords([(x, y) for x, y in border if empty[y, x]], 'border')
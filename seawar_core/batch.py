@@ -0,0 +1,140 @@
+"""
+Lockstep engine for many independent games: N fields are kept in numpy arrays and every call
+processes all of them at once. Semantics mirror ShipService: `put_ships_random`, `shoot_to`
+(with the result of ShipService.fire) and `is_fleet_killed`.
+"""
+import numpy as np
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, STANDART_FLEET, Outcome, Field, ShipService
+from .array_field import ArrayField
+from .placement import PlacementError
+
+EMPTY, SHIP, BORDER = 0, 1, 2
+MISS, HIT, KILL, WIN = 0, 1, 2, 3
+RESULTS = (Outcome.MISS, Outcome.HIT, Outcome.KILL, Outcome.WIN)     # names of the codes of `shoot_to` results
+
+
+class BatchField:
+    """
+    N fields of the same size. Arrays of the state (first axis is the number of the field):
+        grid - codes of the cells (EMPTY / SHIP / BORDER), shape (n, max_y, max_x)
+        shot - shot cells
+        ship_id - number of the ship on the cell (-1 if there is no ship)
+        ship_alive - number of not shot cells of every ship, shape (n, number of ships)
+        vektors - (x, y, length, is_vertical) of every ship
+        alive_cells - number of not shot ship cells of every field
+    """
+
+    def __init__(self, n, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
+        self.n = n
+        self.max_x = max_x
+        self.max_y = max_y
+        self.grid = np.zeros((n, max_y, max_x), dtype=np.uint8)
+        self.shot = np.zeros((n, max_y, max_x), dtype=bool)
+        self.ship_id = np.full((n, max_y, max_x), -1, dtype=np.int16)
+        self.ship_alive = np.zeros((n, 0), dtype=np.int16)
+        self.vektors = np.zeros((n, 0, 4), dtype=np.int16)
+        self.alive_cells = np.zeros(n, dtype=np.int32)
+
+    def __repr__(self):
+        return f'<BatchField (n={self.n}; max_x={self.max_x}; max_y={self.max_y})>'
+
+    def __len__(self):
+        return self.n
+
+    def put_ships_random(self, fleet=None, rng=None, max_attempts=100):
+        """
+        Places the fleet on every field (fields are cleared). Ships are placed one by one
+        on random available vektors; fields where some ship didn't fit are placed again
+        :param rng: <numpy.random.Generator>. If it's not set - a new unseeded generator is used
+        :raise PlacementError: if some fields failed `max_attempts` times
+        """
+        fleet = list(fleet or STANDART_FLEET)
+        rng = rng or np.random.default_rng()
+        self.ship_alive = np.zeros((self.n, len(fleet)), dtype=np.int16)
+        self.vektors = np.zeros((self.n, len(fleet), 4), dtype=np.int16)
+        boards = np.arange(self.n)
+        for _ in range(max_attempts):
+            boards = boards[~self.place(boards, fleet, rng)]
+            if not len(boards):
+                return
+        raise PlacementError(f'Fleet {fleet} was not placed on {len(boards)} fields in {max_attempts} attempts')
+
+    def place(self, boards, fleet, rng) -> 'array(bool)':
+        """
+        Places the fleet on the `boards` (indexes of the fields).
+        :return: mask of the boards where all ships were placed
+        """
+        n = len(boards)
+        grid = np.zeros((n, self.max_y, self.max_x), dtype=np.uint8)
+        ship_id = np.full((n, self.max_y, self.max_x), -1, dtype=np.int16)
+        vektors = np.zeros((n, len(fleet), 4), dtype=np.int16)
+        placed = np.ones(n, dtype=bool)
+        rows = np.arange(n)
+        for number, length in enumerate(fleet):
+            empty = grid == EMPTY
+            # axis 1 is orientation: 0 - vertical, 1 - horizontal (same order as in get_available_vectors)
+            suitable = np.stack([ArrayField.windows(empty, length, 1), ArrayField.windows(empty, length, 2)], axis=1)
+            placed &= suitable.reshape(n, -1).any(axis=1)
+            # uniform choice of the suitable vektor: the biggest random score among suitable ones
+            choice = (rng.random(suitable.shape) * suitable).reshape(n, -1).argmax(axis=1)
+            orientation, y, x = np.unravel_index(choice, suitable.shape[1:])
+            is_vertical = orientation == 0
+
+            ship = np.zeros(grid.shape, dtype=bool)
+            for i in range(length):
+                ship[rows[placed], (y + i * is_vertical)[placed], (x + i * ~is_vertical)[placed]] = True
+            padded = np.pad(ship, ((0, 0), (1, 1), (1, 1)))
+            area = np.zeros(padded.shape, dtype=bool)
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    area[:, 1:-1, 1:-1] |= padded[:, 1 + dy:self.max_y + 1 + dy, 1 + dx:self.max_x + 1 + dx]
+            grid[area[:, 1:-1, 1:-1] & (grid == EMPTY)] = BORDER
+            grid[ship] = SHIP
+            ship_id[ship] = number
+            vektors[:, number] = np.stack([x, y, np.full(n, length), is_vertical], axis=1)
+
+        boards = boards[placed]
+        self.grid[boards] = grid[placed]
+        self.shot[boards] = False
+        self.ship_id[boards] = ship_id[placed]
+        self.vektors[boards] = vektors[placed]
+        self.ship_alive[boards] = fleet
+        self.alive_cells[boards] = sum(fleet)
+        return placed
+
+    def shoot_to(self, xs, ys, games=None) -> 'array(int)':
+        """
+        Makes one shot on every field (or on the fields with indexes `games`)
+        :return: codes of the results (MISS / HIT / KILL / WIN) like `Outcome.result` of ShipService.fire:
+            KILL and WIN - if the ship on the cell is killed, WIN - if all ships of the field are killed
+        """
+        games = np.arange(self.n) if games is None else np.asarray(games)
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        is_ship = self.grid[games, ys, xs] == SHIP
+        new_hit = is_ship & ~self.shot[games, ys, xs]
+        self.shot[games, ys, xs] = True
+
+        ids = self.ship_id[games, ys, xs].astype(np.intp)
+        np.subtract.at(self.ship_alive, (games[new_hit], ids[new_hit]), 1)
+        np.subtract.at(self.alive_cells, games[new_hit], 1)
+
+        killed = is_ship & (self.ship_alive[games, np.maximum(ids, 0)] == 0)
+        result = np.where(is_ship, HIT, MISS)
+        result[killed] = KILL
+        result[killed & (self.alive_cells[games] == 0)] = WIN
+        return result
+
+    def is_fleet_killed(self) -> 'array(bool)':
+        return self.alive_cells == 0
+
+    def field(self, index, field_class=Field) -> Field:
+        """
+        Copy of the field number `index` as a usual Field (with the same ships and shots)
+        """
+        field = field_class(self.max_x, self.max_y)
+        for x, y, length, is_vertical in self.vektors[index].tolist():
+            ShipService.put_ship(field, x, y, length, bool(is_vertical))
+        for y, x in zip(*np.nonzero(self.shot[index])):
+            ShipService.shoot_to(field, int(x), int(y))
+        return field
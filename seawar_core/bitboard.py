@@ -0,0 +1,189 @@
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, Field, TargetField, ProxyCellField, ProxyCellTarget, \
+    SnapshotJournal, check_coord
+from .registry import ShipRegistry
+
+
+class BitField(SnapshotJournal, Field):
+    """
+    Field that keeps every value of the cells as integer bitmask (one bit per cell).
+    Bit of the cell (x, y) has index y * (max_x + 1) + x. The extra column on the right
+    is never set, so shifting a mask by one bit can not wrap a line into the next row.
+    """
+    cell_class = ProxyCellField
+    free_values = ()
+
+    # noinspection PyMissingConstructor
+    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
+        self.max_x = max_x
+        self.max_y = max_y
+        self.ships = ShipRegistry()
+        self.stride = max_x + 1
+        self.board = sum(((1 << max_x) - 1) << (y * self.stride) for y in range(max_y))
+        self.layers = {v: 0 for v in self.cell_class.VALUES if v != self.cell_class.default_value}
+        self.shot = 0
+
+    def bit(self, x, y):
+        return 1 << (y * self.stride + x)
+
+    def mask_by_coords(self, coords):
+        mask = 0
+        for x, y in coords:
+            mask |= 1 << (y * self.stride + x)
+        return mask
+
+    def coords_by_mask(self, mask):
+        coords = []
+        while mask:
+            low = mask & -mask
+            y, x = divmod(low.bit_length() - 1, self.stride)
+            coords.append((x, y))
+            mask ^= low
+        return coords
+
+    def mask_by_vektor(self, coord_x, coord_y, length, is_vertical=False):
+        step = self.stride if is_vertical else 1
+        line = sum(1 << (i * step) for i in range(length))
+        return line << (coord_y * self.stride + coord_x)
+
+    @property
+    def occupied(self):
+        mask = 0
+        for value, layer in self.layers.items():
+            if value not in self.free_values:
+                mask |= layer
+        return mask
+
+    @property
+    def empty(self):
+        return self.board & ~self.occupied
+
+    def snapshot(self):
+        return dict(self.layers), self.shot, self.ships.copy()
+
+    def restore(self, snapshot):
+        self.layers, self.shot, self.ships = snapshot
+
+    def value_at(self, x, y):
+        bit = self.bit(x, y)
+        for value, layer in self.layers.items():
+            if layer & bit:
+                return value
+        return self.cell_class.default_value
+
+    def mark_at(self, x, y, value):
+        self.draw_mask(self.bit(x, y), value)
+
+    def is_shooted_at(self, x, y):
+        return bool(self.shot & self.bit(x, y))
+
+    def shoot_at(self, x, y, is_shooted=True):
+        bit = self.bit(x, y)
+        if bool(self.shot & bit) != is_shooted:
+            self.shot ^= bit
+            if self.layers.get('ship', 0) & bit:
+                self.ships.hit(x, y) if is_shooted else self.ships.restore(x, y)
+
+    @property
+    def alive_cells(self):
+        return bin(self.layers.get('ship', 0) & ~self.shot).count('1')
+
+    def draw_mask(self, mask, value):
+        if value != 'ship':
+            for x, y in self.coords_by_mask(self.layers.get('ship', 0) & mask):
+                self.ships.discard(x, y)
+        for v, layer in self.layers.items():
+            self.layers[v] = layer | mask if v == value else layer & ~mask
+
+    def iter_cells(self):
+        return (self.cell_class(self, x, y) for y in range(self.max_y) for x in range(self.max_x))
+
+    def get(self, x, y):
+        return self.cell_class(self, x, y)
+
+    @check_coord
+    def set(self, x, y, value, is_shooted=False):
+        cell = self.get(x, y)
+        cell.value = value
+        cell.is_shooted = is_shooted
+
+    def draw_ship(self, coords):
+        self.draw_mask(self.mask_by_coords(coords), 'ship')
+
+    def draw_border(self, coords):
+        self.draw_mask(self.mask_by_coords(coords), 'border')
+
+    def vektor_starts_mask(self, length, step):
+        empty = self.empty
+        mask = empty if length > 0 else 0
+        for i in range(1, length):
+            mask &= empty >> (i * step)
+        return mask
+
+    def get_available_vectors(self, length):
+        vertical = self.vektor_starts_mask(length, self.stride)
+        horizontal = self.vektor_starts_mask(length, 1)
+        vektors = []
+        for x, y in self.coords_by_mask(vertical | horizontal):
+            bit = self.bit(x, y)
+            vertical & bit and vektors.append((x, y, length, True))
+            horizontal & bit and vektors.append((x, y, length, False))
+        return vektors
+
+    def is_suitable_ship_vektor(self, coord_x, coord_y, length, is_vertical=False):
+        end_x, end_y = (coord_x, coord_y + length - 1) if is_vertical else (coord_x + length - 1, coord_y)
+        if length < 1 or not (self.is_correct_coord(coord_x, coord_y) and self.is_correct_coord(end_x, end_y)):
+            return False
+        return not self.occupied & self.mask_by_vektor(coord_x, coord_y, length, is_vertical)
+
+    def dilate(self, mask):
+        mask |= (mask << 1) | (mask >> 1)
+        mask |= (mask << self.stride) | (mask >> self.stride)
+        return mask & self.board
+
+    def borders_mask(self, coord_x, coord_y, length, is_vertical=False):
+        ship = self.mask_by_vektor(coord_x, coord_y, length, is_vertical) & self.board
+        return self.dilate(ship) & ~ship
+
+    def borders_by_vektor(self, coord_x, coord_y, length, is_vertical=False):
+        return self.coords_by_mask(self.borders_mask(coord_x, coord_y, length, is_vertical))
+
+    def line_mask(self, mask, layer, step):
+        while True:
+            grown = (mask | (mask << step) | (mask >> step)) & layer
+            if grown == mask:
+                return mask
+            mask = grown
+
+    def get_ship_by_cell(self, coord_x, coord_y):
+        if not self.is_correct_coord(coord_x, coord_y):
+            return []
+        ships = self.layers['ship']
+        bit = self.bit(coord_x, coord_y) & ships
+        if not bit:
+            return []
+        return self.coords_by_mask(self.line_mask(bit, ships, 1) | self.line_mask(bit, ships, self.stride))
+
+    def is_fleet_killed(self):
+        return not self.layers['ship'] & ~self.shot
+
+
+class BitTargetField(BitField, TargetField):
+    cell_class = ProxyCellTarget
+    free_values = ('probable', )
+
+    def select_cell(self):
+        return self.choice(self.coords_by_mask(self.layers['probable'] or self.empty))
+
+    def mark_probably_cells(self, x, y):
+        bit = self.bit(x, y)
+        ribs = bit << 1 | bit >> 1 | bit << self.stride | bit >> self.stride
+        self.draw_mask(ribs & self.empty, 'probable')
+
+    def mark_improbable_cells(self, x, y):
+        bit = self.bit(x, y)
+        line = bit << 1 | bit >> 1
+        self.draw_mask((line << self.stride | line >> self.stride) & self.empty, 'border')
+
+    def mark_killed(self, border, ship=None):
+        self.events is not None and self.events.kill(border, ship)
+        self.draw_mask(self.mask_by_coords(border) & self.empty, 'border')
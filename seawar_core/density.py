@@ -0,0 +1,136 @@
+from collections import Counter
+
+from .seawar_core import ProbableStrategy
+
+
+class DensityStrategy(ProbableStrategy):
+    """
+    Targeting strategy that shoots to the cell covered by the biggest number of placements
+    of the ships that are still alive.
+
+    Placement (vektor) can't go through missed cells, borders and killed ships. Every placement
+    of a ship with length L is counted as many times as there are alive ships of length L,
+    and placements that go through wounded (hit) cells get HIT_WEIGHT more for every such cell.
+    Weights of the placements are added to `heat` of their cells. Changes of the target field
+    update only placements that go through the changed cell, so the map is never rebuilt
+    """
+    HIT_WEIGHT = 50
+
+    def attach(self, field):
+        self.max_x = field.max_x
+        self.alive = Counter(self.fleet)
+        self.heat = [0] * (field.max_x * field.max_y)
+        self.vektor_cells = []      # positions of the cells of every vektor
+        self.vektor_length = []
+        self.blocked = []           # number of blocked cells on the vektor: it's available only if there are none
+        self.hits = []              # number of hit cells on the vektor
+        self.by_cell = [[] for _ in self.heat]
+        self.by_length = {}
+        self.killed = []            # was the number of alive ships decreased by every ship_killed
+
+        for length in sorted(self.alive):
+            for y in range(field.max_y):
+                for x in range(field.max_x):
+                    for is_vertical in ((True, False) if length > 1 else (False, )):   # a cell has one orientation
+                        if (y if is_vertical else x) + length > (field.max_y if is_vertical else field.max_x):
+                            continue
+                        step = field.max_x if is_vertical else 1
+                        self.add_vektor(length, [y * field.max_x + x + i * step for i in range(length)])
+
+        for cell in field.iter_cells():
+            self.cell_changed(cell.x, cell.y, cell.default_value, cell.value)
+
+    def add_vektor(self, length, cells):
+        index = len(self.vektor_cells)
+        self.vektor_cells.append(cells)
+        self.vektor_length.append(length)
+        self.blocked.append(0)
+        self.hits.append(0)
+        self.by_length.setdefault(length, []).append(index)
+        for position in cells:
+            self.by_cell[position].append(index)
+        self.apply(index, 1)
+
+    def weight(self, index):
+        if self.blocked[index]:
+            return 0
+        return self.alive[self.vektor_length[index]] * (1 + self.HIT_WEIGHT * self.hits[index])
+
+    def apply(self, index, sign):
+        weight = sign * self.weight(index)
+        if weight:
+            for position in self.vektor_cells[index]:
+                self.heat[position] += weight
+
+    def update_vektors(self, indexes, counter, delta):
+        for index in indexes:
+            self.apply(index, -1)
+            counter[index] += delta
+            self.apply(index, 1)
+
+    def cell_changed(self, x, y, old_value, value):
+        position = y * self.max_x + x
+        for v, delta in ((old_value, -1), (value, 1)):
+            if v in ('miss', 'border'):
+                self.update_vektors(self.by_cell[position], self.blocked, delta)
+            elif v == 'hit':
+                self.update_vektors(self.by_cell[position], self.hits, delta)
+
+    def ship_killed(self, field, border, ship=None):
+        ship = ship or self.ship_by_border(border, field)
+        if not ship:
+            return
+        for x, y in ship:
+            self.update_vektors(self.by_cell[y * self.max_x + x], self.blocked, 1)
+        length = len(ship)
+        self.killed.append(bool(self.alive[length]))
+        if self.alive[length]:
+            self.update_alive(length, -1)
+
+    def ship_revived(self, field, border, ship=None):
+        ship = ship or self.ship_by_border(border, field)
+        if not ship:
+            return
+        if self.killed.pop():
+            self.update_alive(len(ship), 1)
+        for x, y in ship:
+            self.update_vektors(self.by_cell[y * self.max_x + x], self.blocked, -1)
+
+    def update_alive(self, length, delta):
+        for index in self.by_length.get(length, ()):
+            self.apply(index, -1)
+        self.alive[length] += delta
+        for index in self.by_length.get(length, ()):
+            self.apply(index, 1)
+
+    @staticmethod
+    def ship_by_border(border, field=None):
+        """
+        Border and the ship together fill a rectangle (even if it's clipped by edges of the field),
+        so the ship is the part of the bounding box of the border that is not the border.
+        Ship that spans the whole side of the field at its edge has a border of one line only:
+        the ship is the same line of hit cells next to it, so `field` is needed to find it
+        """
+        if not border:
+            return []
+        xs, ys = [x for x, _ in border], [y for _, y in border]
+        cells = set(border)
+        ship = [(x, y) for y in range(min(ys), max(ys) + 1) for x in range(min(xs), max(xs) + 1)
+                if (x, y) not in cells]
+        if ship or field is None:
+            return ship
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ship = [(x + dx, y + dy) for x, y in border]
+            if all(field.is_correct_coord(x, y) and field.get(x, y).value == 'hit' for x, y in ship):
+                return ship
+        return []
+
+    def select_cell(self, field):
+        best, cells = 0, []
+        for x, y in field.empty_cells:
+            heat = self.heat[y * self.max_x + x]
+            if heat > best:
+                best, cells = heat, [(x, y)]
+            elif heat == best and best:
+                cells.append((x, y))
+        return field.choice(cells) if cells else super(DensityStrategy, self).select_cell(field)
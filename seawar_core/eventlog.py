@@ -0,0 +1,277 @@
+"""
+Append-only binary log of the games and replay of it.
+
+Recorded fields report every placement of a ship (ShipService.put_ship), every shot
+(ShipService.shoot_to, ShipService.fire, TargetField.shoot_response), every killed ship
+(TargetField.mark_killed) and checkpoints, rollbacks and commits of the journal to the log.
+Nothing is recorded for fields that are not recorded:
+
+    with EventLog('games.log') as log:
+        game = log.record(user_field, computer_field, target_field)
+        ...                                  # ships are placed and shots are made as usual
+        log.finish(user_field, computer_field, target_field)
+
+    for game, fields in replay('games.log', turn=10):   # state of every game after 10 shots
+        ...
+
+Every record is a kind (1 byte), id of the board (4 bytes) and fixed fields of the kind; the kill record
+is followed by the coords of the ship and of the border. Every opening of the log for writing starts
+a new segment and ids of the boards restart in it. The reader goes through the log in chunks and
+keeps only the games that are not finished yet, so the size of the log doesn't matter.
+Moves that were rolled back are undone by the replay with the journal of the replayed field.
+"""
+import argparse
+from collections import namedtuple, Counter
+from itertools import count
+from struct import Struct
+
+from .seawar_core import Field, TargetField, ShipService, Outcome
+
+SEGMENT, BOARD, PLACEMENT, SHOT, OUTCOME, KILL, END, CHECKPOINT, ROLLBACK, COMMIT = range(10)
+EVENT_NAMES = ('segment', 'board', 'placement', 'shot', 'outcome', 'kill', 'end', 'checkpoint', 'rollback', 'commit')
+EVENT_MAGIC = b'SWEL'
+EVENT_VERSION = 1
+RECORDS = {
+    SEGMENT: Struct('>BI4sB'),      # kind, 0, magic, version
+    BOARD: Struct('>BIIBHH'),       # kind, board, game, serial kind of the field, max_x, max_y
+    PLACEMENT: Struct('>BIHHHB'),   # kind, board, x, y, length, is_vertical
+    SHOT: Struct('>BIHHB'),         # kind, board, x, y, is hit
+    OUTCOME: Struct('>BIHHB'),      # kind, board, x, y, index of the result in OUTCOMES
+    KILL: Struct('>BIHH'),          # kind, board, cells of the ship, cells of the border
+    END: Struct('>BI'),             # kind, board
+    CHECKPOINT: Struct('>BI'),      # kind, board
+    ROLLBACK: Struct('>BIH'),       # kind, board, number of the checkpoints left
+    COMMIT: Struct('>BI'),          # kind, board
+}
+COORD = Struct('>HH')
+OUTCOMES = (Outcome.MISS, Outcome.HIT, Outcome.KILL, Outcome.WIN)
+CHUNK_SIZE = 1 << 20
+
+Event = namedtuple('Event', 'kind board args')
+
+
+class BoardRecorder:
+    """
+    Writes events of one field to the log. Is set as `events` of the recorded field
+    """
+    __slots__ = ('write', 'board')
+
+    def __init__(self, write, board):
+        self.write = write
+        self.board = board
+
+    def placement(self, x, y, length, is_vertical):
+        self.write(RECORDS[PLACEMENT].pack(PLACEMENT, self.board, x, y, length, is_vertical))
+
+    def shot(self, x, y, is_hit):
+        self.write(RECORDS[SHOT].pack(SHOT, self.board, x, y, bool(is_hit)))
+
+    def outcome(self, outcome: Outcome):
+        self.write(RECORDS[OUTCOME].pack(OUTCOME, self.board, outcome.x, outcome.y, OUTCOMES.index(outcome.result)))
+
+    def kill(self, border, ship=None):
+        ship, border = ship or [], list(border)
+        self.write(RECORDS[KILL].pack(KILL, self.board, len(ship), len(border)) +
+                   b''.join(COORD.pack(x, y) for x, y in ship + border))
+
+    def checkpoint(self):
+        self.write(RECORDS[CHECKPOINT].pack(CHECKPOINT, self.board))
+
+    def rollback(self, checkpoints_left):
+        self.write(RECORDS[ROLLBACK].pack(ROLLBACK, self.board, checkpoints_left))
+
+    def commit(self):
+        self.write(RECORDS[COMMIT].pack(COMMIT, self.board))
+
+
+class EventLog:
+    """
+    Writer of the log. `target` - path of the file (it's opened for appending) or binary stream
+    """
+
+    def __init__(self, target):
+        self.stream = open(target, 'ab') if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__') \
+            else target
+        self.own_stream = self.stream is not target
+        self.boards = count(1)
+        self.games = count(1)
+        self.stream.write(RECORDS[SEGMENT].pack(SEGMENT, 0, EVENT_MAGIC, EVENT_VERSION))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, *fields, game=None) -> int:
+        """
+        Starts recording of the fields of one game
+        :return: id of the game (next one if `game` is None)
+        """
+        game = next(self.games) if game is None else game
+        for field in fields:
+            board = next(self.boards)
+            self.stream.write(RECORDS[BOARD].pack(BOARD, board, game, field.serial_kind, field.max_x, field.max_y))
+            field.events = BoardRecorder(self.stream.write, board)
+            for _ in field.checkpoints:     # checkpoints made before the recording
+                field.events.checkpoint()
+        return game
+
+    def finish(self, *fields):
+        """
+        Stops recording of the fields: the reader forgets the game when all its fields are finished
+        """
+        for field in fields:
+            self.stream.write(RECORDS[END].pack(END, field.events.board))
+            field.events = None
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self.own_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def iter_events(source, chunk_size=CHUNK_SIZE) -> 'generator(Event)':
+    """
+    Events of the log. `source` - path of the file or binary stream
+    :raise ValueError: if the log is broken or truncated
+    """
+    stream = open(source, 'rb') if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__') else source
+    try:
+        buffer, offset, position = b'', 0, 0
+        while True:
+            data = stream.read(chunk_size)
+            buffer, offset = buffer[offset:] + data, 0
+            while offset < len(buffer):
+                kind = buffer[offset]
+                record = RECORDS.get(kind)
+                if record is None or (not position and kind != SEGMENT):
+                    raise ValueError(f'Broken log: unknown record at byte {position}')
+                size = record.size
+                if offset + size > len(buffer):
+                    break
+                values = record.unpack_from(buffer, offset)
+                if kind == KILL:
+                    size += (values[2] + values[3]) * COORD.size
+                    if offset + size > len(buffer):
+                        break
+                    coords = [COORD.unpack_from(buffer, offset + record.size + i * COORD.size)
+                              for i in range(values[2] + values[3])]
+                    args = (coords[values[2]:], coords[:values[2]] or None)
+                elif kind == SEGMENT:
+                    if values[2:] != (EVENT_MAGIC, EVENT_VERSION):
+                        raise ValueError(f'Broken log: not a log of the games (version {EVENT_VERSION})')
+                    args = ()
+                elif kind == PLACEMENT:
+                    args = values[2:5] + (bool(values[5]), )
+                elif kind == SHOT:
+                    args = values[2:4] + (bool(values[4]), )
+                elif kind == OUTCOME:
+                    args = values[2:4] + (OUTCOMES[values[4]], )
+                else:
+                    args = values[2:]
+                offset += size
+                position += size
+                yield Event(kind, values[1], args)
+            if not data:
+                if offset < len(buffer):
+                    raise ValueError(f'Broken log: truncated record at byte {position}')
+                return
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def default_field_classes() -> 'dict(serial kind: class)':
+    return {Field.serial_kind: Field, TargetField.serial_kind: TargetField}
+
+
+def replay(source, turn=None, game=None, field_classes=None) -> 'generator((game, list(field)))':
+    """
+    Replays the log: yields id of the game and its fields (in the order they were recorded) when
+    all fields of the game are finished or the segment of the log is over.
+    Shots are applied to the fields, targeting strategies are not run. Rollbacks are replayed
+    with the journal of the field, so `field_classes` should support checkpoint / rollback.
+    :param turn: number of the shots to apply to every field (a kill belongs to the shot before it),
+                 None - all of them
+    :param game: id of the only game to replay, other games are skipped without building their fields
+    :param field_classes: <dict> classes of the fields by `serial_kind` (see `default_field_classes`)
+    """
+    field_classes = field_classes or default_field_classes()
+    games, boards = {}, {}      # game: [game, fields, boards not finished],
+    # board: [state of the game, field, shots, (shots, checkpoint of the field) of every checkpoint]
+
+    for event in iter_events(source):
+        kind = event.kind
+        if kind == BOARD:
+            game_id, serial_kind, max_x, max_y = event.args
+            if game is not None and game_id != game:
+                continue
+            field = field_classes[serial_kind](max_x, max_y)
+            state = games.setdefault(game_id, [game_id, [], 0])
+            state[1].append(field)
+            state[2] += 1
+            boards[event.board] = [state, field, 0, []]
+            continue
+        if kind == SEGMENT:
+            boards.clear()
+            yield from ((game_id, state[1]) for game_id, state in games.items())
+            games.clear()
+            continue
+        if event.board not in boards:
+            continue
+        board = boards[event.board]
+        state, field = board[:2]
+        if kind == END:
+            del boards[event.board]
+            state[2] -= 1
+            if not state[2]:
+                del games[state[0]]
+                yield state[0], state[1]
+        elif kind == PLACEMENT:
+            ShipService.put_ship(field, *event.args)
+        elif kind in (SHOT, OUTCOME):
+            board[2] += 1
+            if turn is not None and board[2] > turn:
+                continue
+            if isinstance(field, TargetField):
+                field.shoot_response(*event.args[:2], event.args[2] not in (False, Outcome.MISS))
+            else:
+                ShipService.shoot_to(field, *event.args[:2])
+        elif kind == KILL and (turn is None or board[2] <= turn):
+            field.mark_killed(*event.args)
+        elif kind == CHECKPOINT:
+            board[3].append((board[2], field.checkpoint()))
+        elif kind == ROLLBACK:
+            left, = event.args
+            if left < len(board[3]):
+                board[2], checkpoint = board[3][left]
+                field.rollback(checkpoint)
+                del board[3][left:]
+        elif kind == COMMIT:
+            field.commit()
+            board[3] and board[3].pop()
+    yield from ((game_id, state[1]) for game_id, state in games.items())
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Prints the log of the games')
+    parser.add_argument('path')
+    parser.add_argument('--game', type=int, help='prints fields of the game')
+    parser.add_argument('--turn', type=int, help='... after this number of the shots to every field')
+    args = parser.parse_args(args)
+    if args.game is None:
+        counter = Counter(EVENT_NAMES[event.kind] for event in iter_events(args.path))
+        print(', '.join(f'{name}: {counter[name]}' for name in EVENT_NAMES))
+        return
+    for _, fields in replay(args.path, args.turn, args.game):
+        for field in fields:
+            print(field, end='\n\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+GEOMETRY_CACHE_SIZE = 32
+PRECOMPUTE_LIMIT = 10000     # tables of bigger fields are not kept: coords are computed on every request
+
+RIBS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+CORNERS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class Geometry:
+    """
+    Tables of ribs, corners and borders of the cells for the field of one size.
+    All coordinates in the tables are inside of the field. Tables are kept as tuples
+    and are filled only once: ribs and corners - for every cell in the constructor,
+    borders - for every vektor on its first request. Tables of the fields bigger than
+    PRECOMPUTE_LIMIT are not filled at all, so their memory doesn't grow with the requests
+    """
+
+    def __init__(self, max_x, max_y):
+        self.max_x = max_x
+        self.max_y = max_y
+        self.ribs_table = {}
+        self.corners_table = {}
+        self.borders_table = {}
+        self.is_cached = max_x * max_y <= PRECOMPUTE_LIMIT
+        if self.is_cached:
+            for y in range(max_y):
+                for x in range(max_x):
+                    self.ribs(x, y)
+                    self.corners(x, y)
+
+    def __repr__(self):
+        return f'<Geometry (max_x={self.max_x}; max_y={self.max_y})>'
+
+    def shifted(self, x, y, shifts):
+        return tuple((x + dx, y + dy) for dx, dy in shifts
+                     if 0 <= x + dx < self.max_x and 0 <= y + dy < self.max_y)
+
+    def ribs(self, x, y) -> 'tuple(coord)':
+        coords = self.ribs_table.get((x, y))
+        if coords is None:
+            coords = self.shifted(x, y, RIBS)
+            if self.is_cached:
+                self.ribs_table[(x, y)] = coords
+        return coords
+
+    def corners(self, x, y) -> 'tuple(coord)':
+        coords = self.corners_table.get((x, y))
+        if coords is None:
+            coords = self.shifted(x, y, CORNERS)
+            if self.is_cached:
+                self.corners_table[(x, y)] = coords
+        return coords
+
+    def borders(self, x, y, length, is_vertical=False) -> 'tuple(coord)':
+        key = (x, y, length, is_vertical)
+        coords = self.borders_table.get(key)
+        if coords is None:
+            end_x, end_y = (x, y + length - 1) if is_vertical else (x + length - 1, y)
+            coords = tuple(
+                (i, j)
+                for j in range(max(y - 1, 0), min(end_y + 1, self.max_y - 1) + 1)
+                for i in range(max(x - 1, 0), min(end_x + 1, self.max_x - 1) + 1)
+                if not (x <= i <= end_x and y <= j <= end_y))
+            if self.is_cached:
+                self.borders_table[key] = coords
+        return coords
+
+
+@lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def geometry(max_x, max_y) -> Geometry:
+    """
+    Geometry of the field with the size (max_x, max_y). Geometries of last used sizes are cached
+    """
+    return Geometry(max_x, max_y)
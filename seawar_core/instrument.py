@@ -0,0 +1,167 @@
+"""
+Opt-in instrumentation of the hot paths: number of calls, cumulative time, percentiles of time
+and cells scanned per call (calls of `Field.get` and cells iterated by `Field.iter_cells`).
+
+Methods are wrapped only while instrumentation is enabled and are restored after it,
+so disabled instrumentation costs nothing:
+
+    with instrument() as probe:
+        play_game(1)
+    print(probe.to_json())
+"""
+import json
+import time
+from collections import deque
+from functools import wraps
+
+from .seawar_core import Field, Matrix, ShipService, TargetField
+
+SAMPLES_LIMIT = 10000       # number of the last timings of every method kept for percentiles
+PERCENTILES = (50, 90, 99)
+TARGET_FIELD_METHODS = ('select_cell', 'shoot_response', 'mark_probably_cells', 'mark_improbable_cells',
+                        'mark_killed', 'apply_outcome')
+
+
+def static_methods(cls) -> 'list(name)':
+    return [name for name, attr in vars(cls).items()
+            if not name.startswith('_') and isinstance(attr, (staticmethod, classmethod))]
+
+
+def default_targets() -> 'dict(class: names of methods)':
+    return {
+        ShipService: static_methods(ShipService),
+        Matrix: static_methods(Matrix),
+        TargetField: list(TARGET_FIELD_METHODS),
+    }
+
+
+class CallStats:
+    __slots__ = ('calls', 'total', 'cells', 'timings')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.calls = 0
+        self.total = 0.
+        self.cells = 0
+        self.timings = deque(maxlen=SAMPLES_LIMIT)
+
+    def add(self, spent, cells):
+        self.calls += 1
+        self.total += spent
+        self.cells += cells
+        self.timings.append(spent)
+
+    def as_dict(self) -> dict:
+        timings = sorted(self.timings)
+        result = dict(calls=self.calls, total_ms=self.total * 1000, mean_ms=self.total / self.calls * 1000)
+        for p in PERCENTILES:
+            result[f'p{p}_ms'] = timings[min(len(timings) - 1, len(timings) * p // 100)] * 1000
+        result.update(max_ms=timings[-1] * 1000, cells=self.cells, cells_per_call=self.cells / self.calls)
+        return result
+
+
+class Instrumentation:
+    """
+    Wraps methods of `targets` ({class: [names of methods]}, see `default_targets`) while enabled.
+    Only one instrumentation can be enabled at a time. Time and cells of a method include nested calls
+    """
+    active = None
+
+    def __init__(self, targets=None):
+        self.targets = targets or default_targets()
+        self.stats = {}
+        self.scanned = 0
+        self.originals = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return Instrumentation.active is self
+
+    def wrap(self, name, func):
+        stats = self.stats.setdefault(name, CallStats())
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            scanned, start = self.scanned, time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add(time.perf_counter() - start, self.scanned - scanned)
+        return wrapper
+
+    def patch(self, cls, name, attr):
+        self.originals.append((cls, name, vars(cls)[name]))
+        setattr(cls, name, attr)
+
+    def enable(self):
+        if Instrumentation.active is not None:
+            raise RuntimeError('Another instrumentation is enabled')
+        unknown = [f'{cls.__name__}.{name}' for cls, names in self.targets.items()
+                   for name in names if name not in vars(cls)]
+        if unknown:
+            raise KeyError(f'Unknown methods: {", ".join(unknown)}')
+        Instrumentation.active = self
+        try:
+            for cls, names in self.targets.items():
+                for name in names:
+                    attr = vars(cls)[name]
+                    full_name = f'{cls.__name__}.{name}'
+                    if isinstance(attr, (staticmethod, classmethod)):
+                        self.patch(cls, name, type(attr)(self.wrap(full_name, attr.__func__)))
+                    else:
+                        self.patch(cls, name, self.wrap(full_name, attr))
+
+            get, iter_cells = Field.get, Field.iter_cells
+
+            def counted_get(field, x, y):
+                self.scanned += 1
+                return get(field, x, y)
+
+            def counted_iter_cells(field):
+                for cell in iter_cells(field):
+                    self.scanned += 1
+                    yield cell
+            self.patch(Field, 'get', counted_get)
+            self.patch(Field, 'iter_cells', counted_iter_cells)
+        except Exception:
+            self.disable()     # nothing stays patched
+            raise
+
+    def disable(self):
+        for cls, name, attr in reversed(self.originals):
+            setattr(cls, name, attr)
+        self.originals = []
+        if Instrumentation.active is self:
+            Instrumentation.active = None
+
+    def reset(self):
+        """
+        Clears the stats. Stats are cleared in place: wrappers of the enabled instrumentation keep them
+        """
+        for stats in self.stats.values():
+            stats.clear()
+        self.scanned = 0
+
+    def snapshot(self) -> 'dict(name: dict)':
+        """
+        Stats of the called methods, the most expensive ones first
+        """
+        called = sorted(((name, stats) for name, stats in self.stats.items() if stats.calls),
+                        key=lambda item: -item[1].total)
+        return {name: stats.as_dict() for name, stats in called}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+
+def instrument(targets=None) -> Instrumentation:
+    return Instrumentation(targets)
@@ -0,0 +1,252 @@
+from collections import Counter
+from functools import lru_cache
+from random import Random, choice, shuffle
+
+from .geometry import geometry
+from .subset import OrderedSubset
+
+
+class PlacementIndex:
+    """
+    Keeps available vektors of the field for every length of the fleet.
+    Cell can only stop being empty when ship or its border is drawn on it, so after put_ship
+    it's enough to discard vektors that go through cells of the new ship and its border.
+    Index doesn't see changes made directly to the cells: it should live only while ships are placed
+    """
+
+    def __init__(self, field, lengths):
+        self.lists = {}
+        self.covering = {}
+        for length in sorted(set(lengths)):
+            vektors = self.lists[length] = OrderedSubset(field.get_available_vectors(length))
+            for position, (x, y, _, is_vertical) in enumerate(vektors.items):
+                for i in range(length):
+                    coord = (x, y + i) if is_vertical else (x + i, y)
+                    self.covering.setdefault(coord, []).append((vektors, position))
+
+    def vektors(self, length) -> 'OrderedSubset or None':
+        return self.lists.get(length)
+
+    def discard(self, coords):
+        for coord in coords:
+            for vektors, position in self.covering.pop(coord, ()):
+                vektors.discard(position)
+
+
+ORACLE_CACHE_SIZE = 256
+
+
+class PlacementError(Exception):
+    pass
+
+
+class SearchLimitError(PlacementError):
+    pass
+
+
+class PlacementSearch:
+    """
+    Finds placement of the whole fleet with backtracking, without touching the field.
+
+    Ships are placed from the largest one. Every ship is a bitmask of its cells and a bitmask
+    of its area (cells and border): the ship fits if its cells don't intersect areas of placed ships
+    and cells that are not empty on the field. After every step the rest of the fleet is checked
+    (forward checking): every remaining length must still have a vektor and there must be enough free cells.
+    Before the children of a state are searched, the rest of the fleet is checked as a packing (see `packable`).
+    States (ship number, blocked cells) that led to a dead end are remembered and never searched again.
+    Ships of the same length take vektors in increasing order, so their permutations are not searched.
+    Vektors of every length are shuffled with `rng`, so the found placement is random.
+    The same tree of states is used to count layouts of the fleet (`count`, `estimate`)
+    """
+
+    def __init__(self, max_x, max_y, fleet, rng=None, max_states=100000, blocked=0):
+        self.lengths = sorted(fleet, reverse=True)
+        self.rng = rng
+        self.max_states = max_states
+        self.states = 0
+        self.dead = set()
+        self.counts = {}
+        self.size = max_x * max_y
+        self.extended_size = (max_x + 1) * (max_y + 1)
+        self.blocked = blocked
+        self.vektors = {}
+        self.rects = {}
+        for length in sorted(set(self.lengths)):
+            vektors = self.vektors[length] = [
+                (vektor, ship, area) for vektor, ship, area in self.masks(max_x, max_y, length) if not ship & blocked]
+            rng.shuffle(vektors) if rng else shuffle(vektors)
+            self.rects[length] = [self.rect(max_x, *vektor) for vektor, _, _ in vektors]
+
+    @classmethod
+    def from_field(cls, field, fleet, rng=None, max_states=100000) -> 'PlacementSearch':
+        """
+        Search on the field with drawn cells: ships can't be placed on the cells that are not empty
+        """
+        blocked = sum(1 << (cell.y * field.max_x + cell.x) for cell in field.iter_cells() if not cell.is_empty)
+        return cls(field.max_x, field.max_y, fleet, rng, max_states, blocked)
+
+    @staticmethod
+    def masks(max_x, max_y, length) -> 'generator((vektor, ship mask, area mask))':
+        table = geometry(max_x, max_y)
+        for y in range(max_y):
+            for x in range(max_x):
+                for is_vertical in ((True, False) if length > 1 else (False, )):   # a cell has one orientation
+                    if (y if is_vertical else x) + length > (max_y if is_vertical else max_x):
+                        continue
+                    ship = 0
+                    for i in range(length):
+                        ship |= 1 << ((y + i) * max_x + x if is_vertical else y * max_x + x + i)
+                    area = ship
+                    for i, j in table.borders(x, y, length, is_vertical):
+                        area |= 1 << (j * max_x + i)
+                    yield (x, y, length, is_vertical), ship, area
+
+    @staticmethod
+    def rect(max_x, x, y, length, is_vertical) -> int:
+        """
+        Mask of the ship with its border on the right and below on the field extended by one line and one column
+        """
+        mask = 0
+        for i in range(length + 1):
+            for j in range(2):
+                mask |= 1 << ((y + i) * (max_x + 1) + x + j if is_vertical else (y + j) * (max_x + 1) + x + i)
+        return mask
+
+    def run(self) -> 'list(tuple(x, y, length, is_vert))':
+        """
+        :return: vektors of the ships (from the largest one)
+        :raise PlacementError: if the fleet can't be placed or `max_states` states were searched
+        """
+        if not self.feasible_fleet():
+            raise PlacementError(f'Fleet {self.lengths} can not be placed')
+        vektors = self.search(0, self.blocked, 0)
+        if vektors is None:
+            raise PlacementError(f'Fleet {self.lengths} can not be placed')
+        return vektors
+
+    def feasible_fleet(self) -> bool:
+        # ship with the border on the right and below takes (length + 1) x 2 cells, such rectangles
+        # don't intersect and all of them fit in the field extended by one line and one column
+        return sum(2 * (length + 1) for length in self.lengths) <= self.extended_size and \
+            self.feasible(0, self.blocked)
+
+    def feasible(self, index, blocked) -> bool:
+        lengths = self.lengths[index:]
+        if self.size - bin(blocked).count('1') < sum(lengths):
+            return False
+        return all(any(not ship & blocked for _, ship, _ in self.vektors[length]) for length in set(lengths))
+
+    def packable(self, index, blocked) -> bool:
+        """
+        Rectangles of the ships (see `feasible_fleet`) don't intersect, and the rectangle of the ship that can
+        still be placed doesn't intersect rectangles of the placed ones. So the rest of the fleet must fit
+        in the cells covered by rectangles of the available vektors: for every length and all together
+        """
+        covered = 0
+        lengths = Counter(self.lengths[index:])
+        for length, number in lengths.items():
+            rects = 0
+            for (_, ship, _), rect in zip(self.vektors[length], self.rects[length]):
+                if not ship & blocked:
+                    rects |= rect
+            if bin(rects).count('1') < 2 * (length + 1) * number:
+                return False
+            covered |= rects
+        return bin(covered).count('1') >= sum(2 * (length + 1) * number for length, number in lengths.items())
+
+    def search(self, index, blocked, start) -> 'list or None':
+        if index == len(self.lengths):
+            return []
+        key = (index, blocked, start)
+        if key in self.dead:
+            return None
+        self.count_state()
+        for position, vektor, area, next_start in self.children(index, blocked, start):
+            rest = self.search(index + 1, blocked | area, next_start)
+            if rest is not None:
+                return [vektor] + rest
+        self.dead.add(key)
+        return None
+
+    def count_state(self):
+        self.states += 1
+        if self.max_states and self.states > self.max_states:
+            raise SearchLimitError(f'Search for the fleet {self.lengths} was stopped after {self.max_states} states')
+
+    def children(self, index, blocked, start) -> 'generator((position, vektor, area, start of the next ship))':
+        """
+        Placements of the ship `index` that leave the rest of the fleet feasible
+        """
+        if not self.packable(index, blocked):
+            return
+        length = self.lengths[index]
+        same_next = index + 1 < len(self.lengths) and self.lengths[index + 1] == length
+        vektors = self.vektors[length]
+        for position in range(start, len(vektors)):
+            vektor, ship, area = vektors[position]
+            if not ship & blocked and self.feasible(index + 1, blocked | area):
+                yield position, vektor, area, position + 1 if same_next else 0
+
+    def count(self) -> int:
+        """
+        Exact number of distinct layouts (ships of the same length are not distinguished).
+        Numbers of layouts of every searched state are memoized
+        :raise SearchLimitError: if `max_states` states were searched
+        """
+        return self.count_from(0, self.blocked, 0) if self.feasible_fleet() else 0
+
+    def count_from(self, index, blocked, start) -> int:
+        if index == len(self.lengths):
+            return 1
+        key = (index, blocked, start)
+        if key not in self.counts:
+            self.count_state()
+            self.counts[key] = sum(self.count_from(index + 1, blocked | area, next_start)
+                                   for _, _, area, next_start in self.children(index, blocked, start))
+        return self.counts[key]
+
+    def estimate(self, samples=1000) -> float:
+        """
+        Estimation of the number of layouts by random paths from the root of the search (Knuth's method):
+        product of the number of choices on the path is an unbiased estimation of the number of leaves
+        """
+        if not self.feasible_fleet():
+            return 0.
+        total = 0
+        for _ in range(samples):
+            index, blocked, start, weight = 0, self.blocked, 0, 1
+            while index < len(self.lengths):
+                children = list(self.children(index, blocked, start))
+                if not children:
+                    weight = 0
+                    break
+                weight *= len(children)
+                _, _, area, start = self.rng.choice(children) if self.rng else choice(children)
+                index, blocked = index + 1, blocked | area
+            total += weight
+        return total / samples
+
+
+def fleet_key(fleet) -> tuple:
+    return tuple(sorted(fleet, reverse=True))
+
+
+@lru_cache(maxsize=ORACLE_CACHE_SIZE)
+def fleet_feasible(max_x, max_y, lengths: tuple, max_states=None) -> bool:
+    try:
+        PlacementSearch(max_x, max_y, lengths, Random(0), max_states).run()
+    except SearchLimitError:
+        raise
+    except PlacementError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=ORACLE_CACHE_SIZE)
+def layouts_count(max_x, max_y, lengths: tuple, max_states=None) -> int:
+    return PlacementSearch(max_x, max_y, lengths, Random(0), max_states).count()
+
+
+@lru_cache(maxsize=ORACLE_CACHE_SIZE)
+def layouts_estimate(max_x, max_y, lengths: tuple, samples, seed) -> float:
+    return PlacementSearch(max_x, max_y, lengths, Random(seed)).estimate(samples)
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from random import Random
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, STANDART_FLEET, Field, ShipService
+
+LAGS_LIMIT = 1000       # number of the last refill lags kept for stats
+
+
+class FieldPool:
+    """
+    Buffers of fields with randomly placed ships for every (board size, fleet).
+    `acquire` takes a ready field from the buffer; when the buffer goes below `low_water`,
+    the background thread refills it up to `size`. If the buffer is empty, the field is
+    placed in the calling thread (miss of the pool).
+
+    Metrics (`stats`): hit rate of `acquire`, refill lag - time from the moment the buffer
+    went below `low_water` till it was refilled (of the last LAGS_LIMIT refills) and errors
+    of the refills: key whose fields can't be made is skipped until it is requested again.
+    Ships are placed with the own random generator of the pool, `seed` - its seed (fields are
+    reproducible while there are no misses: misses take random numbers in the calling threads)
+    """
+
+    def __init__(self, size=16, low_water=None, field_class=Field, seed=None):
+        self.size = size
+        self.low_water = size // 2 if low_water is None else low_water
+        self.field_class = field_class
+        self.rng = Random(seed)
+        self.buffers = {}
+        self.pending = {}               # key -> time when refill was requested
+        self.condition = threading.Condition()
+        self.closed = False
+        self.acquired = self.hits = self.generated = self.refills = 0
+        self.lags = deque(maxlen=LAGS_LIMIT)
+        self.errors = {}                # key -> last error of the refill
+        self.thread = threading.Thread(target=self.refill_loop, name='FieldPool', daemon=True)
+        self.thread.start()
+
+    def __repr__(self):
+        return f'<FieldPool (size={self.size}; low_water={self.low_water}; keys={len(self.buffers)})>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def key(fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y)) -> tuple:
+        return tuple(board_size), tuple(fleet or STANDART_FLEET)
+
+    def make(self, key) -> Field:
+        board_size, fleet = key
+        field = self.field_class(*board_size)
+        ShipService.put_ships_random(field, list(fleet), self.rng)
+        return field
+
+    def request_refill(self, key):
+        """
+        Should be called with the lock of the condition
+        """
+        if key not in self.pending and len(self.buffers[key]) < self.low_water:
+            self.pending[key] = time.perf_counter()
+            self.condition.notify_all()
+
+    def acquire(self, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y)) -> Field:
+        key = self.key(fleet, board_size)
+        with self.condition:
+            buffer = self.buffers.setdefault(key, deque())
+            field = buffer.popleft() if buffer else None
+            self.acquired += 1
+            self.hits += field is not None
+            self.request_refill(key)
+        return field or self.make(key)
+
+    def warm_up(self, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), wait=True, timeout=None) -> bool:
+        """
+        Starts filling the buffer of the key before the first `acquire`
+        """
+        key = self.key(fleet, board_size)
+        with self.condition:
+            self.buffers.setdefault(key, deque())
+            self.pending.setdefault(key, time.perf_counter())
+            self.condition.notify_all()
+        return self.wait(timeout) if wait else True
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Waits until all requested refills are done
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending or self.closed, timeout)
+
+    def refill_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if self.closed:
+                    return
+                key = next(iter(self.pending))
+                missing = self.size - len(self.buffers[key])
+            try:
+                while missing > 0 and not self.closed:
+                    field = self.make(key)
+                    with self.condition:
+                        self.buffers[key].append(field)
+                        self.generated += 1
+                        missing = self.size - len(self.buffers[key])
+            except Exception as e:
+                with self.condition:
+                    self.errors[key] = repr(e)
+                    self.pending.pop(key)
+                    self.condition.notify_all()
+                continue
+            with self.condition:
+                self.refills += 1
+                self.errors.pop(key, None)
+                self.lags.append(time.perf_counter() - self.pending.pop(key))
+                self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def stats(self) -> 'dict':
+        with self.condition:
+            return dict(
+                acquired=self.acquired,
+                hits=self.hits,
+                hit_rate=self.hits / self.acquired if self.acquired else 0.,
+                generated=self.generated,
+                refills=self.refills,
+                refill_lag_mean=sum(self.lags) / len(self.lags) if self.lags else 0.,
+                refill_lag_max=max(self.lags, default=0.),
+                buffered={key: len(buffer) for key, buffer in self.buffers.items()},
+                errors=dict(self.errors),
+            )
@@ -0,0 +1,107 @@
+from collections import Counter
+from itertools import count
+
+
+class Ship:
+    """
+    Ship placed on the field: its cells, border and number of cells that were not shot yet
+    """
+    __slots__ = ('id', 'coords', 'border', 'alive')
+
+    def __init__(self, ship_id, coords, border):
+        self.id = ship_id
+        self.coords = coords
+        self.border = border
+        self.alive = len(coords)
+
+    @property
+    def is_killed(self):
+        return not self.alive
+
+    def __repr__(self):
+        return f'<Ship #{self.id} (length={len(self.coords)}; alive={self.alive})>'
+
+
+class ShipRegistry:
+    """
+    Ships of the field with index by their cells.
+    Filled by ShipService.put_ship, so lookup of the ship and check if it's killed
+    are made without scanning the field
+    """
+
+    def __init__(self):
+        self.ships = []
+        self.by_cell = {}
+        self.sunk = Counter()
+        self.ids = count()
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __iter__(self):
+        return iter(self.ships)
+
+    def add(self, coords, border) -> Ship:
+        ship = Ship(next(self.ids), list(coords), list(border))
+        self.ships.append(ship)
+        for coord in ship.coords:
+            self.by_cell[coord] = ship
+        return ship
+
+    def insert(self, ship: Ship) -> Ship:
+        """
+        Registers again the ship that was discarded (used by rollback of the field)
+        """
+        self.ships.append(ship)
+        for coord in ship.coords:
+            self.by_cell[coord] = ship
+        if not ship.alive:
+            self.sunk[len(ship.coords)] += 1
+        return ship
+
+    def copy(self) -> 'ShipRegistry':
+        """
+        Registry with copies of the ships (used by checkpoints of the fields)
+        """
+        registry = ShipRegistry()
+        registry.ids = self.ids
+        for ship in self.ships:
+            clone = Ship(ship.id, ship.coords, ship.border)
+            clone.alive = ship.alive
+            registry.insert(clone)
+        return registry
+
+    @property
+    def alive(self):
+        return len(self.ships) - sum(self.sunk.values())
+
+    def get(self, x, y) -> 'Ship or None':
+        return self.by_cell.get((x, y))
+
+    def hit(self, x, y) -> 'Ship or None':
+        ship = self.by_cell.get((x, y))
+        if ship is not None and ship.alive:
+            ship.alive -= 1
+            if not ship.alive:
+                self.sunk[len(ship.coords)] += 1
+        return ship
+
+    def restore(self, x, y) -> 'Ship or None':
+        ship = self.by_cell.get((x, y))
+        if ship is not None and ship.alive < len(ship.coords):
+            if not ship.alive:
+                self.sunk[len(ship.coords)] -= 1
+            ship.alive += 1
+        return ship
+
+    def discard(self, x, y):
+        """
+        Forgets the ship that has cell (x, y): it was erased from the field
+        """
+        ship = self.by_cell.get((x, y))
+        if ship is not None:
+            if not ship.alive:
+                self.sunk[len(ship.coords)] -= 1
+            self.ships.remove(ship)
+            for coord in ship.coords:
+                del self.by_cell[coord]
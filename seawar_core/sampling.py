@@ -0,0 +1,184 @@
+import time
+import weakref
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from random import Random, getrandbits
+
+from .seawar_core import ProbableStrategy
+from .density import DensityStrategy
+from .placement import PlacementSearch
+
+
+@lru_cache(maxsize=32)
+def vektor_masks(max_x, max_y, lengths: tuple) -> '(dict(length: list), list)':
+    """
+    Bitmasks (ship, area) of all vektors of every length and the same masks
+    (with the length) of the vektors that cover every cell
+    """
+    by_length, by_cell = {}, [[] for _ in range(max_x * max_y)]
+    for length in lengths:
+        masks = by_length[length] = [(ship, area) for _, ship, area in PlacementSearch.masks(max_x, max_y, length)]
+        for ship, area in masks:
+            position = 0
+            while ship >> position:
+                if ship >> position & 1:
+                    by_cell[position].append((length, ship, area))
+                position += 1
+    return by_length, by_cell
+
+
+def sample_layouts(max_x, max_y, lengths: tuple, blocked, hits, samples, seed) -> '(list, int)':
+    """
+    Samples layouts of the ships with `lengths` that don't go through `blocked` cells and cover all `hits`.
+    First ships are placed to cover hits (every time the lowest hit that is not covered yet),
+    then the rest of the fleet is placed randomly; layouts that can't be completed are rejected.
+    :return: number of accepted layouts with ship on every cell and the number of accepted layouts
+    """
+    rng = Random(seed)
+    by_length, by_cell = vektor_masks(max_x, max_y, tuple(sorted(set(lengths))))
+    counts = [0] * (max_x * max_y)
+    accepted = 0
+    for _ in range(samples):
+        left, taken, uncovered, ships = Counter(lengths), blocked, hits, 0
+        while uncovered:
+            position = (uncovered & -uncovered).bit_length() - 1
+            vektors = [(length, ship, area) for length, ship, area in by_cell[position]
+                       if left[length] and not ship & taken]
+            if not vektors:
+                break
+            length, ship, area = rng.choice(vektors)
+            left[length] -= 1
+            taken, uncovered, ships = taken | area, uncovered & ~ship, ships | ship
+        if uncovered:
+            continue
+        for length in sorted(left.elements(), reverse=True):
+            vektors = [(ship, area) for ship, area in by_length[length] if not ship & taken]
+            if not vektors:
+                break
+            ship, area = rng.choice(vektors)
+            taken, ships = taken | area, ships | ship
+        else:
+            accepted += 1
+            ships &= ~hits
+            while ships:
+                low = ships & -ships
+                counts[low.bit_length() - 1] += 1
+                ships ^= low
+    return counts, accepted
+
+
+class SamplingStrategy(ProbableStrategy):
+    """
+    Targeting strategy that samples layouts of alive ships consistent with the target field
+    (ships don't go through misses, borders and killed ships and cover all hits) and shoots
+    to the empty cell that has a ship in the most of the samples.
+
+    Samples are made in chunks of `chunk_size` by the pool of `workers` processes
+    (in the current process if workers == 1) until `time_budget` seconds pass, `max_samples`
+    layouts are accepted or the best cell stays the same for `patience` chunks in a row.
+    The pool is stopped by `close` (or at the end of the `with` block) or when the strategy
+    (with its target field) is garbage collected
+    """
+
+    def __init__(self, fleet=None, workers=1, time_budget=0.05, max_samples=5000, chunk_size=100, patience=5):
+        super(SamplingStrategy, self).__init__(fleet)
+        self.workers = workers
+        self.time_budget = time_budget
+        self.max_samples = max_samples
+        self.chunk_size = chunk_size
+        self.patience = patience
+        self.pool = None
+        self.pool_finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def attach(self, field):
+        self.killed = []
+
+    def ship_killed(self, field, border, ship=None):
+        self.killed.append(ship or DensityStrategy.ship_by_border(border))
+
+    def ship_revived(self, field, border, ship=None):
+        self.killed.pop()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool_finalizer()
+            self.pool = self.pool_finalizer = None
+
+    def observations(self, field) -> '(tuple(lengths), blocked, hits)':
+        lengths = Counter(self.fleet)
+        killed = set()
+        for ship in self.killed:
+            lengths[len(ship)] -= 1
+            killed.update(ship)
+        blocked = hits = 0
+        for cell in field.iter_cells():
+            bit = 1 << (cell.y * field.max_x + cell.x)
+            if cell.value in ('miss', 'border') or (cell.x, cell.y) in killed:
+                blocked |= bit
+            elif cell.value == 'hit':
+                hits |= bit
+        return tuple(lengths.elements()), blocked, hits
+
+    def heat(self, field) -> 'list':
+        """
+        Number of samples with ship on every cell
+        """
+        lengths, blocked, hits = self.observations(field)
+        if not lengths:
+            return []
+        task = (field.max_x, field.max_y, lengths, blocked, hits, self.chunk_size)
+        seed = field.rng.getrandbits if field.rng else getrandbits
+        deadline = self.time_budget and time.perf_counter() + self.time_budget
+        counts, accepted, best, stable = [0] * (field.max_x * field.max_y), 0, None, 0
+
+        def merge(result):
+            nonlocal accepted, best, stable
+            for position, count in enumerate(result[0]):
+                counts[position] += count
+            accepted += result[1]
+            top = max(range(len(counts)), key=counts.__getitem__)
+            stable = stable + 1 if top == best else 0
+            best = top
+
+        def done():
+            return (self.max_samples and accepted >= self.max_samples) or stable >= self.patience or \
+                (deadline and time.perf_counter() > deadline)
+
+        if self.workers == 1:
+            while not done():
+                merge(sample_layouts(*task, seed(64)))
+            return counts
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            # refers to the pool only, so the strategy can be collected
+            self.pool_finalizer = weakref.finalize(self, self.pool.shutdown, cancel_futures=True)
+        running = {self.pool.submit(sample_layouts, *task, seed(64)) for _ in range(self.workers)}
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                merge(future.result())
+            if done():
+                for future in running:
+                    future.cancel()
+                break
+            running |= {self.pool.submit(sample_layouts, *task, seed(64)) for _ in finished}
+        return counts
+
+    def select_cell(self, field):
+        heat = self.heat(field)
+        best, cells = 0, []
+        for x, y in field.empty_cells:
+            count = heat[y * field.max_x + x] if heat else 0
+            if count > best:
+                best, cells = count, [(x, y)]
+            elif count == best and best:
+                cells.append((x, y))
+        return field.choice(cells) if cells else super(SamplingStrategy, self).select_cell(field)
@@ -1,11 +1,22 @@
+from collections import namedtuple
 from functools import partial
 from itertools import product, chain, takewhile
 from random import choice
+from struct import Struct
+
+from .geometry import geometry
+from .placement import PlacementIndex, PlacementSearch, PlacementError, SearchLimitError, fleet_key, fleet_feasible, \
+    layouts_count, layouts_estimate
+from .registry import ShipRegistry
+from .subset import OrderedSubset
 
 DEFAULT_MAX_X = 10
 DEFAULT_MAX_Y = 10
 STANDART_FLEET = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
 
+SERIAL_VERSION = 1
+SERIAL_HEADER = Struct('>BBHH')   # version, kind of the field, max_x, max_y
+
 
 class CoordOutOfRange(Exception):
     pass
@@ -15,16 +26,79 @@ class UnknownCellValue(Exception):
     pass
 
 
+class Outcome(namedtuple('Outcome', 'result x y ship border')):
+    """
+    Result of ShipService.fire: one of MISS / HIT / KILL / WIN and coordinates of the shot.
+    For KILL and WIN also contains coordinates of the killed ship and its border
+    """
+    __slots__ = ()
+
+    MISS = 'miss'
+    HIT = 'hit'
+    KILL = 'kill'
+    WIN = 'win'
+
+    def __new__(cls, result, x, y, ship=None, border=None):
+        return super(Outcome, cls).__new__(cls, result, x, y, ship, border)
+
+    @property
+    def is_hit(self):
+        return self.result != self.MISS
+
+    @property
+    def is_killed(self):
+        return self.result in (self.KILL, self.WIN)
+
+
+def cell_methods(value, code, notify=False):
+    """
+    Builds `is_<value>` and `mark_<value>` methods that compare/set the code of the value.
+    They are compiled from source (like collections.namedtuple does), so every call
+    is a plain function without closure and extra `is_value`/`mark_value` calls.
+    With `notify` mark method calls `value_changed(old_code)` of the cell when the value changes
+    """
+    namespace = {}
+    mark = (f'    old_code, self._code = self._code, {code}\n'
+            f'    old_code != {code} and self.value_changed(old_code)\n') if notify else f'    self._code = {code}\n'
+    exec(f'def is_{value}(self):\n'
+         f'    return self._code == {code}\n'
+         f'def mark_{value}(self):\n' + mark, namespace)
+    return property(namespace[f'is_{value}']), namespace[f'mark_{value}']
+
+
+def codes_property(codes) -> property:
+    """
+    Property that checks if the code of the cell is one of `codes`. Compiled like cell_methods
+    """
+    namespace = {}
+    exec(f'def check(self):\n'
+         f'    return self._code in {tuple(codes)!r}\n', namespace)
+    return property(namespace['check'])
+
+
 def base_cell(values=None, default=None):
+    """
+    Builds class of the cell with allowed `values`.
+    Value is kept as its index (code) in `Cell.codes` list, `Cell.code_by_value` is used
+    for checking and converting values. Cells without `values` accept any value:
+    codes for new values are added to the list on the fly.
+    If decorated class has `value_changed(old_code)` method, it's called after every change of the value
+    """
 
     def decor(_classes=None):
 
         _classes = _classes and (_classes if type(_classes) is list else [_classes]) or []
         _values = values or []
+        _default = _values and (default or _values[0]) or None
+        _notify = any(hasattr(c, 'value_changed') for c in _classes)
 
         class Cell(*_classes):
+            __slots__ = ('x', 'y', '_code')
 
-            default_value = None
+            VALUES = values
+            default_value = _default
+            codes = [_default] + [v for v in _values if v != _default]
+            code_by_value = {v: i for i, v in enumerate(codes)}
 
             def is_value(self, value):
                 return self.value == value
@@ -36,40 +110,145 @@ def base_cell(values=None, default=None):
                 super(Cell, self).__init__()
                 self.x = x
                 self.y = y
+                self._code = 0
                 self.value = value or self.default_value
 
             def __str__(self):
                 return f'[{self.x}: {self.y} => {self.value}]'
 
-            def __setattr__(self, attr, value):
-                if attr == 'value' and value and self.VALUES and (
-                        value not in self.VALUES and value != self.default_value):
-                    raise UnknownCellValue()
-                return super(Cell, self).__setattr__(attr, value)
-
-        setattr(Cell, 'VALUES', values)
+            @property
+            def value(self):
+                return self.codes[self._code]
+
+            @value.setter
+            def value(self, value):
+                code = self.code_by_value.get(value)
+                if code is None:
+                    if value and self.VALUES:
+                        raise UnknownCellValue()
+                    code = self.code_by_value[value] = len(self.codes)
+                    self.codes.append(value)
+                old_code, self._code = self._code, code
+                if _notify and old_code != code:
+                    self.value_changed(old_code)
 
         for v in _values:
-            setattr(Cell, f'is_{v}', property(lambda s, v=v: s.is_value(value=v)))
-            setattr(Cell, f'mark_{v}', (lambda s, v=v: s.mark_value(value=v)))
-            setattr(Cell, 'default_value',  default or values[0] or None)
+            is_v, mark_v = cell_methods(v, Cell.code_by_value[v], _notify)
+            setattr(Cell, f'is_{v}', is_v)
+            setattr(Cell, f'mark_{v}', mark_v)
         return Cell
     return decor
 
 
-@base_cell(['empty', 'ship', 'border'])
-class CellField:
+class FieldCell:
+    """
+    Base of the cells that belong to a field: they report changes of their value to the field
+    """
+    __slots__ = ('is_shooted', 'field')
 
     def __init__(self):
         self.is_shooted = False
+        self.field = None
+
+    def value_changed(self, old_code):
+        if self.field is not None:
+            self.field.cell_changed(self.x, self.y, self.codes[old_code], self.value, self.is_shooted)
+
+
+@base_cell(['empty', 'ship', 'border'])
+class CellField(FieldCell):
+    __slots__ = ()
 
     def shoot(self):
-        self.is_shooted = True
+        if not self.is_shooted:
+            self.is_shooted = True
+            if self.field is not None:
+                self.field.cell_shot(self.x, self.y, self.value, True)
         return self.is_ship
 
 
 @base_cell(['hit', 'border', 'miss', 'probable'], 'empty')
-class CellTarget:
+class CellTarget(FieldCell):
+    __slots__ = ()
+
+    def mark_empty(self):
+        self.mark_value('empty')
+
+
+# empty for targeting: no shot was made to the cell
+CellTarget.is_empty = codes_property(CellTarget.code_by_value[v] for v in ('empty', 'probable'))
+
+
+def proxy_cell(values=None, default=None):
+    """
+    Same as base_cell, but builds cells for fields that don't keep cell objects.
+    Proxy has no state: all reads and writes are passed to the field with
+    value_at / mark_at / is_shooted_at / shoot_at methods
+    """
+
+    def decor(_classes=None):
+
+        _classes = _classes and (_classes if type(_classes) is list else [_classes]) or []
+        _values = values or []
+
+        class Cell(*_classes):
+            __slots__ = ('field', 'x', 'y')
+
+            VALUES = values
+            default_value = default or _values and _values[0] or None
+
+            def __init__(self, field, x, y):
+                self.field = field
+                self.x = x
+                self.y = y
+
+            @property
+            def value(self):
+                return self.field.value_at(self.x, self.y)
+
+            @value.setter
+            def value(self, value):
+                if value and self.VALUES and value not in self.VALUES and value != self.default_value:
+                    raise UnknownCellValue()
+                self.field.mark_at(self.x, self.y, value or self.default_value)
+
+            @property
+            def is_shooted(self):
+                return self.field.is_shooted_at(self.x, self.y)
+
+            @is_shooted.setter
+            def is_shooted(self, value):
+                self.field.shoot_at(self.x, self.y, value)
+
+            def is_value(self, value):
+                return self.value == value
+
+            def mark_value(self, value):
+                self.value = value
+
+            def __str__(self):
+                return f'[{self.x}: {self.y} => {self.value}]'
+
+        for v in _values:
+            setattr(Cell, f'is_{v}', property(lambda s, v=v: s.field.value_at(s.x, s.y) == v))
+            setattr(Cell, f'mark_{v}', (lambda s, v=v: s.field.mark_at(s.x, s.y, v)))
+        return Cell
+    return decor
+
+
+@proxy_cell(['empty', 'ship', 'border'])
+class ProxyCellField:
+    __slots__ = ()
+
+    def shoot(self):
+        self.field.shoot_at(self.x, self.y)
+        return self.is_ship
+
+
+@proxy_cell(['hit', 'border', 'miss', 'probable'], 'empty')
+class ProxyCellTarget:
+    __slots__ = ()
+
     @property
     def is_empty(self):
         return self.value in ('empty', 'probable')
@@ -92,6 +271,22 @@ def filter_correct_coord(func):
     return decor
 
 
+def from_geometry(table):
+    """
+    Calls with a field (as in filter_correct_coord) are served from the `table` of the Geometry
+    of the field size. Calls without a field are passed to the decorated function
+    """
+
+    def wrapper(func):
+        def decor(*args, **kwargs):
+            for i, v in enumerate(args[:2]):
+                if isinstance(v, Field):
+                    return list(getattr(geometry(v.max_x, v.max_y), table)(*args[i + 1:], **kwargs))
+            return func(*args, **kwargs)
+        return decor
+    return wrapper
+
+
 def check_coord(func):
 
     def decor(field, x, y, *args, **kwargs):
@@ -119,6 +314,7 @@ class Matrix:
         return [(coord_x + i * (not is_vertical), coord_y + i * is_vertical) for i in _range]
 
     @classmethod
+    @from_geometry('borders')
     @filter_correct_coord
     def borders_by_vektor(cls, coord_x, coord_y, length, is_vertical=False):
         v_length, h_length = (length, 1) if is_vertical else (1, length)
@@ -129,12 +325,14 @@ class Matrix:
             cls.coords_by_vektor(coord_x + h_length, coord_y + v_length, v_length + 2, True, False)], [])))
 
     @staticmethod
+    @from_geometry('ribs')
     @filter_correct_coord
     def ribs_for_coord(coord_x, coord_y):
         return map(lambda c, d: (c[0] + d[0], c[1] + d[1]), [(coord_x, coord_y)] * 4,
                    ((-1, 0), (1, 0), (0, -1), (0, 1)))
 
     @staticmethod
+    @from_geometry('corners')
     @filter_correct_coord
     def conrers_for_coord(coord_x, coord_y):
         return map(lambda c, d: (c[0] + d[0], c[1] + d[1]), [(coord_x, coord_y)] * 4, product((-1, 1), (-1, 1)))
@@ -148,15 +346,56 @@ class Matrix:
 
 class Field:
     _field: 'matrix of cells (actually list of lists of Cells)'
+    ships: 'ShipRegistry with ships placed by ShipService.put_ship'
+    placement_index: 'PlacementIndex that is used while ships are placed' = None
+    journal: 'undo log of the changes made after the first checkpoint (None if journaling is off)' = None
+    events: 'BoardRecorder that writes placements and shots to the log of the games (see eventlog)' = None
+    checkpoints: 'positions in the journal that can be rolled back to' = ()
+
+    serial_kind = 0
+    serial_values = ('empty', 'ship', 'border')    # codes of the values in to_bytes
+    serial_shots = True
 
     def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
         self.max_x = max_x
         self.max_y = max_y
+        self.ships = ShipRegistry()
+        self.alive_cells = 0
         self._field = [[CellField(x, y) for x in range(max_x)] for y in range(max_y)]
+        for cell in self.iter_cells():
+            cell.field = self
 
     @property
     def cells(self):
-        return list(chain(*self._field))
+        return list(self.iter_cells())
+
+    def iter_cells(self) -> 'iterator(cell)':
+        """
+        All cells in row-major order (the order of `cells`) without building a list
+        """
+        return chain.from_iterable(self._field)
+
+    def cells_by_value(self, value) -> 'iterator(cell)':
+        return (cell for cell in self.iter_cells() if cell.value == value)
+
+    def row(self, y) -> 'iterator(cell)':
+        return (self.get(x, y) for x in range(self.max_x))
+
+    def column(self, x) -> 'iterator(cell)':
+        return (self.get(x, y) for y in range(self.max_y))
+
+    def rows(self) -> 'iterator(iterator(cell))':
+        return (self.row(y) for y in range(self.max_y))
+
+    def columns(self) -> 'iterator(iterator(cell))':
+        return (self.column(x) for x in range(self.max_x))
+
+    def window(self, x, y, width, height) -> 'iterator(cell)':
+        """
+        Cells of the rectangle with top left corner (x, y) in row-major order. Rectangle is clipped by the field
+        """
+        xs = range(max(x, 0), min(x + width, self.max_x))
+        return (self.get(i, j) for j in range(max(y, 0), min(y + height, self.max_y)) for i in xs)
 
     def __repr__(self):
         return '<Field (max_x={}; max_y={})>'.format(self.max_x, self.max_y)
@@ -166,8 +405,8 @@ class Field:
 
     def __str__(self):
         out = repr(self)
-        for row in self._field:
-            out += '\n\t' + ''.join([self.cell_template(c) for c in row])
+        for row in self.rows():
+            out += '\n\t' + ''.join(map(self.cell_template, row))
         return out + '\n'
 
     def get(self, x, y):
@@ -177,7 +416,105 @@ class Field:
     def set(self, x, y, value, is_shooted=False):
         cell = self.get(x, y)
         cell.value = value
-        cell.is_shooted = is_shooted
+        if cell.is_shooted != is_shooted:
+            cell.is_shooted = is_shooted
+            self.cell_shot(x, y, cell.value, is_shooted)
+
+    def cell_changed(self, x, y, old_value, value, is_shooted):
+        """
+        Is called by the cell after its value was changed
+        """
+        if self.journal is not None:
+            self.journal.append(('value', x, y, old_value))
+        if old_value == 'ship':
+            ship = self.ships.get(x, y)
+            if ship is not None:
+                self.journal is not None and self.journal.append(('ship', ship))
+                self.ships.discard(x, y)
+            self.alive_cells -= not is_shooted
+        elif value == 'ship':
+            self.alive_cells += not is_shooted
+
+    def cell_shot(self, x, y, value, is_shooted):
+        """
+        Is called by the cell after it was shot (or its shot was cancelled by `set`)
+        """
+        if self.journal is not None:
+            self.journal.append(('shot', x, y, not is_shooted))
+        if value == 'ship':
+            self.alive_cells += -1 if is_shooted else 1
+            self.ships.hit(x, y) if is_shooted else self.ships.restore(x, y)
+
+    def add_ship(self, coords, border):
+        """
+        Registers the drawn ship. Ships that had cells under it are forgotten
+        """
+        for x, y in coords:
+            ship = self.ships.get(x, y)
+            if ship is not None:
+                self.journal is not None and self.journal.append(('ship', ship))
+                self.ships.discard(x, y)
+        ship = self.ships.add(coords, border)
+        self.journal is not None and self.journal.append(('added', ship))
+        return ship
+
+    def checkpoint(self) -> int:
+        """
+        Starts journaling (if it's not started yet) and remembers the current state of the field.
+        Returns the checkpoint: number of the changes in the journal
+        """
+        if self.journal is None:
+            self.journal, self.checkpoints = [], []
+        self.checkpoints.append(len(self.journal))
+        self.events is not None and self.events.checkpoint()
+        return self.checkpoints[-1]
+
+    def rollback(self, checkpoint: int = None):
+        """
+        Undoes the changes made after the `checkpoint` (the last one by default) in reverse order.
+        The checkpoint is dropped, so the next rollback returns to the previous one
+        """
+        if self.journal is None:
+            raise ValueError('No checkpoint to roll back to')
+        checkpoint = self.checkpoints[-1] if checkpoint is None else checkpoint
+        while self.checkpoints and self.checkpoints[-1] >= checkpoint:
+            self.checkpoints.pop()
+        journal, self.journal = self.journal, None
+        try:
+            while len(journal) > checkpoint:
+                self.undo(journal.pop())
+        finally:
+            self.journal = journal
+        self.checkpoints or self.stop_journal()
+        self.events is not None and self.events.rollback(len(self.checkpoints))
+
+    def commit(self):
+        """
+        Drops the last checkpoint keeping the changes. Journaling is stopped after the last one
+        """
+        if self.journal is None:
+            return
+        self.checkpoints.pop()
+        self.checkpoints or self.stop_journal()
+        self.events is not None and self.events.commit()
+
+    def stop_journal(self):
+        self.journal, self.checkpoints = None, []
+
+    def undo(self, change: tuple):
+        kind, *args = change
+        if kind == 'value':
+            x, y, value = args
+            self.get(x, y).value = value
+        elif kind == 'shot':
+            x, y, is_shooted = args
+            cell = self.get(x, y)
+            cell.is_shooted = is_shooted
+            self.cell_shot(x, y, cell.value, is_shooted)
+        elif kind == 'ship':
+            self.ships.insert(*args)
+        elif kind == 'added':
+            self.ships.discard(*args[0].coords[0])
 
     def draw_ship(self, coords):
         [self.get(*coord).mark_ship() for coord in coords]
@@ -193,18 +530,175 @@ class Field:
     def is_correct_coord(self, coord_x, coord_y):
         return 0 <= coord_x < self.max_x and 0 <= coord_y < self.max_y
 
+    def borders_by_vektor(self, coord_x, coord_y, length, is_vertical=False) -> 'list(coord)':
+        return Matrix.borders_by_vektor(self, coord_x, coord_y, length, is_vertical)
 
-class ShipService:
+    def get_available_vectors(self, length) -> 'list(tuple(x, y, length, is_vert))':
+        return [(cell.x, cell.y, length, is_vertical)
+                for cell in self.iter_cells() for is_vertical in (True, False)
+                if self.is_suitable_ship_vektor(cell.x, cell.y, length, is_vertical)]
 
-    @staticmethod
-    def get_ship_by_cell(field, coord_x, coord_y) -> 'list(coord)':
-        _check = lambda c: field.is_correct_coord(*c) and field.get(*c).is_ship
+    def make_placement_index(self, fleet) -> 'PlacementIndex or None':
+        return PlacementIndex(self, fleet)
+
+    def random_vektor(self, length, rng=None) -> 'tuple(x, y, length, is_vert)':
+        """
+        Random available vektor for the ship. Vektors are taken from `placement_index` if it's set
+        """
+        cells = self.placement_index and self.placement_index.vektors(length)
+        if cells is None:
+            cells = self.get_available_vectors(length)
+        return rng.choice(cells) if rng else choice(cells)
+
+    def get_ship_by_cell(self, coord_x, coord_y) -> 'list(coord)':
+        _check = lambda c: self.is_correct_coord(*c) and self.get(*c).is_ship
         _next = partial(Matrix.next_coord, coord_x, coord_y)
 
         return list(set(chain.from_iterable(
             takewhile(_check, _next(is_vert, step))
             for is_vert, step in product([True, False], [-1, 1]))))
 
+    def is_fleet_killed(self) -> bool:
+        return not self.alive_cells
+
+    def fleet_status(self) -> 'dict(ships_alive, cells_alive, sunk)':
+        """
+        :return: dict with summary of the fleet:
+            ships_alive - number of ships that are not killed yet,
+            cells_alive - number of ship cells that were not shot,
+            sunk - {length: number of killed ships of this length}
+        Ships are taken from the registry, so only ships placed with ShipService.put_ship are counted
+        """
+        return dict(
+            ships_alive=self.ships.alive,
+            cells_alive=self.alive_cells,
+            sunk={length: count for length, count in sorted(self.ships.sunk.items()) if count})
+
+    def register_ships(self):
+        """
+        Adds to the registry the ships that are drawn on the field, but are not registered yet
+        """
+        for cell in self.cells_by_value('ship'):
+            if self.ships.get(cell.x, cell.y) is None:
+                coords = sorted(self.get_ship_by_cell(cell.x, cell.y))
+                self.add_ship(coords, self.borders_by_vektor(*Matrix.vektor_by_coords(coords)))
+
+    @classmethod
+    def cell_bits(cls) -> int:
+        return (len(cls.serial_values) - 1).bit_length() + cls.serial_shots
+
+    def to_bytes(self) -> bytes:
+        """
+        Packs the field: SERIAL_HEADER and then cells in row-major order, `cell_bits` per cell
+        (code of the value in `serial_values` and the shot bit for Field). Standard field takes 44 bytes
+        """
+        bits = self.cell_bits()
+        code_by_value = {v: i for i, v in enumerate(self.serial_values)}
+        packed = 0
+        for i, cell in enumerate(self.iter_cells()):
+            code = code_by_value[cell.value]
+            if self.serial_shots:
+                code = code << 1 | cell.is_shooted
+            packed |= code << (i * bits)
+        size = (self.max_x * self.max_y * bits + 7) // 8
+        return SERIAL_HEADER.pack(SERIAL_VERSION, self.serial_kind, self.max_x, self.max_y) + \
+            packed.to_bytes(size, 'little')
+
+    @classmethod
+    def from_bytes(cls, data, **kwargs) -> 'Field':
+        """
+        Restores the field packed by `to_bytes`. `kwargs` are passed to the constructor
+        """
+        field, end = cls.unpack_from(memoryview(data), 0, **kwargs)
+        if end != len(data):
+            raise ValueError('Extra bytes after the field')
+        return field
+
+    @classmethod
+    def iter_from_bytes(cls, data, **kwargs) -> 'generator(Field)':
+        """
+        Restores fields packed one after another in `data` (bytes, bytearray, mmap...).
+        Records are read through memoryview, so the data is never copied or split
+        """
+        data, offset = memoryview(data), 0
+        while offset < len(data):
+            field, offset = cls.unpack_from(data, offset, **kwargs)
+            yield field
+
+    @classmethod
+    def unpack_from(cls, data: memoryview, offset=0, **kwargs) -> '(Field, offset of the next record)':
+        version, kind, max_x, max_y = SERIAL_HEADER.unpack_from(data, offset)
+        if version != SERIAL_VERSION or kind != cls.serial_kind:
+            raise ValueError(f'Unsupported data: version {version}, kind {kind}')
+        bits = cls.cell_bits()
+        start = offset + SERIAL_HEADER.size
+        end = start + (max_x * max_y * bits + 7) // 8
+        if end > len(data):
+            raise ValueError('Data is truncated')
+
+        field = cls(max_x, max_y, **kwargs)
+        packed, mask, shots = int.from_bytes(data[start:end], 'little'), (1 << bits) - 1, []
+        for cell in field.iter_cells():
+            code, packed = packed & mask, packed >> bits
+            if cls.serial_shots:
+                code, is_shooted = code >> 1, code & 1
+                is_shooted and shots.append(cell)
+            if code >= len(cls.serial_values):
+                raise ValueError(f'Unknown code of the cell: {code}')
+            cell.value = cls.serial_values[code]
+        'ship' in cls.serial_values and field.register_ships()
+        for cell in shots:
+            cell.shoot()
+        return field, end
+
+
+class SnapshotJournal:
+    """
+    Checkpoints of the fields that keep their state in a few containers (bitmasks, arrays, dicts):
+    every checkpoint is a copy of the state made by `snapshot` and put back by `restore`.
+    Should go before Field in the bases of the field
+    """
+
+    def snapshot(self) -> tuple:
+        raise NotImplementedError
+
+    def restore(self, snapshot: tuple):
+        raise NotImplementedError
+
+    def checkpoint(self) -> int:
+        """
+        Remembers the current state of the field. Returns the checkpoint: number of the older checkpoints
+        """
+        if not self.checkpoints:
+            self.checkpoints = []
+        self.checkpoints.append(self.snapshot())
+        self.events is not None and self.events.checkpoint()
+        return len(self.checkpoints) - 1
+
+    def rollback(self, checkpoint: int = None):
+        """
+        Returns the field to the `checkpoint` (the last one by default). The checkpoint is dropped
+        """
+        if not self.checkpoints:
+            raise ValueError('No checkpoint to roll back to')
+        checkpoint = len(self.checkpoints) - 1 if checkpoint is None else checkpoint
+        self.restore(self.checkpoints[checkpoint])
+        del self.checkpoints[checkpoint:]
+        self.events is not None and self.events.rollback(len(self.checkpoints))
+
+    def commit(self):
+        if self.checkpoints:
+            self.checkpoints.pop()
+            self.events is not None and self.events.commit()
+
+
+class ShipService:
+
+    @staticmethod
+    def get_ship_by_cell(field, coord_x, coord_y) -> 'list(coord)':
+        ship = field.ships.get(coord_x, coord_y)
+        return list(ship.coords) if ship else field.get_ship_by_cell(coord_x, coord_y)
+
     @staticmethod
     @check_coord
     def get_ship_if_killed(field, coord_x, coord_y) -> 'dict(ship, border) or {}':
@@ -217,38 +711,101 @@ class ShipService:
             {"ship": [(x, y), ...], "border": [(x, y), ...]}
             if ship was not killed - empty dict
         """
-        cells = ShipService.get_ship_by_cell(field, coord_x, coord_y)
+        return ShipService.killed_ship(field, coord_x, coord_y)
+
+    @staticmethod
+    def killed_ship(field, coord_x, coord_y) -> 'dict(ship, border) or {}':
+        """
+        Same as get_ship_if_killed, but doesn't check coordinates
+        """
+        ship = field.ships.get(coord_x, coord_y)
+        if ship:
+            return ship.is_killed and dict(ship=list(ship.coords), border=list(ship.border)) or {}
+
+        # ship was drawn on the field directly, not with put_ship
+        cells = field.get_ship_by_cell(coord_x, coord_y)
         response = cells and all([field.get(*c).is_shooted for c in cells]) and dict(ship=cells) or {}
         if response:
-            response['border'] = Matrix.borders_by_vektor(field, *Matrix.vektor_by_coords(cells))
+            response['border'] = field.borders_by_vektor(*Matrix.vektor_by_coords(cells))
         return response
 
     @staticmethod
     def get_available_vectors(field, length) -> 'list(tuple(x, y, length, is_vert))':
-        return [(cell.x, cell.y, length, is_vertical)
-                for cell, is_vertical in product(field.cells, (True, False))
-                if field.is_suitable_ship_vektor(cell.x, cell.y, length, is_vertical)]
+        return field.get_available_vectors(length)
 
     @staticmethod
     def put_ship(field, coord_x, coord_y, length, is_vertical=False):
-        field.draw_ship(Matrix.coords_by_vektor(field, coord_x, coord_y, length, is_vertical))
-        field.draw_border(Matrix.borders_by_vektor(field, coord_x, coord_y, length, is_vertical))
+        field.events is not None and field.events.placement(coord_x, coord_y, length, is_vertical)
+        ship = Matrix.coords_by_vektor(field, coord_x, coord_y, length, is_vertical)
+        border = field.borders_by_vektor(coord_x, coord_y, length, is_vertical)
+        field.draw_ship(ship)
+        field.draw_border(border)
+        field.add_ship(ship, border)
+        if field.placement_index:
+            field.placement_index.discard(ship + border)
 
     @staticmethod
-    def put_ship_random(field, length):
-        cells = ShipService.get_available_vectors(field, length)
-        ShipService.put_ship(field, *choice(cells))
+    def put_ship_random(field, length, rng=None):
+        ShipService.put_ship(field, *field.random_vektor(length, rng))
 
     @staticmethod
-    def put_ships_random(field, fleet=None):
+    def put_ships_random(field, fleet=None, rng=None):
         """
         :param field: <Field> object where ships should be placed
         :param fleet: <list> of <int> numbers. Every number - length of the ship
+        :param rng: <random.Random> object. If it's not set - module functions of `random` are used
         :return:
         """
         fleet = fleet or STANDART_FLEET
-        for length in fleet:
-            ShipService.put_ship_random(field, length)
+        field.placement_index = field.make_placement_index(fleet)
+        try:
+            for length in fleet:
+                ShipService.put_ship_random(field, length, rng)
+        finally:
+            field.placement_index = None
+
+    @staticmethod
+    def put_fleet(field, fleet=None, rng=None, max_states=100000) -> 'list(tuple(x, y, length, is_vert))':
+        """
+        Places the fleet with backtracking search (see PlacementSearch). Unlike put_ships_random
+        it doesn't get stuck on dense fleets: ships are drawn only when the whole placement is found
+        :param field: <Field> object where ships should be placed
+        :param fleet: <list> of <int> numbers. Every number - length of the ship
+        :param rng: <random.Random> object. If it's not set - module functions of `random` are used
+        :param max_states: <int> limit of the searched states (None - no limit)
+        :return: vektors of the placed ships
+        :raise PlacementError: if the fleet can't be placed
+        """
+        vektors = PlacementSearch.from_field(field, fleet or STANDART_FLEET, rng, max_states).run()
+        for vektor in vektors:
+            ShipService.put_ship(field, *vektor)
+        return vektors
+
+    @staticmethod
+    def is_fleet_feasible(max_x, max_y, fleet=None, max_states=1000000) -> bool:
+        """
+        Checks if the fleet can be placed on the empty field (max_x, max_y).
+        Answers are cached by the size of the field and the multiset of the lengths.
+        Dense fleets (close to the limit of the area) can stay undecided: the search is exponential
+        :raise SearchLimitError: if the answer was not found in `max_states` states of the search
+        """
+        return fleet_feasible(max_x, max_y, fleet_key(fleet or STANDART_FLEET), max_states)
+
+    @staticmethod
+    def count_layouts(max_x, max_y, fleet=None, max_states=1000000) -> int:
+        """
+        Exact number of distinct layouts of the fleet on the empty field (max_x, max_y). Answers are cached.
+        Is suitable for small fields and fleets, use `estimate_layouts` for the others
+        :raise SearchLimitError: if counting needs more than `max_states` states of the search
+        """
+        return layouts_count(max_x, max_y, fleet_key(fleet or STANDART_FLEET), max_states)
+
+    @staticmethod
+    def estimate_layouts(max_x, max_y, fleet=None, samples=1000, seed=0) -> float:
+        """
+        Estimated number of distinct layouts of the fleet on the empty field (max_x, max_y). Answers are cached
+        """
+        return layouts_estimate(max_x, max_y, fleet_key(fleet or STANDART_FLEET), samples, seed)
 
     @staticmethod
     @check_coord
@@ -259,33 +816,120 @@ class ShipService:
         :param coord_y: <int>
         :return: <bool>
         """
-        return field.get(coord_x, coord_y).shoot()
+        result = field.get(coord_x, coord_y).shoot()
+        field.events is not None and field.events.shot(coord_x, coord_y, result)
+        return result
+
+    @staticmethod
+    @check_coord
+    def fire(field, coord_x, coord_y) -> Outcome:
+        """
+        Makes shoot_to, get_ship_if_killed and is_fleet_killed in one call
+        :param field: <Field> object to which shoot should be made
+        :param coord_x: <int>
+        :param coord_y: <int>
+        :return: <Outcome>
+        """
+        is_hit = field.get(coord_x, coord_y).shoot()
+        killed = is_hit and ShipService.killed_ship(field, coord_x, coord_y)
+        if not is_hit:
+            outcome = Outcome(Outcome.MISS, coord_x, coord_y)
+        elif not killed:
+            outcome = Outcome(Outcome.HIT, coord_x, coord_y)
+        else:
+            result = Outcome.WIN if field.is_fleet_killed() else Outcome.KILL
+            outcome = Outcome(result, coord_x, coord_y, killed['ship'], killed['border'])
+        field.events is not None and field.events.outcome(outcome)
+        return outcome
 
     @staticmethod
     def is_fleet_killed(field: Field) -> bool:
         """
         Checks if all field were killed
         """
-        return not any(not cell.is_shooted for cell in field.cells if cell.is_ship)
+        return field.is_fleet_killed()
+
+
+class ProbableStrategy:
+    """
+    Default targeting strategy of TargetField: shoots to probable cells (next to the hit one)
+    if there are any, otherwise - to a random empty cell.
+    Strategy is attached to one TargetField and gets notifications about changes of its cells
+    """
+
+    def __init__(self, fleet=None):
+        self.fleet = list(fleet or STANDART_FLEET)
+
+    def attach(self, field):
+        pass
+
+    def cell_changed(self, x, y, old_value, value):
+        pass
+
+    def ship_killed(self, field, border, ship=None):
+        pass
+
+    def ship_revived(self, field, border, ship=None):
+        """
+        Undoes `ship_killed` when the target field is rolled back
+        """
+        pass
+
+    def select_cell(self, field) -> '(x, y)':
+        return field.choice(field.probable_cells or field.empty_cells)
 
 
 class TargetField(Field):
+    strategy: 'strategy that selects cells to shoot (ProbableStrategy by default)'
+    rng: '<random.Random> object for selecting cells. If None - module functions of `random` are used' = None
+
+    serial_kind = 1
+    serial_values = ('empty', 'hit', 'border', 'miss', 'probable')
+    serial_shots = False
 
     # noinspection PyMissingConstructor
-    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
+    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y, strategy=None, rng=None):
         self.max_x = max_x
         self.max_y = max_y
+        self.rng = rng
         self._field = [[CellTarget(x, y) for x in range(max_x)] for y in range(max_y)]
+        coords = [(c.x, c.y) for c in self.iter_cells()]
+        self.probable_cells = OrderedSubset(coords, present=False)
+        self.empty_cells = OrderedSubset(coords)
+        for cell in self.iter_cells():
+            cell.field = self
+        self.strategy = strategy or ProbableStrategy()
+        self.strategy.attach(self)
 
     def cell_template(self, cell):
         return f"[{' ' if cell.is_empty else cell.value[0].upper()}]"
 
+    def cell_changed(self, x, y, old_value, value, is_shooted):
+        """
+        Keeps probable_cells and empty_cells up to date. Both subsets keep the order
+        of `cells`, so select_cell picks the same cell as the scan of all cells would
+        """
+        if self.journal is not None:
+            self.journal.append(('value', x, y, old_value))
+        position = y * self.max_x + x
+        if value == 'probable':
+            self.probable_cells.add(position)
+        elif old_value == 'probable':
+            self.probable_cells.discard(position)
+        if value in ('empty', 'probable'):
+            self.empty_cells.add(position)
+        else:
+            self.empty_cells.discard(position)
+        self.strategy.cell_changed(x, y, old_value, value)
+
+    def choice(self, cells):
+        return self.rng.choice(cells) if self.rng else choice(cells)
+
     def select_cell(self) -> '(x, y)':
-        cells = [(c.x, c.y) for c in self.cells if c.is_probable]         # trying to find probable cells
-        cells = cells or [(c.x, c.y) for c in self.cells if c.is_empty]   # if none exists - select empty cells
-        return choice(cells)
+        return self.strategy.select_cell(self)
 
     def shoot_response(self, x, y, result: bool):
+        self.events is not None and self.events.shot(x, y, result)
         if result:
             self.get(x, y).mark_hit()
             self.mark_probably_cells(x, y)
@@ -299,7 +943,22 @@ class TargetField(Field):
     def mark_improbable_cells(self, x, y):
         [self.get(*c).mark_border() for c in Matrix.conrers_for_coord(self, x, y) if self.get(*c).is_empty]
 
-    def mark_killed(self, border: 'list((x, y), ...)'):
+    def apply_outcome(self, outcome: Outcome):
+        self.shoot_response(outcome.x, outcome.y, outcome.is_hit)
+        if outcome.is_killed:
+            self.mark_killed(outcome.border, outcome.ship)
+
+    def mark_killed(self, border: 'list((x, y), ...)', ship: 'list((x, y), ...)' = None):
+        self.events is not None and self.events.kill(border, ship)
         for x, y in border:
             cell = self.get(x, y)
             cell.is_empty and cell.mark_border()
+        self.strategy.ship_killed(self, border, ship)
+        if self.journal is not None:
+            self.journal.append(('killed', border, ship))
+
+    def undo(self, change: tuple):
+        if change[0] == 'killed':
+            self.strategy.ship_revived(self, *change[1:])
+        else:
+            super(TargetField, self).undo(change)
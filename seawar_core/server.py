@@ -0,0 +1,286 @@
+"""
+Asyncio server of games "player vs computer".
+
+All sessions live in one event loop. Placement of the ships and moves of the computer are run
+in the executor, so the loop is never blocked by them.
+
+Protocol: one JSON object per line in both directions. Every request has `cmd` and optional `id`
+that is copied to the response, so requests can be pipelined in one connection:
+    {"id": 1, "cmd": "create", "board_size": [10, 10], "fleet": [4, 3, 3, 2, 2, 2, 1, 1, 1, 1], "seed": 5}
+    {"id": 1, "ok": true, "session": 1}
+    {"id": 2, "cmd": "shoot", "session": 1, "x": 3, "y": 4}
+    {"id": 2, "ok": true, "result": "miss", "ship": null, "border": null, "replies": [...], "winner": null}
+    {"id": 3, "cmd": "status", "session": 1}
+    {"id": 4, "cmd": "close", "session": 1}
+Errors are returned as {"id": ..., "ok": false, "error": "..."}. Sides of the board and lengths of the ships
+should be positive ints within the limits of the manager (`max_board_area`, `max_ship_length`);
+fleets that are not placed within `max_search_states` states of the search are refused.
+
+Run the server:
+    python -m seawar_core.server --port 7777
+    python -m seawar_core.server --unix /tmp/seawar.sock
+"""
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from random import Random
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, STANDART_FLEET, Field, TargetField, ShipService, Outcome, \
+    CoordOutOfRange
+from .placement import PlacementError, SearchLimitError
+
+MAX_LINE = 64 * 1024
+MAX_BOARD_AREA = 10000      # default limits of the games created by the clients
+MAX_SHIP_LENGTH = 10
+FEASIBILITY_STATES = 20000  # limit of the search that checks the fleet of the client (about 0.2 s)
+MAX_BOARD_SIDE = 0xFFFF     # fields are sent from the placement executor by to_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class SessionError(Exception):
+    pass
+
+
+class Session:
+    """
+    Game of the player against the computer: `field` - ships of the player, `enemy` - ships of the computer,
+    `target` - target field of the computer
+    """
+    __slots__ = ('id', 'field', 'enemy', 'target', 'lock', 'winner', 'shots')
+
+    def __init__(self, session_id, field, enemy, target):
+        self.id = session_id
+        self.field = field
+        self.enemy = enemy
+        self.target = target
+        self.lock = asyncio.Lock()
+        self.winner = None
+        self.shots = [0, 0]
+
+    def computer_turn(self) -> 'list(dict)':
+        """
+        Computer shoots until the first miss
+        """
+        replies = []
+        while True:
+            outcome = ShipService.fire(self.field, *self.target.select_cell())
+            self.target.apply_outcome(outcome)
+            self.shots[1] += 1
+            replies.append(dict(x=outcome.x, y=outcome.y, result=outcome.result))
+            if outcome.result == Outcome.WIN:
+                self.winner = 'computer'
+            if not outcome.is_hit or self.winner:
+                return replies
+
+
+def placed_field(board_size, fleet, rng) -> Field:
+    field = Field(*board_size)
+    try:
+        ShipService.put_ships_random(field, fleet, rng)
+    except IndexError:      # random placement got stuck on a dense fleet
+        field = Field(*board_size)
+        ShipService.put_fleet(field, fleet, rng)
+    return field
+
+
+def new_layouts(board_size, fleet, seed) -> '(bytes, bytes)':
+    """
+    Serialized fields of the player and of the computer. Module level function, so it can be run
+    in the process pool
+    """
+    rng = Random(seed)
+    return placed_field(board_size, fleet, rng).to_bytes(), placed_field(board_size, fleet, rng).to_bytes()
+
+
+class SessionManager:
+    """
+    Sessions of the games. Coroutines `create`, `shoot`, `status` and `close` are the API of the server.
+    Moves in one session are serialized by its lock; different sessions are played concurrently.
+
+    Moves of the computer are run in `executor` (default executor of the loop if None),
+    placement of the ships - in `placement_executor` (the same as `executor` if None), which can be
+    a ProcessPoolExecutor: placement is the most expensive step and threads don't run it in parallel
+    """
+
+    def __init__(self, executor=None, max_sessions=None, placement_executor=None,
+                 max_board_area=MAX_BOARD_AREA, max_ship_length=MAX_SHIP_LENGTH,
+                 max_search_states=FEASIBILITY_STATES):
+        self.executor = executor
+        self.placement_executor = placement_executor or executor
+        self.max_sessions = max_sessions
+        self.max_board_area = max_board_area
+        self.max_ship_length = max_ship_length
+        self.max_search_states = max_search_states
+        self.sessions = {}
+        self.creating = 0       # sessions that are being created: they already hold their slots
+        self.ids = count(1)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def run(self, func, *args, executor=None):
+        return asyncio.get_running_loop().run_in_executor(executor or self.executor, func, *args)
+
+    def session(self, session_id) -> Session:
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise SessionError(f'Unknown session: {session_id}')
+
+    @staticmethod
+    def is_positive_ints(values, limit) -> bool:
+        return isinstance(values, (list, tuple)) and \
+            all(type(value) is int and 0 < value <= limit for value in values)
+
+    def check_game(self, board_size, fleet) -> '(tuple, list)':
+        """
+        Checks the board and the fleet that came from the client
+        :raise SessionError: if they are out of the limits
+        """
+        if not (self.is_positive_ints(board_size, MAX_BOARD_SIDE) and len(board_size) == 2) or \
+                board_size[0] * board_size[1] > self.max_board_area:
+            raise SessionError(f'Board size should be 2 positive ints with area up to {self.max_board_area}')
+        if not (self.is_positive_ints(fleet, self.max_ship_length) and fleet):
+            raise SessionError(f'Fleet should be a list of lengths from 1 to {self.max_ship_length}')
+        return tuple(board_size), list(fleet)
+
+    async def create(self, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), fleet=None, seed=None) -> int:
+        if self.max_sessions and len(self.sessions) + self.creating >= self.max_sessions:
+            raise SessionError('Too many sessions')
+        board_size, fleet = self.check_game(board_size, STANDART_FLEET if fleet is None else fleet)
+        self.creating += 1
+        try:
+            try:
+                feasible = await self.run(ShipService.is_fleet_feasible, *board_size, fleet, self.max_search_states)
+            except SearchLimitError:
+                raise SessionError(f'Fleet {fleet} is too hard to place on the field {board_size}')
+            if not feasible:
+                raise SessionError(f'Fleet {fleet} can not be placed on the field {board_size}')
+            field, enemy = await self.run(new_layouts, board_size, fleet, seed, executor=self.placement_executor)
+        finally:
+            self.creating -= 1
+        session = Session(next(self.ids), Field.from_bytes(field), Field.from_bytes(enemy),
+                          TargetField(*board_size, rng=Random(seed)))
+        self.sessions[session.id] = session
+        return session.id
+
+    async def shoot(self, session_id, x, y) -> dict:
+        session = self.session(session_id)
+        async with session.lock:
+            if session.winner:
+                raise SessionError('Game is over')
+            outcome = ShipService.fire(session.enemy, x, y)
+            session.shots[0] += 1
+            replies = []
+            if outcome.result == Outcome.WIN:
+                session.winner = 'player'
+            elif not outcome.is_hit:
+                replies = await self.run(session.computer_turn)
+            return dict(outcome._asdict(), replies=replies, winner=session.winner)
+
+    async def status(self, session_id) -> dict:
+        session = self.session(session_id)
+        return dict(player=session.field.fleet_status(), computer=session.enemy.fleet_status(),
+                    shots=list(session.shots), winner=session.winner)
+
+    async def close(self, session_id) -> dict:
+        self.sessions.pop(self.session(session_id).id)
+        return {}
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Response to one request of the protocol
+        """
+        response = dict(id=request.get('id'))
+        try:
+            command = request.get('cmd')
+            if command == 'create':
+                response['session'] = await self.create(
+                    request.get('board_size', (DEFAULT_MAX_X, DEFAULT_MAX_Y)), request.get('fleet'), request.get('seed'))
+            elif command == 'shoot':
+                response.update(await self.shoot(request['session'], int(request['x']), int(request['y'])))
+            elif command in ('status', 'close'):
+                response.update(await getattr(self, command)(request['session']))
+            else:
+                raise SessionError(f'Unknown command: {command}')
+        except (SessionError, CoordOutOfRange, PlacementError, KeyError, TypeError, ValueError, OverflowError) as e:
+            return dict(id=request.get('id'), ok=False, error=str(e) or type(e).__name__)
+        except Exception as e:
+            logger.exception('Request %r failed', request)
+            return dict(id=request.get('id'), ok=False, error=f'Internal error: {type(e).__name__}')
+        response['ok'] = True
+        return response
+
+    async def serve_connection(self, reader, writer):
+        tasks = set()
+
+        async def respond(line):
+            try:
+                request = json.loads(line)
+                response = await self.handle(request) if isinstance(request, dict) else \
+                    dict(id=None, ok=False, error='Request should be an object')
+            except json.JSONDecodeError as e:
+                response = dict(id=None, ok=False, error=f'Bad JSON: {e}')
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, path=None) -> asyncio.AbstractServer:
+        """
+        Starts the server on TCP (host, port) or on the Unix socket `path`
+        """
+        if path:
+            return await asyncio.start_unix_server(self.serve_connection, path, limit=MAX_LINE)
+        return await asyncio.start_server(self.serve_connection, host, port, limit=MAX_LINE)
+
+
+async def serve(host='127.0.0.1', port=7777, path=None, workers=0, max_sessions=None,
+                max_board_area=MAX_BOARD_AREA, max_ship_length=MAX_SHIP_LENGTH, max_search_states=FEASIBILITY_STATES):
+    placement_executor = ProcessPoolExecutor(workers) if workers else None
+    manager = SessionManager(max_sessions=max_sessions, placement_executor=placement_executor,
+                             max_board_area=max_board_area, max_ship_length=max_ship_length,
+                             max_search_states=max_search_states)
+    server = await manager.start(host, port, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        placement_executor and placement_executor.shutdown()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Server of the games')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help='path of the Unix socket (instead of TCP)')
+    parser.add_argument('--workers', type=int, default=0, help='processes placing the ships (0 - threads)')
+    parser.add_argument('--max-sessions', type=int)
+    parser.add_argument('--max-board-area', type=int, default=MAX_BOARD_AREA)
+    parser.add_argument('--max-ship-length', type=int, default=MAX_SHIP_LENGTH)
+    parser.add_argument('--max-search-states', type=int, default=FEASIBILITY_STATES,
+                        help='limit of the search checking that the fleet can be placed')
+    args = parser.parse_args(args)
+    asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.max_sessions,
+                      args.max_board_area, args.max_ship_length, args.max_search_states))
+
+
+if __name__ == '__main__':
+    main()
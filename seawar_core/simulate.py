@@ -0,0 +1,158 @@
+"""
+Batch simulator of computer-vs-computer games.
+
+Every game gets its own seed derived from the seed of the simulation and the number of the game,
+so results don't depend on the number of workers and any game can be replayed with `play_game`.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from random import Random
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, STANDART_FLEET, Field, TargetField, ShipService, \
+    Outcome, ProbableStrategy
+
+
+def game_seed(seed, index) -> int:
+    """
+    Seed of the game number `index` in the simulation with `seed`
+    """
+    return int.from_bytes(sha256(f'{seed}:{index}'.encode()).digest()[:8], 'big')
+
+
+class GameResult:
+    __slots__ = ('seed', 'winner', 'turns', 'shots', 'hits', 'duration')
+
+    def __init__(self, seed, winner, turns, shots, hits, duration):
+        self.seed = seed
+        self.winner = winner
+        self.turns = turns
+        self.shots = shots
+        self.hits = hits
+        self.duration = duration
+
+    def __repr__(self):
+        return f'<GameResult (seed={self.seed}; winner={self.winner}; turns={self.turns})>'
+
+
+class SimulationStats:
+    """
+    Aggregated results of the games. Stats of different chunks of games are merged with `merge`
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.turns = 0
+        self.min_turns = None
+        self.max_turns = None
+        self.longest_seed = None
+        self.shots = 0
+        self.hits = 0
+        self.wins = [0, 0]
+        self.duration = 0.
+
+    def add(self, result: GameResult):
+        self.games += 1
+        self.turns += result.turns
+        if self.min_turns is None or result.turns < self.min_turns:
+            self.min_turns = result.turns
+        if self.max_turns is None or result.turns > self.max_turns:
+            self.max_turns = result.turns
+            self.longest_seed = result.seed
+        self.shots += result.shots
+        self.hits += result.hits
+        self.wins[result.winner] += 1
+        self.duration += result.duration
+
+    def merge(self, other: 'SimulationStats'):
+        self.games += other.games
+        self.turns += other.turns
+        if other.min_turns is not None and (self.min_turns is None or other.min_turns < self.min_turns):
+            self.min_turns = other.min_turns
+        if other.max_turns is not None and (self.max_turns is None or other.max_turns > self.max_turns):
+            self.max_turns = other.max_turns
+            self.longest_seed = other.longest_seed
+        self.shots += other.shots
+        self.hits += other.hits
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.duration += other.duration
+
+    @property
+    def hit_ratio(self):
+        return self.hits / self.shots if self.shots else 0.
+
+    def as_dict(self):
+        return dict(
+            games=self.games,
+            turns_mean=self.turns / self.games if self.games else 0.,
+            turns_min=self.min_turns,
+            turns_max=self.max_turns,
+            longest_seed=self.longest_seed,
+            hit_ratio=self.hit_ratio,
+            wins=list(self.wins),
+            ms_per_game=self.duration / self.games * 1000 if self.games else 0.,
+        )
+
+
+def play_game(seed, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), strategy=ProbableStrategy) -> GameResult:
+    """
+    Plays one game of two computer players. Turn of the player lasts until the first miss.
+    All random choices are made by `random.Random(seed)`, so the game is fully defined by its seed
+    """
+    started = time.perf_counter()
+    rng = Random(seed)
+    fleet = fleet or STANDART_FLEET
+    fields = [Field(*board_size), Field(*board_size)]
+    for field in fields:
+        ShipService.put_ships_random(field, fleet, rng)
+    targets = [TargetField(*board_size, strategy=strategy(fleet), rng=rng) for _ in fields]
+
+    player, turns, shots, hits = 0, 1, 0, 0
+    while True:
+        outcome = ShipService.fire(fields[1 - player], *targets[player].select_cell())
+        targets[player].apply_outcome(outcome)
+        shots += 1
+        hits += outcome.is_hit
+        if outcome.result == Outcome.WIN:
+            return GameResult(seed, player, turns, shots, hits, time.perf_counter() - started)
+        if not outcome.is_hit:
+            player = 1 - player
+            turns += 1
+
+
+def play_games(seed, indexes, fleet, board_size, strategy) -> SimulationStats:
+    stats = SimulationStats()
+    for index in indexes:
+        stats.add(play_game(game_seed(seed, index), fleet, board_size, strategy))
+    return stats
+
+
+def simulate_iter(n_games, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), workers=None, seed=0,
+                  strategy=ProbableStrategy, chunk_size=100):
+    """
+    Plays `n_games` games in the pool of `workers` processes (in the current process if workers == 1)
+    and yields aggregated stats after every finished chunk of games
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [range(start, min(start + chunk_size, n_games)) for start in range(0, n_games, chunk_size)]
+    stats = SimulationStats()
+    if workers == 1:
+        for chunk in chunks:
+            stats.merge(play_games(seed, chunk, fleet, board_size, strategy))
+            yield stats
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, seed, chunk, fleet, board_size, strategy) for chunk in chunks]
+        for future in futures:
+            stats.merge(future.result())
+            yield stats
+
+
+def simulate(n_games, fleet=None, board_size=(DEFAULT_MAX_X, DEFAULT_MAX_Y), workers=None, seed=0,
+             strategy=ProbableStrategy) -> SimulationStats:
+    stats = SimulationStats()
+    for stats in simulate_iter(n_games, fleet, board_size, workers, seed, strategy):
+        pass
+    return stats
@@ -0,0 +1,172 @@
+from random import randrange
+
+from .seawar_core import DEFAULT_MAX_X, DEFAULT_MAX_Y, Field, TargetField, ProbableStrategy, ProxyCellField, \
+    ProxyCellTarget, SnapshotJournal, check_coord
+from .registry import ShipRegistry
+
+SAMPLE_TRIES = 1000     # random tries before the full scan of the field in random_vektor / select_cell
+
+
+class SparseField(SnapshotJournal, Field):
+    """
+    Field for very big boards: only cells with not default value are kept (in `values` dict),
+    shot cells - in `shot` set, and cells are created by `get` on demand.
+    Random placement takes random vektors until a suitable one is found and number of alive ship cells
+    is counted on every change, so placement and is_fleet_killed don't depend on the size of the field.
+    `cells` and `get_available_vectors` still go through the whole field
+    """
+    cell_class = ProxyCellField
+    free_values = ('empty', )
+
+    # noinspection PyMissingConstructor
+    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y):
+        self.max_x = max_x
+        self.max_y = max_y
+        self.ships = ShipRegistry()
+        self.values = {}
+        self.shot = set()
+        self.alive_cells = 0
+
+    def snapshot(self):
+        return dict(self.values), set(self.shot), self.alive_cells, self.ships.copy()
+
+    def restore(self, snapshot):
+        self.values, self.shot, self.alive_cells, self.ships = snapshot
+
+    def value_at(self, x, y):
+        return self.values.get((x, y), self.cell_class.default_value)
+
+    def mark_at(self, x, y, value):
+        old_value = self.values.get((x, y), self.cell_class.default_value)
+        if old_value == value:
+            return
+        is_alive = (x, y) not in self.shot
+        if old_value == 'ship':
+            self.ships.discard(x, y)
+            self.alive_cells -= is_alive
+        elif value == 'ship':
+            self.alive_cells += is_alive
+        if value == self.cell_class.default_value:
+            del self.values[(x, y)]
+        else:
+            self.values[(x, y)] = value
+
+    def is_shooted_at(self, x, y):
+        return (x, y) in self.shot
+
+    def shoot_at(self, x, y, is_shooted=True):
+        if ((x, y) in self.shot) != is_shooted:
+            self.shot.add((x, y)) if is_shooted else self.shot.discard((x, y))
+            if self.values.get((x, y)) == 'ship':
+                self.alive_cells += -1 if is_shooted else 1
+                self.ships.hit(x, y) if is_shooted else self.ships.restore(x, y)
+
+    def iter_cells(self):
+        return (self.cell_class(self, x, y) for y in range(self.max_y) for x in range(self.max_x))
+
+    def cells_by_value(self, value):
+        if value == self.cell_class.default_value:
+            return super(SparseField, self).cells_by_value(value)
+        coords = sorted((y, x) for (x, y), v in self.values.items() if v == value)
+        return (self.cell_class(self, x, y) for y, x in coords)
+
+    @property
+    def occupied_cells(self):
+        """
+        Cells with not default value
+        """
+        return [self.cell_class(self, x, y) for x, y in self.values]
+
+    def get(self, x, y):
+        return self.cell_class(self, x, y)
+
+    @check_coord
+    def set(self, x, y, value, is_shooted=False):
+        cell = self.get(x, y)
+        cell.value = value
+        cell.is_shooted = is_shooted
+
+    def draw_ship(self, coords):
+        for x, y in coords:
+            self.mark_at(x, y, 'ship')
+
+    def draw_border(self, coords):
+        for x, y in coords:
+            self.mark_at(x, y, 'border')
+
+    def is_free(self, x, y):
+        return self.values.get((x, y), self.cell_class.default_value) in self.free_values
+
+    def is_suitable_ship_vektor(self, coord_x, coord_y, length, is_vertical=False):
+        end_x, end_y = (coord_x, coord_y + length - 1) if is_vertical else (coord_x + length - 1, coord_y)
+        if length < 1 or not (self.is_correct_coord(coord_x, coord_y) and self.is_correct_coord(end_x, end_y)):
+            return False
+        return all(self.is_free(x, y) for x in range(coord_x, end_x + 1) for y in range(coord_y, end_y + 1))
+
+    def make_placement_index(self, fleet):
+        return None
+
+    def random_vektor(self, length, rng=None):
+        """
+        Takes random vektors (all vektors inside of the field are equiprobable) until a suitable one is found.
+        After SAMPLE_TRIES tries chooses from all available vektors
+        """
+        horizontal = max(self.max_x - length + 1, 0) * self.max_y
+        total = horizontal + self.max_x * max(self.max_y - length + 1, 0)
+        for _ in range(SAMPLE_TRIES if total else 0):
+            index = rng.randrange(total) if rng else randrange(total)
+            if index < horizontal:
+                vektor = (index % (self.max_x - length + 1), index // (self.max_x - length + 1), length, False)
+            else:
+                index -= horizontal
+                vektor = (index % self.max_x, index // self.max_x, length, True)
+            if self.is_suitable_ship_vektor(*vektor):
+                return vektor
+        return super(SparseField, self).random_vektor(length, rng)
+
+
+class SparseTargetField(SparseField, TargetField):
+    """
+    Target field for very big boards. Cells are selected like ProbableStrategy does
+    (other strategies keep data for every cell and are not supported)
+    """
+    cell_class = ProxyCellTarget
+    free_values = ('empty', 'probable')
+
+    # noinspection PyMissingConstructor
+    def __init__(self, max_x=DEFAULT_MAX_X, max_y=DEFAULT_MAX_Y, strategy=None, rng=None):
+        if strategy is not None:
+            raise ValueError('SparseTargetField does not support strategies')
+        super(SparseTargetField, self).__init__(max_x, max_y)
+        self.rng = rng
+        self.strategy = ProbableStrategy()
+        self.probable = {}      # probable cells in the order they were marked
+
+    def snapshot(self):
+        return super(SparseTargetField, self).snapshot() + (dict(self.probable), )
+
+    def restore(self, snapshot):
+        super(SparseTargetField, self).restore(snapshot[:-1])
+        self.probable = snapshot[-1]
+
+    def mark_at(self, x, y, value):
+        super(SparseTargetField, self).mark_at(x, y, value)
+        if value == 'probable':
+            self.probable[(x, y)] = None
+        else:
+            self.probable.pop((x, y), None)
+
+    def select_cell(self):
+        if self.probable:
+            return self.choice(list(self.probable))
+        for _ in range(SAMPLE_TRIES):
+            x, y = (self.rng.randrange(self.max_x), self.rng.randrange(self.max_y)) if self.rng else \
+                (randrange(self.max_x), randrange(self.max_y))
+            if self.is_free(x, y):
+                return x, y
+        return self.choice([(c.x, c.y) for c in self.iter_cells() if c.is_empty])
+
+    def mark_killed(self, border, ship=None):
+        self.events is not None and self.events.kill(border, ship)
+        for x, y in border:
+            self.is_free(x, y) and self.mark_at(x, y, 'border')
@@ -0,0 +1,54 @@
+class OrderedSubset:
+    """
+    Subset of the fixed ordered list of items. Item is added and removed by its position
+    in O(log n): Fenwick tree over presence marks finds k-th present item, so the subset
+    keeps the order of the items and can be passed to random.choice as a list would be
+    """
+
+    def __init__(self, items, present=True):
+        self.items = items
+        self.present = [present] * len(items)
+        self.size = len(items) if present else 0
+        self.tree = [0] + [int(present)] * len(items)
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError('OrderedSubset index out of range')
+        position, step = 0, 1 << len(self.items).bit_length()
+        while step:
+            if position + step < len(self.tree) and self.tree[position + step] <= index:
+                position += step
+                index -= self.tree[position]
+            step >>= 1
+        return self.items[position]
+
+    def __iter__(self):
+        return (item for item, present in zip(self.items, self.present) if present)
+
+    def __contains__(self, position):
+        return self.present[position]
+
+    def update_tree(self, position, delta):
+        i = position + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def add(self, position):
+        if not self.present[position]:
+            self.present[position] = True
+            self.size += 1
+            self.update_tree(position, 1)
+
+    def discard(self, position):
+        if self.present[position]:
+            self.present[position] = False
+            self.size -= 1
+            self.update_tree(position, -1)
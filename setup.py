@@ -5,5 +5,8 @@ setup(
     name='seawar_core',
     version='2.0.0',
     packages=find_packages(),
+    extras_require={
+        'numpy': ['numpy'],
+    },
     long_description=open(join(dirname(__file__), 'README.md')).read(),
 )
@@ -0,0 +1,15 @@
+from seawar_core.seawar_core import ShipService, Outcome
+
+
+def play(field, target, limit=1000):
+    """
+    Target field shoots to the field until the win or `limit` shots. Returns the number of the shots
+    """
+    shots = 0
+    while shots < limit:
+        outcome = ShipService.fire(field, *target.select_cell())
+        target.apply_outcome(outcome)
+        shots += 1
+        if outcome.result == Outcome.WIN:
+            break
+    return shots
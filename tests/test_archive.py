@@ -0,0 +1,51 @@
+import os
+import random
+import tempfile
+import unittest
+
+from seawar_core.bitboard import BitField
+from seawar_core.archive import write_layouts, LayoutArchive, record_size, ARCHIVE_HEADER
+
+
+class LayoutArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_write_and_read(self):
+        size = write_layouts(self.path, 20, [3, 2, 1], (6, 6), seed=4)
+        self.assertEqual(size, os.path.getsize(self.path))
+        self.assertEqual(size, ARCHIVE_HEADER.size + 3 + 20 * record_size(6, 6))
+
+        with LayoutArchive(self.path) as archive:
+            self.assertEqual((len(archive), archive.fleet, archive.max_x), (20, [3, 2, 1], 6))
+            field = archive.field(7)
+            self.assertEqual((field.max_x, field.max_y), (6, 6))
+            self.assertEqual(sorted(len(ship.coords) for ship in field.ships), [1, 2, 3])
+            self.assertEqual(field.fleet_status()['cells_alive'], 6)
+            self.assertRaises(IndexError, archive.field, 20)
+
+            self.assertEqual(archive.random_field(random.Random(1)).to_bytes(),
+                             archive.field(random.Random(1).randrange(20)).to_bytes())
+
+    def test_reproducible(self):
+        write_layouts(self.path, 5, seed=1)
+        with LayoutArchive(self.path, BitField) as archive:
+            first = [archive.field(i).to_bytes() for i in range(5)]
+            self.assertIsInstance(archive.field(0), BitField)
+        write_layouts(self.path, 5, seed=1)
+        with LayoutArchive(self.path) as archive:
+            self.assertEqual([archive.field(i).to_bytes() for i in range(5)], first)
+
+    def test_bad_file(self):
+        write_layouts(self.path, 5, seed=1)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(ValueError, LayoutArchive, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, LayoutArchive, self.path)
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, ShipService
+
+try:
+    from seawar_core.array_field import ArrayField, ArrayTargetField
+except ImportError:
+    ArrayField = ArrayTargetField = None
+
+
+@unittest.skipIf(ArrayField is None, 'numpy is not installed')
+class ArrayFieldTest(unittest.TestCase):
+
+    def test_init(self):
+        f = ArrayField(5, 3)
+        self.assertEqual(f.grid.shape, (3, 5))
+        self.assertEqual(len(f.cells), 15)
+        for c in f.cells:
+            self.assertTrue(c.is_empty)
+            self.assertFalse(c.is_shooted)
+
+    def test_get_available_vectors(self):
+        f = ArrayField(3, 3)
+        f.get(0, 0).mark_ship()
+        f.get(0, 1).mark_border()
+        f.get(1, 0).mark_border()
+        f.get(1, 1).mark_border()
+
+        self.assertEqual(
+            ShipService.get_available_vectors(f, 3),
+            [(2, 0, 3, True), (0, 2, 3, False)])
+        self.assertEqual(
+            ShipService.get_available_vectors(f, 2),
+            [(2, 0, 2, True), (2, 1, 2, True), (0, 2, 2, False), (1, 2, 2, False)])
+        self.assertEqual(ShipService.get_available_vectors(f, 4), [])
+        self.assertEqual(ShipService.get_available_vectors(f, 0), [])
+
+    def test_same_vectors_as_field(self):
+        for seed, (max_x, max_y) in enumerate([(10, 10), (7, 4), (3, 12), (25, 25)]):
+            fields = Field(max_x, max_y), ArrayField(max_x, max_y)
+            for f in fields:
+                random.seed(seed)
+                ShipService.put_ships_random(f, [3, 2, 2, 1])
+            self.assertEqual(
+                [(c.x, c.y, c.value) for c in fields[0].cells],
+                [(c.x, c.y, c.value) for c in fields[1].cells])
+            for length in range(0, 6):
+                self.assertEqual(
+                    ShipService.get_available_vectors(fields[0], length),
+                    ShipService.get_available_vectors(fields[1], length))
+
+    def test_shoot_and_kill(self):
+        f = ArrayField(5, 5)
+        ShipService.put_ship(f, 0, 0, 2, True)
+        self.assertFalse(ShipService.is_fleet_killed(f))
+        self.assertTrue(ShipService.shoot_to(f, 0, 0))
+        self.assertEqual(ShipService.get_ship_if_killed(f, 0, 0), {})
+        self.assertTrue(ShipService.shoot_to(f, 0, 1))
+        killed = ShipService.get_ship_if_killed(f, 0, 1)
+        self.assertEqual(set(killed['ship']), {(0, 0), (0, 1)})
+        self.assertEqual(set(killed['border']), {(1, 0), (1, 1), (1, 2), (0, 2)})
+        self.assertTrue(ShipService.is_fleet_killed(f))
+
+    def test_target_field(self):
+        f = ArrayTargetField(5, 5)
+        f.shoot_response(2, 2, True)
+        self.assertTrue(f.get(2, 2).is_hit)
+        self.assertTrue(f.get(2, 1).is_probable)
+        self.assertTrue(f.get(1, 1).is_border)
+        for i in range(10):
+            self.assertIn(f.select_cell(), [(2, 1), (1, 2), (3, 2), (2, 3)])
+
+    def test_mark_killed(self):
+        field, target = Field(5, 5), ArrayTargetField(5, 5)
+        ShipService.put_ship(field, 1, 1, 2)
+        target.apply_outcome(ShipService.fire(field, 0, 0))
+        target.apply_outcome(ShipService.fire(field, 1, 1))
+        outcome = ShipService.fire(field, 2, 1)
+        target.apply_outcome(outcome)
+        self.assertEqual(outcome.result, 'win')
+        self.assertTrue(target.get(0, 0).is_miss)
+        self.assertTrue(all(target.get(*c).is_hit for c in outcome.ship))
+        self.assertTrue(all(target.get(*c).is_border or target.get(*c).is_miss for c in outcome.border))
+        self.assertFalse(any(cell.is_probable for cell in target.iter_cells()))
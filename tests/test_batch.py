@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import ShipService, STANDART_FLEET
+from seawar_core.placement import PlacementError
+
+try:
+    import numpy as np
+    from seawar_core.batch import BatchField, RESULTS, WIN
+except ImportError:
+    BatchField = None
+
+
+@unittest.skipIf(BatchField is None, 'numpy is not installed')
+class BatchFieldTest(unittest.TestCase):
+
+    def test_put_ships_random(self):
+        batch = BatchField(50)
+        batch.put_ships_random(rng=np.random.default_rng(1))
+        self.assertTrue((batch.alive_cells == sum(STANDART_FLEET)).all())
+        self.assertFalse(batch.is_fleet_killed().any())
+        for index in range(0, 50, 7):
+            field = batch.field(index)
+            self.assertEqual(sorted(len(ship.coords) for ship in field.ships), sorted(STANDART_FLEET))
+            self.assertEqual([c.value for c in field.cells], [('empty', 'ship', 'border')[code]
+                                                              for code in batch.grid[index].ravel()])
+
+    def test_dense_fleet(self):
+        batch = BatchField(20, 6, 6)
+        batch.put_ships_random([3, 3, 2, 2, 1, 1], np.random.default_rng(2))
+        self.assertTrue((batch.alive_cells == 12).all())
+        with self.assertRaises(PlacementError):
+            BatchField(3, 3, 3).put_ships_random([3, 3, 3], max_attempts=5)
+
+    def test_shoot_to(self):
+        rng = random.Random(3)
+        batch = BatchField(30, 6, 6)
+        batch.put_ships_random([3, 2, 1], np.random.default_rng(3))
+        fields = [batch.field(index) for index in range(30)]
+        for _ in range(60):
+            xs = [rng.randrange(6) for _ in fields]
+            ys = [rng.randrange(6) for _ in fields]
+            results = batch.shoot_to(xs, ys)
+            expected = [ShipService.fire(f, x, y).result for f, x, y in zip(fields, xs, ys)]
+            self.assertEqual([RESULTS[r] for r in results], expected)
+            self.assertEqual(list(batch.is_fleet_killed()), [ShipService.is_fleet_killed(f) for f in fields])
+
+    def test_games_subset(self):
+        batch = BatchField(2, 3, 3)
+        batch.put_ships_random([1], np.random.default_rng(4))
+        x, y = batch.vektors[1, 0, :2]
+        self.assertEqual(list(batch.shoot_to([x], [y], games=[1])), [WIN])
+        self.assertEqual(list(batch.is_fleet_killed()), [False, True])
+        self.assertFalse(batch.shot[0].any())
@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService, CoordOutOfRange, UnknownCellValue
+from seawar_core.bitboard import BitField, BitTargetField
+
+
+def field_state(field):
+    return [(c.x, c.y, c.value, c.is_shooted) for c in field.cells]
+
+
+class BitFieldTest(unittest.TestCase):
+
+    def test_init(self):
+        f = BitField(5, 3)
+        self.assertEqual(len(f.cells), 15)
+        for c in f.cells:
+            self.assertEqual(c.value, 'empty')
+            self.assertFalse(c.is_shooted)
+
+    def test_cell_proxy(self):
+        f = BitField(5, 5)
+        f.get(2, 3).mark_ship()
+        self.assertTrue(f.get(2, 3).is_ship)
+        self.assertFalse(f.get(2, 3).is_empty)
+        self.assertTrue(f.get(2, 3).shoot())
+        self.assertTrue(f.get(2, 3).is_shooted)
+        self.assertFalse(f.get(3, 2).shoot())
+
+    def test_set(self):
+        f = BitField(5, 5)
+        f.set(2, 2, 'border', True)
+        self.assertTrue(f.get(2, 2).is_border)
+        self.assertTrue(f.get(2, 2).is_shooted)
+        with self.assertRaises(CoordOutOfRange):
+            f.set(5, 2, 'ship')
+        with self.assertRaises(UnknownCellValue):
+            f.set(1, 1, 'unknown')
+
+    def test_borders_do_not_wrap(self):
+        f = BitField(4, 4)
+        self.assertEqual(set(f.borders_by_vektor(3, 0, 1)), {(2, 0), (2, 1), (3, 1)})
+        self.assertEqual(set(f.borders_by_vektor(0, 1, 1)), {(0, 0), (1, 0), (1, 1), (0, 2), (1, 2)})
+
+    def test_is_suitable_vector(self):
+        f = BitField(5, 5)
+        self.assertTrue(f.is_suitable_ship_vektor(2, 0, 3))
+        self.assertFalse(f.is_suitable_ship_vektor(3, 3, 3))
+        self.assertFalse(f.is_suitable_ship_vektor(-1, 1, 3))
+        self.assertFalse(f.is_suitable_ship_vektor(1, 3, 3, True))
+        f.get(4, 0).mark_border()
+        self.assertFalse(f.is_suitable_ship_vektor(2, 0, 3))
+
+
+class BitFieldDifferentialTest(unittest.TestCase):
+    """
+    Plays the same seeded scenarios on the object-backed and bitboard-backed fields
+    and checks that they give exactly the same results
+    """
+
+    sizes = [(10, 10), (7, 5), (4, 9), (12, 12)]
+
+    def fleet_for(self, max_x, max_y):
+        return [4, 3, 3, 2, 2, 2, 1, 1, 1, 1] if max_x * max_y >= 100 else [3, 2, 1, 1]
+
+    def test_available_vectors(self):
+        for seed, (max_x, max_y) in enumerate(self.sizes):
+            fields = Field(max_x, max_y), BitField(max_x, max_y)
+            for f in fields:
+                random.seed(seed)
+                ShipService.put_ships_random(f, [2, 1])
+            for length in range(1, 6):
+                self.assertEqual(
+                    ShipService.get_available_vectors(fields[0], length),
+                    ShipService.get_available_vectors(fields[1], length))
+
+    def test_placement_and_shooting(self):
+        for seed, (max_x, max_y) in enumerate(self.sizes):
+            fields = Field(max_x, max_y), BitField(max_x, max_y)
+            for f in fields:
+                random.seed(seed)
+                ShipService.put_ships_random(f, self.fleet_for(max_x, max_y))
+            self.assertEqual(field_state(fields[0]), field_state(fields[1]))
+
+            shots = [(x, y) for x in range(max_x) for y in range(max_y)]
+            random.Random(seed).shuffle(shots)
+            for x, y in shots:
+                results = []
+                for f in fields:
+                    killed = ShipService.get_ship_if_killed(f, x, y)
+                    results.append((
+                        ShipService.shoot_to(f, x, y),
+                        sorted(ShipService.get_ship_by_cell(f, x, y)),
+                        {k: sorted(v) for k, v in killed.items()},
+                        ShipService.is_fleet_killed(f)))
+                self.assertEqual(results[0], results[1])
+            self.assertEqual(field_state(fields[0]), field_state(fields[1]))
+            self.assertEqual(str(fields[0]), str(fields[1]))
+
+    def test_target_field_game(self):
+        for seed, (max_x, max_y) in enumerate(self.sizes):
+            user_field = Field(max_x, max_y)
+            random.seed(seed)
+            ShipService.put_ships_random(user_field, self.fleet_for(max_x, max_y))
+
+            games = []
+            for target in TargetField(max_x, max_y), BitTargetField(max_x, max_y):
+                field = BitField(max_x, max_y)
+                [field.set(c.x, c.y, c.value) for c in user_field.cells]
+                random.seed(seed)
+                moves = []
+                while not ShipService.is_fleet_killed(field):
+                    x, y = target.select_cell()
+                    hit = ShipService.shoot_to(field, x, y)
+                    target.shoot_response(x, y, hit)
+                    killed = ShipService.get_ship_if_killed(field, x, y)
+                    killed and target.mark_killed(killed['border'])
+                    moves.append((x, y, hit))
+                games.append((moves, [(c.x, c.y, c.value) for c in target.cells]))
+            self.assertEqual(games[0], games[1])
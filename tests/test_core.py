@@ -1,7 +1,7 @@
 import unittest
 
 from seawar_core.seawar_core import base_cell, Matrix, Field, ShipService, CellField, CoordOutOfRange, UnknownCellValue, \
-    TargetField, CellTarget
+    TargetField, CellTarget, Outcome
 
 
 class CellTest2(unittest.TestCase):
@@ -223,6 +223,16 @@ class FieldTest(unittest.TestCase):
         with self.assertRaises(UnknownCellValue):
             f.set(1, 1, 'unknown')
 
+    def test_views(self):
+        f = Field(4, 3)
+        f.draw_ship([(1, 0), (1, 1)])
+        self.assertEqual(list(f.iter_cells()), f.cells)
+        self.assertEqual([(c.x, c.y) for c in f.cells_by_value('ship')], [(1, 0), (1, 1)])
+        self.assertEqual([[(c.x, c.y) for c in row] for row in f.rows()][2], [(0, 2), (1, 2), (2, 2), (3, 2)])
+        self.assertEqual([c.value for c in list(f.columns())[1]], ['ship', 'ship', 'empty'])
+        self.assertEqual([(c.x, c.y) for c in f.window(2, 1, 5, 5)], [(2, 1), (3, 1), (2, 2), (3, 2)])
+        self.assertEqual([(c.x, c.y) for c in f.window(-1, -1, 2, 2)], [(0, 0)])
+
 
 class FilterCorrectCoord(unittest.TestCase):
 
@@ -381,6 +391,38 @@ class ShipServiceTest(unittest.TestCase):
             ShipService.get_ship_if_killed(f, 0, 32)
 
 
+class ShipServiceFireTest(unittest.TestCase):
+
+    def test_fire(self):
+        f = Field(5, 5)
+        ShipService.put_ship(f, 0, 0, 2, True)
+        ShipService.put_ship(f, 3, 3, 1)
+
+        self.assertEqual(ShipService.fire(f, 2, 2), (Outcome.MISS, 2, 2, None, None))
+        self.assertTrue(f.get(2, 2).is_shooted)
+        self.assertEqual(ShipService.fire(f, 0, 1), (Outcome.HIT, 0, 1, None, None))
+
+        outcome = ShipService.fire(f, 0, 0)
+        self.assertEqual(outcome.result, Outcome.KILL)
+        self.assertTrue(outcome.is_hit)
+        self.assertEqual(set(outcome.ship), {(0, 0), (0, 1)})
+        self.assertEqual(set(outcome.border), {(1, 0), (1, 1), (1, 2), (0, 2)})
+
+        outcome = ShipService.fire(f, 3, 3)
+        self.assertEqual(outcome.result, Outcome.WIN)
+        self.assertEqual(outcome.ship, [(3, 3)])
+
+    def test_fire_drawn_ship(self):
+        f = Field(4, 4)
+        f.draw_ship([(1, 1)])
+        self.assertEqual(ShipService.fire(f, 1, 1).result, Outcome.WIN)
+
+    def test_fire_outrange(self):
+        f = Field(4, 4)
+        with self.assertRaises(CoordOutOfRange):
+            ShipService.fire(f, 4, 0)
+
+
 class TargetCellTest(unittest.TestCase):
 
     def test_methods(self):
@@ -458,6 +500,29 @@ class TargetFieldTest(unittest.TestCase):
             else:
                 self.assertTrue(c.is_empty)
 
+    def test_candidate_cells(self):
+        f = TargetField(5, 5)
+        f.shoot_response(1, 1, True)
+        f.shoot_response(3, 3, False)
+        f.get(4, 4).mark_probable()
+        f.mark_killed([(0, 0), (1, 0), (2, 0), (4, 4)])
+        f.set(0, 1, 'empty')
+        self.assertEqual(list(f.probable_cells), [(c.x, c.y) for c in f.cells if c.is_probable])
+        self.assertEqual(list(f.empty_cells), [(c.x, c.y) for c in f.cells if c.is_empty])
+        self.assertEqual(list(f.probable_cells), [(2, 1), (1, 2)])
+
+    def test_apply_outcome(self):
+        f = TargetField(5, 5)
+        f.apply_outcome(Outcome(Outcome.MISS, 4, 4))
+        f.apply_outcome(Outcome(Outcome.HIT, 0, 1))
+        f.apply_outcome(Outcome(Outcome.KILL, 0, 0, [(0, 0), (0, 1)], [(1, 0), (1, 1), (1, 2), (0, 2)]))
+        self.assertTrue(f.get(4, 4).is_miss)
+        self.assertTrue(f.get(0, 0).is_hit)
+        self.assertTrue(f.get(0, 1).is_hit)
+        for c in (1, 0), (1, 1), (1, 2), (0, 2):
+            self.assertTrue(f.get(*c).is_border)
+        self.assertEqual(f.get(0, 3).value, 'empty')
+
 
 class TargetFieldTestProbability(unittest.TestCase):
 
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService, ProbableStrategy
+from seawar_core.density import DensityStrategy
+
+from .helpers import play
+
+
+class DensityStrategyTest(unittest.TestCase):
+
+    def test_initial_heat(self):
+        target = TargetField(3, 3, DensityStrategy([2]))
+        # every cell of 3x3 field is covered by 2 horizontal (or 1 for the middle column) and the same vertical
+        self.assertEqual(target.strategy.heat, [2, 3, 2, 3, 4, 3, 2, 3, 2])
+        self.assertEqual(target.select_cell(), (1, 1))
+
+    def test_single_cell_ships(self):
+        target = TargetField(4, 1, DensityStrategy([2, 1]))
+        # horizontal placements of the 2-ship and one placement of the 1-ship for every cell
+        self.assertEqual(target.strategy.heat, [2, 3, 3, 2])
+
+    def test_miss_blocks_placements(self):
+        target = TargetField(3, 3, DensityStrategy([2]))
+        target.shoot_response(1, 1, False)
+        self.assertEqual(target.strategy.heat, [2, 2, 2, 2, 0, 2, 2, 2, 2])
+
+    def test_hit_is_preferred(self):
+        target = TargetField(5, 5, DensityStrategy([2]))
+        target.shoot_response(0, 0, True)
+        self.assertIn(target.select_cell(), [(1, 0), (0, 1)])
+
+    def test_ship_by_border(self):
+        self.assertEqual(
+            DensityStrategy.ship_by_border([(0, 1), (1, 1), (2, 1), (2, 0)]),
+            [(0, 0), (1, 0)])
+        self.assertEqual(DensityStrategy.ship_by_border([]), [])
+
+    def test_kill_along_the_edge(self):
+        target = TargetField(4, 4, DensityStrategy([4, 1]))
+        for x in range(4):
+            target.shoot_response(x, 0, True)
+        border = [(x, 1) for x in range(4)]
+        self.assertEqual(DensityStrategy.ship_by_border(border), [])
+        self.assertEqual(DensityStrategy.ship_by_border(border, target), [(x, 0) for x in range(4)])
+        target.mark_killed(border)
+        self.assertEqual(target.strategy.alive[4], 0)
+
+    def test_incremental_same_as_rebuilt(self):
+        random.seed(3)
+        field = Field()
+        ShipService.put_ships_random(field)
+        target = TargetField(strategy=DensityStrategy())
+        killed = []
+        for i in range(40):
+            outcome = ShipService.fire(field, *target.select_cell())
+            target.apply_outcome(outcome)
+            outcome.is_killed and killed.append(outcome)
+
+        rebuilt = DensityStrategy()
+        rebuilt.attach(target)
+        for outcome in killed:
+            rebuilt.ship_killed(target, outcome.border, outcome.ship)
+        self.assertEqual(target.strategy.heat, rebuilt.heat)
+        self.assertEqual(target.strategy.alive, rebuilt.alive)
+
+    def test_full_game(self):
+        for seed in range(5):
+            random.seed(seed)
+            field = Field()
+            ShipService.put_ships_random(field)
+            for strategy in ProbableStrategy(), DensityStrategy():
+                f = Field()
+                [f.set(c.x, c.y, c.value) for c in field.cells]
+                self.assertLessEqual(play(f, TargetField(strategy=strategy)), 100)
+                self.assertTrue(ShipService.is_fleet_killed(f))
@@ -0,0 +1,141 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService, Outcome
+from seawar_core.bitboard import BitField, BitTargetField
+from seawar_core.eventlog import EventLog, iter_events, replay, RECORDS, BOARD, PLACEMENT, SHOT, OUTCOME, KILL, END
+
+
+def play(log, seed, fleet=(3, 2, 1), size=(6, 6), finish=True):
+    """
+    Computer shoots to the user field until the win. Returns states of the fields after every shot
+    """
+    rng = random.Random(seed)
+    field, target = Field(*size), TargetField(*size, rng=rng)
+    log.record(field, target)
+    ShipService.put_ships_random(field, list(fleet), rng)
+    states = [(str(field), str(target))]
+    while True:
+        outcome = ShipService.fire(field, *target.select_cell())
+        target.apply_outcome(outcome)
+        states.append((str(field), str(target)))
+        if outcome.result == Outcome.WIN:
+            break
+    finish and log.finish(field, target)
+    return states
+
+
+class EventLogTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_replay(self):
+        with EventLog(self.path) as log:
+            games = [play(log, seed) for seed in range(3)]
+
+        replayed = list(replay(self.path))
+        self.assertEqual([game for game, _ in replayed], [1, 2, 3])
+        for (_, (field, target)), states in zip(replayed, games):
+            self.assertIsInstance(field, Field)
+            self.assertIsInstance(target, TargetField)
+            self.assertEqual((str(field), str(target)), states[-1])
+            self.assertTrue(field.is_fleet_killed())
+
+        for turn in (0, 1, 5, len(games[1]) - 1, 1000):
+            (game, fields), = replay(self.path, turn=turn, game=2)
+            self.assertEqual(game, 2)
+            self.assertEqual(tuple(str(f) for f in fields), games[1][min(turn, len(games[1]) - 1)])
+
+    def test_events(self):
+        stream = io.BytesIO()
+        log = EventLog(stream)
+        field, target = Field(5, 5), TargetField(5, 5)
+        log.record(field, game=7)
+        log.record(target, game=7)
+        ShipService.put_ship(field, 1, 1, 2, True)
+        ShipService.put_ship(Field(5, 5), 0, 0, 1)       # is not recorded
+        self.assertFalse(ShipService.shoot_to(field, 0, 0))
+        outcome = ShipService.fire(field, 1, 1)
+        target.apply_outcome(outcome)
+        outcome_kill = ShipService.fire(field, 1, 2)
+        target.apply_outcome(outcome_kill)
+        log.finish(field, target)
+        log.close()
+
+        events = list(iter_events(io.BytesIO(stream.getvalue()), chunk_size=7))
+        self.assertEqual([(e.kind, e.board) for e in events[1:]], [
+            (BOARD, 1), (BOARD, 2), (PLACEMENT, 1), (SHOT, 1), (OUTCOME, 1), (SHOT, 2), (OUTCOME, 1),
+            (SHOT, 2), (KILL, 2), (END, 1), (END, 2)])
+        self.assertEqual(events[1].args, (7, 0, 5, 5))
+        self.assertEqual(events[3].args, (1, 1, 2, True))
+        self.assertEqual([e.args for e in events[4:7]], [(0, 0, False), (1, 1, Outcome.HIT), (1, 1, True)])
+        self.assertEqual(events[9].args, (outcome_kill.border, [(1, 1), (1, 2)]))
+        self.assertIsNone(field.events)
+
+    def test_rollback(self):
+        with EventLog(self.path) as log:
+            rng = random.Random(2)
+            field, target = Field(6, 6), TargetField(6, 6, rng=rng)
+            field.checkpoint()
+            log.record(field, target)
+            ShipService.put_ship(field, 0, 0, 2)
+            ShipService.put_ship(field, 0, 3, 1)
+            target.apply_outcome(ShipService.fire(field, 5, 5))
+            before = (str(field), str(target))
+            field.checkpoint()
+            target.checkpoint()
+            for x, y in (0, 0), (1, 0):
+                target.apply_outcome(ShipService.fire(field, x, y))
+            self.assertEqual(field.fleet_status()['sunk'], {2: 1})
+            field.rollback()
+            target.rollback()
+            self.assertEqual(field.fleet_status()['ships_alive'], 2)
+            target.checkpoint()
+            target.apply_outcome(ShipService.fire(field, 0, 3))
+            target.commit()
+            after = (str(field), str(target))
+            field.rollback()        # the checkpoint made before the recording
+            log.finish(field, target)
+
+        (_, fields), = replay(self.path)
+        self.assertEqual(tuple(str(f) for f in fields), (str(field), after[1]))
+        self.assertEqual(fields[0].fleet_status()['ships_alive'], 0)
+        (_, fields), = replay(self.path, turn=2)
+        self.assertEqual(tuple(str(f) for f in fields), (str(field), after[1]))
+        (_, fields), = replay(self.path, turn=1)
+        self.assertEqual(str(fields[1]), before[1])
+
+    def test_segments(self):
+        with EventLog(self.path) as log:
+            first = play(log, 1, finish=False)
+        with EventLog(self.path) as log:
+            second = play(log, 2)
+
+        replayed = list(replay(self.path))
+        self.assertEqual([game for game, _ in replayed], [1, 1])
+        self.assertEqual([tuple(str(f) for f in fields) for _, fields in replayed], [first[-1], second[-1]])
+
+    def test_field_classes(self):
+        with EventLog(self.path) as log:
+            states = play(log, 4, size=(10, 10))
+        (_, fields), = replay(self.path, field_classes={0: BitField, 1: BitTargetField})
+        self.assertIsInstance(fields[1], BitTargetField)
+        self.assertEqual(tuple(str(f) for f in fields), states[-1])
+
+    def test_broken(self):
+        with EventLog(self.path) as log:
+            play(log, 1)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        self.assertRaisesRegex(ValueError, 'truncated', list, iter_events(io.BytesIO(data[:-2])))
+        self.assertRaisesRegex(ValueError, 'unknown record', list, iter_events(io.BytesIO(data[RECORDS[0].size:])))
+        self.assertRaisesRegex(ValueError, 'not a log', list, iter_events(io.BytesIO(b'\x00' * 20)))
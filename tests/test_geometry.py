@@ -0,0 +1,45 @@
+import unittest
+
+from seawar_core.seawar_core import Matrix, Field
+from seawar_core.geometry import geometry, Geometry, GEOMETRY_CACHE_SIZE
+
+
+class GeometryTest(unittest.TestCase):
+
+    def test_same_as_matrix(self):
+        for max_x, max_y in (10, 10), (4, 7), (1, 3):
+            f = Field(max_x, max_y)
+            g = geometry(max_x, max_y)
+            for c in f.cells:
+                self.assertEqual(set(g.ribs(c.x, c.y)),
+                                 {r for r in Matrix.ribs_for_coord(c.x, c.y) if f.is_correct_coord(*r)})
+                self.assertEqual(set(g.corners(c.x, c.y)),
+                                 {r for r in Matrix.conrers_for_coord(c.x, c.y) if f.is_correct_coord(*r)})
+                for length in range(1, 5):
+                    for is_vertical in True, False:
+                        self.assertEqual(
+                            sorted(g.borders(c.x, c.y, length, is_vertical)),
+                            sorted(b for b in Matrix.borders_by_vektor(c.x, c.y, length, is_vertical)
+                                   if f.is_correct_coord(*b)))
+
+    def test_matrix_serves_from_geometry(self):
+        f = Field(4, 4)
+        self.assertEqual(Matrix.ribs_for_coord(f, 0, 0), [(1, 0), (0, 1)])
+        self.assertEqual(Matrix.conrers_for_coord(f, 3, 3), [(2, 2)])
+        self.assertEqual(sorted(Matrix.borders_by_vektor(f, 0, 0, 2, True)), [(0, 2), (1, 0), (1, 1), (1, 2)])
+        self.assertIs(geometry(4, 4), geometry(4, 4))
+        self.assertIn((0, 0), geometry(4, 4).ribs_table)
+
+    def test_lru(self):
+        geometry.cache_clear()
+        for size in range(1, GEOMETRY_CACHE_SIZE + 10):
+            geometry(size, 3)
+        self.assertEqual(geometry.cache_info().currsize, GEOMETRY_CACHE_SIZE)
+
+    def test_not_cached_for_big_fields(self):
+        g = Geometry(1000, 1000)
+        self.assertFalse(g.ribs_table)
+        self.assertEqual(g.ribs(0, 999), ((1, 999), (0, 998)))
+        self.assertEqual(g.corners(0, 999), ((1, 998), ))
+        self.assertEqual(g.borders(0, 0, 1), ((1, 0), (0, 1), (1, 1)))
+        self.assertFalse(g.ribs_table or g.corners_table or g.borders_table)
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from seawar_core.seawar_core import Field, Matrix, ShipService, TargetField
+from seawar_core.instrument import instrument, Instrumentation
+from seawar_core.simulate import play_game
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_game(self):
+        originals = ShipService.__dict__['fire'], Matrix.__dict__['ribs_for_coord'], TargetField.select_cell, Field.get
+        with instrument() as probe:
+            result = play_game(1, [2, 1], (5, 5))
+        stats = probe.snapshot()
+        self.assertEqual(stats['ShipService.fire']['calls'], result.shots)
+        self.assertEqual(stats['TargetField.select_cell']['calls'], result.shots)
+        self.assertEqual(stats['ShipService.put_ships_random']['calls'], 2)
+        self.assertEqual(stats['ShipService.put_ship']['calls'], 4)
+        self.assertGreater(stats['ShipService.put_ships_random']['cells_per_call'], 0)
+        fire = stats['ShipService.fire']
+        self.assertLessEqual(fire['p50_ms'], fire['p99_ms'])
+        self.assertLessEqual(fire['p99_ms'], fire['max_ms'])
+        self.assertEqual(list(stats)[0], max(stats, key=lambda name: stats[name]['total_ms']))
+        self.assertEqual(json.loads(probe.to_json()), stats)
+
+        self.assertEqual(
+            (ShipService.__dict__['fire'], Matrix.__dict__['ribs_for_coord'], TargetField.select_cell, Field.get),
+            originals)
+        self.assertIsNone(Instrumentation.active)
+
+    def test_disabled(self):
+        probe = instrument()
+        ShipService.put_ships_random(Field())
+        self.assertEqual(probe.snapshot(), {})
+
+    def test_targets(self):
+        with instrument({ShipService: ['put_ship']}) as probe:
+            ShipService.put_ship(Field(5, 5), 0, 0, 3)
+            self.assertRaises(RuntimeError, instrument().enable)
+        self.assertEqual(list(probe.snapshot()), ['ShipService.put_ship'])
+        self.assertGreaterEqual(probe.snapshot()['ShipService.put_ship']['cells'], 3)
+
+    def test_unknown_target(self):
+        originals = ShipService.__dict__['put_ship'], Field.get
+        probe = instrument({ShipService: ['put_ship'], TargetField: ['no_such_method']})
+        self.assertRaisesRegex(KeyError, 'TargetField.no_such_method', probe.enable)
+        self.assertIsNone(Instrumentation.active)
+        self.assertEqual((ShipService.__dict__['put_ship'], Field.get), originals)
+        with instrument():
+            pass
+
+    def test_reset_while_enabled(self):
+        with instrument() as probe:
+            play_game(1, [2, 1], (5, 5))
+            probe.reset()
+            self.assertEqual(probe.snapshot(), {})
+            result = play_game(2, [2, 1], (5, 5))
+        self.assertEqual(probe.snapshot()['ShipService.fire']['calls'], result.shots)
@@ -0,0 +1,143 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService
+from seawar_core.bitboard import BitField, BitTargetField
+from seawar_core.density import DensityStrategy
+
+try:
+    from seawar_core.array_field import ArrayField, ArrayTargetField
+except ImportError:
+    ArrayField = ArrayTargetField = None
+
+
+def field_state(field):
+    return ([(c.value, c.is_shooted) for c in field.cells], field.alive_cells, field.fleet_status(),
+            sorted((s.coords, s.alive) for s in field.ships))
+
+
+def target_state(target):
+    return ([c.value for c in target.cells], list(target.probable_cells), list(target.empty_cells),
+            list(getattr(target.strategy, 'heat', [])))
+
+
+class FieldJournalTest(unittest.TestCase):
+
+    def test_rollback(self):
+        random.seed(3)
+        f = Field()
+        ShipService.put_ships_random(f)
+        ShipService.shoot_to(f, 0, 0)
+        before = field_state(f)
+
+        f.checkpoint()
+        for _ in range(30):
+            ShipService.fire(f, random.randrange(10), random.randrange(10))
+        f.set(5, 5, 'ship', True)
+        f.draw_border([(1, 1), (2, 2)])
+        ShipService.put_ship(f, 0, 9, 1)
+        self.assertNotEqual(field_state(f), before)
+        f.rollback()
+        self.assertEqual(field_state(f), before)
+        self.assertIsNone(f.journal)
+
+    def test_overwritten_ship(self):
+        f = Field(5, 5)
+        ShipService.put_ship(f, 1, 1, 3)
+        f.get(1, 1).shoot()
+        before = field_state(f)
+        f.checkpoint()
+        f.set(2, 1, 'empty')
+        self.assertIsNone(f.ships.get(1, 1))
+        f.rollback()
+        self.assertEqual(field_state(f), before)
+        self.assertEqual(f.ships.get(3, 1).alive, 2)
+
+    def test_nested_checkpoints(self):
+        f = Field(5, 5)
+        first = f.checkpoint()
+        f.set(0, 0, 'ship')
+        second = f.checkpoint()
+        f.set(1, 1, 'ship')
+        f.rollback()
+        self.assertEqual(f.get(0, 0).value, 'ship')
+        self.assertEqual(f.get(1, 1).value, 'empty')
+        f.checkpoint()
+        f.get(0, 0).shoot()
+        f.rollback(first)
+        self.assertEqual((f.get(0, 0).value, f.get(0, 0).is_shooted), ('empty', False))
+        self.assertEqual((first, second), (0, 1))
+        self.assertRaises(ValueError, f.rollback)
+
+    def test_commit(self):
+        f = Field(5, 5)
+        f.checkpoint()
+        f.set(0, 0, 'ship')
+        f.checkpoint()
+        f.set(1, 1, 'ship')
+        f.commit()
+        f.rollback()
+        self.assertEqual(f.alive_cells, 0)
+        self.assertIsNone(f.journal)
+        f.commit()
+        self.assertIsNone(f.journal)
+
+
+class SnapshotJournalTest(unittest.TestCase):
+
+    def check_round_trip(self, field_class, target_class):
+        random.seed(4)
+        field, target = field_class(), target_class()
+        ShipService.put_ships_random(field)
+        for _ in range(10):
+            target.apply_outcome(ShipService.fire(field, *target.select_cell()))
+        before = field_state(field), [c.value for c in target.cells]
+
+        first = field.checkpoint()
+        target.checkpoint()
+        for _ in range(15):
+            target.apply_outcome(ShipService.fire(field, *target.select_cell()))
+        middle = field_state(field)
+        second = field.checkpoint()
+        for _ in range(15):
+            ShipService.fire(field, *target.select_cell())
+        ShipService.put_ship(field, 9, 9, 1)
+        field.rollback()
+        self.assertEqual(field_state(field), middle)
+        field.checkpoint()
+        field.set(0, 0, 'border', True)
+        field.commit()
+        self.assertEqual((first, second), (0, 1))
+        field.rollback(first)
+        target.rollback()
+        self.assertEqual((field_state(field), [c.value for c in target.cells]), before)
+        self.assertRaises(ValueError, field.rollback)
+        field.commit()
+
+    def test_bit_field(self):
+        self.check_round_trip(BitField, BitTargetField)
+
+    @unittest.skipIf(ArrayField is None, 'numpy is not installed')
+    def test_array_field(self):
+        self.check_round_trip(ArrayField, ArrayTargetField)
+
+
+class TargetJournalTest(unittest.TestCase):
+
+    def test_rollback(self):
+        for strategy in None, DensityStrategy():
+            rng = random.Random(5)
+            field = Field()
+            ShipService.put_ships_random(field, rng=rng)
+            target = TargetField(strategy=strategy, rng=rng)
+            for _ in range(20):
+                target.apply_outcome(ShipService.fire(field, *target.select_cell()))
+            before = field_state(field), target_state(target)
+
+            field.checkpoint()
+            target.checkpoint()
+            for _ in range(25):
+                target.apply_outcome(ShipService.fire(field, *target.select_cell()))
+            target.rollback()
+            field.rollback()
+            self.assertEqual((field_state(field), target_state(target)), before)
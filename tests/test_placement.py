@@ -0,0 +1,163 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, Matrix, ShipService, STANDART_FLEET
+from seawar_core.placement import layouts_count, PlacementIndex, PlacementSearch, PlacementError, SearchLimitError
+from seawar_core.subset import OrderedSubset
+
+
+class OrderedSubsetTest(unittest.TestCase):
+
+    def test_getitem(self):
+        vektors = OrderedSubset(list('abcdefg'))
+        self.assertEqual(len(vektors), 7)
+        self.assertEqual([vektors[i] for i in range(7)], list('abcdefg'))
+        vektors.discard(0)
+        vektors.discard(3)
+        vektors.discard(3)
+        vektors.discard(6)
+        self.assertEqual(len(vektors), 4)
+        self.assertEqual([vektors[i] for i in range(4)], list('bcef'))
+        self.assertEqual(list(vektors), list('bcef'))
+        with self.assertRaises(IndexError):
+            vektors[4]
+
+    def test_add(self):
+        subset = OrderedSubset(list('abcdefg'), present=False)
+        self.assertEqual(len(subset), 0)
+        for position in (5, 1, 3, 5):
+            subset.add(position)
+        self.assertEqual(len(subset), 3)
+        self.assertEqual([subset[i] for i in range(3)], list('bdf'))
+        self.assertIn(3, subset)
+        self.assertNotIn(4, subset)
+
+    def test_empty_choice(self):
+        with self.assertRaises(IndexError):
+            random.choice(OrderedSubset([]))
+
+
+class PlacementIndexTest(unittest.TestCase):
+
+    def test_discard(self):
+        f = Field(5, 5)
+        index = PlacementIndex(f, [3, 1])
+        ShipService.put_ship(f, 0, 0, 3)
+        index.discard(f.get_ship_by_cell(0, 0) + f.borders_by_vektor(0, 0, 3))
+        for length in (3, 1):
+            self.assertEqual(list(index.vektors(length)), f.get_available_vectors(length))
+        self.assertIsNone(index.vektors(2))
+
+    def test_same_as_full_scan(self):
+        def put_ships_by_scan(field, fleet):
+            for length in fleet:
+                ShipService.put_ship(field, *random.choice(ShipService.get_available_vectors(field, length)))
+
+        for seed in range(20):
+            fields = Field(), Field()
+            random.seed(seed)
+            ShipService.put_ships_random(fields[0])
+            random.seed(seed)
+            put_ships_by_scan(fields[1], STANDART_FLEET)
+            self.assertEqual(
+                [(c.x, c.y, c.value) for c in fields[0].cells],
+                [(c.x, c.y, c.value) for c in fields[1].cells])
+            self.assertIsNone(fields[0].placement_index)
+
+
+class PlacementSearchTest(unittest.TestCase):
+
+    def check_field(self, field, fleet):
+        ships = sorted(len(ship.coords) for ship in field.ships)
+        self.assertEqual(ships, sorted(fleet))
+        self.assertEqual(field.alive_cells, sum(fleet))
+        for ship in field.ships:
+            for x, y in ship.coords:
+                self.assertEqual(ShipService.get_ship_by_cell(field, x, y), ship.coords)
+
+    def test_dense_fleet(self):
+        fleet = [5, 4, 4, 3, 3, 3]
+        for seed in range(5):
+            f = Field(8, 8)
+            vektors = ShipService.put_fleet(f, fleet, random.Random(seed))
+            self.assertEqual([v[2] for v in vektors], sorted(fleet, reverse=True))
+            self.check_field(f, fleet)
+
+    def test_reproducible(self):
+        self.assertEqual(ShipService.put_fleet(Field(), rng=random.Random(3)),
+                         ShipService.put_fleet(Field(), rng=random.Random(3)))
+
+    def test_filled_field(self):
+        f = Field(6, 6)
+        ShipService.put_ship(f, 0, 0, 6)
+        ShipService.put_fleet(f, [3, 3, 2], random.Random(1))
+        self.check_field(f, [6, 3, 3, 2])
+
+    def test_infeasible(self):
+        for fleet, size in ([4, 4, 4, 4, 4], (5, 5)), ([3, 3, 3], (3, 3)), ([7], (6, 6)):
+            f = Field(*size)
+            with self.assertRaises(PlacementError):
+                ShipService.put_fleet(f, fleet)
+            self.assertEqual(len(f.ships), 0)
+
+    def test_dead_ends(self):
+        # two ships of length 3 on 3x4 field leave no place for the third one
+        search = PlacementSearch(3, 4, [3, 3, 1], random.Random(0))
+        self.assertRaises(PlacementError, search.run)
+        self.assertTrue(search.dead)
+        with self.assertRaisesRegex(SearchLimitError, 'after 10 states'):
+            PlacementSearch(7, 7, [3] * 8, max_states=10).run()
+
+    def test_packing(self):
+        # 2 x 4 rectangles of two 3-ships fit in 5 x 5 extended field, of four ones - don't
+        self.assertTrue(PlacementSearch(4, 4, [3, 3]).packable(0, 0))
+        self.assertFalse(PlacementSearch(4, 4, [3, 3, 3, 3]).packable(0, 0))
+        # dense fleets are decided within the default limit of the states
+        self.assertRaises(PlacementError, PlacementSearch(8, 8, [3] * 10, random.Random(0)).run)
+
+
+class LayoutsOracleTest(unittest.TestCase):
+
+    @staticmethod
+    def brute_force(max_x, max_y, fleet):
+        def layouts(field, lengths):
+            if not lengths:
+                yield frozenset()
+                return
+            for vektor in field.get_available_vectors(lengths[0]):
+                child = Field(max_x, max_y)
+                for cell in field.cells:
+                    child.get(cell.x, cell.y).value = cell.value
+                ShipService.put_ship(child, *vektor)
+                ship = frozenset(Matrix.coords_by_vektor(child, *vektor))
+                for rest in layouts(child, lengths[1:]):
+                    yield rest | {ship}
+        return len(set(layouts(Field(max_x, max_y), sorted(fleet, reverse=True))))
+
+    def test_count(self):
+        for max_x, max_y, fleet in (3, 3, [1]), (3, 3, [2]), (3, 3, [1, 1]), (4, 3, [2, 1, 1]), (4, 4, [3, 2]):
+            self.assertEqual(ShipService.count_layouts(max_x, max_y, fleet), self.brute_force(max_x, max_y, fleet))
+        self.assertEqual(ShipService.count_layouts(5, 5, [4, 4, 4, 4, 4]), 0)
+        self.assertEqual(ShipService.count_layouts(3, 3, [1, 1]), 16)
+        self.assertEqual(ShipService.count_layouts(4, 4, [1, 1, 1]), 140)
+        self.assertEqual(ShipService.count_layouts(5, 4, [3, 2, 1]), 988)
+
+    def test_feasible(self):
+        self.assertTrue(ShipService.is_fleet_feasible(10, 10))
+        self.assertTrue(ShipService.is_fleet_feasible(8, 8, [3, 3, 3, 4, 4, 5]))
+        self.assertFalse(ShipService.is_fleet_feasible(3, 4, [3, 3, 1]))
+        self.assertFalse(ShipService.is_fleet_feasible(6, 6, [7]))
+        with self.assertRaises(SearchLimitError):
+            ShipService.is_fleet_feasible(7, 7, [3] * 8, max_states=10)
+
+    def test_cached(self):
+        ShipService.count_layouts(5, 5, [2, 3, 1])
+        hits = layouts_count.cache_info().hits
+        self.assertEqual(ShipService.count_layouts(5, 5, [1, 3, 2]), ShipService.count_layouts(5, 5, [3, 2, 1]))
+        self.assertEqual(layouts_count.cache_info().hits, hits + 2)
+
+    def test_estimate(self):
+        exact = ShipService.count_layouts(5, 5, [3, 2, 1])
+        estimate = ShipService.estimate_layouts(5, 5, [3, 2, 1], samples=3000)
+        self.assertAlmostEqual(estimate / exact, 1, delta=0.1)
+        self.assertEqual(ShipService.estimate_layouts(5, 5, [4, 4, 4, 4, 4]), 0)
@@ -0,0 +1,59 @@
+import unittest
+
+from seawar_core.seawar_core import STANDART_FLEET
+from seawar_core.bitboard import BitField
+from seawar_core.pool import FieldPool
+
+
+class FieldPoolTest(unittest.TestCase):
+
+    def test_miss_and_refill(self):
+        with FieldPool(size=4, low_water=2) as pool:
+            field = pool.acquire([2, 1], (5, 5))
+            self.assertEqual(field.fleet_status()['ships_alive'], 2)
+            self.assertTrue(pool.wait(10))
+            stats = pool.stats()
+            self.assertEqual((stats['acquired'], stats['hits'], stats['generated']), (1, 0, 4))
+            self.assertEqual(stats['buffered'], {((5, 5), (2, 1)): 4})
+
+            for _ in range(3):
+                pool.acquire([2, 1], (5, 5))
+            self.assertTrue(pool.wait(10))
+            stats = pool.stats()
+            self.assertEqual((stats['hits'], stats['hit_rate'], stats['refills']), (3, 0.75, 2))
+            self.assertEqual(stats['buffered'][((5, 5), (2, 1))], 4)
+            self.assertGreater(stats['refill_lag_max'], 0)
+
+    def test_warm_up(self):
+        with FieldPool(size=3, field_class=BitField) as pool:
+            self.assertTrue(pool.warm_up(timeout=10))
+            field = pool.acquire()
+            self.assertIsInstance(field, BitField)
+            self.assertEqual(len(field.ships), len(STANDART_FLEET))
+            self.assertEqual(pool.stats()['hit_rate'], 1.)
+
+    def test_seed(self):
+        layouts = []
+        for _ in range(2):
+            with FieldPool(size=3, seed=7) as pool:
+                pool.warm_up([3, 2, 1], (6, 6), timeout=10)
+                layouts.append([pool.acquire([3, 2, 1], (6, 6)).to_bytes() for _ in range(3)])
+        self.assertEqual(layouts[0], layouts[1])
+
+    def test_fields_are_not_shared(self):
+        with FieldPool(size=5) as pool:
+            pool.warm_up(timeout=10)
+            fields = [pool.acquire() for _ in range(5)]
+            self.assertEqual(len(set(map(id, fields))), 5)
+
+    def test_refill_error(self):
+        with FieldPool(size=2) as pool:
+            self.assertRaises(IndexError, pool.acquire, [4, 4, 4], (4, 4))
+            self.assertTrue(pool.wait(10))
+            self.assertIn('IndexError', pool.stats()['errors'][((4, 4), (4, 4, 4))])
+
+            pool.acquire([1], (3, 3))
+            self.assertTrue(pool.wait(10))
+            stats = pool.stats()
+            self.assertEqual(stats['buffered'][((3, 3), (1, ))], 2)
+            self.assertEqual(list(stats['errors']), [((4, 4), (4, 4, 4))])
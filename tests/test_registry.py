@@ -0,0 +1,103 @@
+import unittest
+
+from seawar_core.seawar_core import Field, ShipService, Matrix
+from seawar_core.bitboard import BitField
+from seawar_core.registry import ShipRegistry
+
+
+class ShipRegistryTest(unittest.TestCase):
+
+    def test_add_and_hit(self):
+        registry = ShipRegistry()
+        ship = registry.add([(1, 1), (1, 2)], [(0, 0)])
+        self.assertIs(registry.get(1, 2), ship)
+        self.assertIsNone(registry.get(0, 0))
+        self.assertIs(registry.hit(1, 1), ship)
+        self.assertFalse(ship.is_killed)
+        registry.hit(1, 2)
+        registry.hit(1, 2)
+        self.assertEqual(ship.alive, 0)
+        self.assertTrue(ship.is_killed)
+        self.assertIsNone(registry.hit(5, 5))
+
+
+class ShipServiceRegistryTest(unittest.TestCase):
+
+    def test_put_ship_registers(self):
+        f = Field(5, 5)
+        ShipService.put_ship(f, 1, 1, 3)
+        ShipService.put_ship(f, 0, 4, 1)
+        self.assertEqual(len(f.ships), 2)
+        ship = f.ships.get(2, 1)
+        self.assertEqual(ship.coords, [(1, 1), (2, 1), (3, 1)])
+        self.assertEqual(set(ship.border), set(Matrix.borders_by_vektor(f, 1, 1, 3)))
+        self.assertEqual(ShipService.get_ship_by_cell(f, 3, 1), [(1, 1), (2, 1), (3, 1)])
+
+    def test_kill_by_counter(self):
+        for f in Field(5, 5), BitField(5, 5):
+            ShipService.put_ship(f, 1, 1, 2, True)
+            self.assertTrue(ShipService.shoot_to(f, 1, 1))
+            self.assertTrue(ShipService.shoot_to(f, 1, 1))
+            self.assertEqual(f.ships.get(1, 1).alive, 1)
+            self.assertEqual(ShipService.get_ship_if_killed(f, 1, 1), {})
+
+            self.assertTrue(ShipService.shoot_to(f, 1, 2))
+            killed = ShipService.get_ship_if_killed(f, 1, 2)
+            self.assertEqual(killed['ship'], [(1, 1), (1, 2)])
+            self.assertEqual(set(killed['border']), set(Matrix.borders_by_vektor(f, 1, 1, 2, True)))
+
+
+class FleetStatusTest(unittest.TestCase):
+
+    def fields(self):
+        fields = [Field(6, 6), BitField(6, 6)]
+        try:
+            from seawar_core.array_field import ArrayField
+            fields.append(ArrayField(6, 6))
+        except ImportError:
+            pass
+        return fields
+
+    def test_alive_cells(self):
+        f = Field(5, 5)
+        f.draw_ship([(1, 1), (1, 2)])
+        f.set(3, 3, 'ship')
+        self.assertEqual(f.alive_cells, 3)
+        f.get(1, 1).shoot()
+        f.get(1, 1).shoot()
+        self.assertEqual(f.alive_cells, 2)
+        f.set(1, 2, 'border')
+        self.assertEqual(f.alive_cells, 1)
+        f.set(1, 1, 'ship', False)
+        self.assertEqual(f.alive_cells, 2)
+        f.set(3, 3, 'ship', True)
+        f.set(1, 1, 'empty')
+        self.assertEqual(f.alive_cells, 0)
+        self.assertTrue(ShipService.is_fleet_killed(f))
+
+    def test_fleet_status(self):
+        for f in self.fields():
+            ShipService.put_ship(f, 0, 0, 3)
+            ShipService.put_ship(f, 0, 2, 1)
+            ShipService.put_ship(f, 5, 0, 1)
+            self.assertEqual(f.fleet_status(), dict(ships_alive=3, cells_alive=5, sunk={}))
+
+            ShipService.shoot_to(f, 0, 2)
+            ShipService.shoot_to(f, 1, 0)
+            ShipService.shoot_to(f, 1, 0)
+            ShipService.shoot_to(f, 4, 4)
+            self.assertEqual(f.fleet_status(), dict(ships_alive=2, cells_alive=3, sunk={1: 1}))
+
+            ShipService.shoot_to(f, 5, 0)
+            f.get(0, 0).shoot()
+            f.get(2, 0).shoot()
+            self.assertEqual(f.fleet_status(), dict(ships_alive=0, cells_alive=0, sunk={1: 2, 3: 1}))
+            self.assertTrue(ShipService.is_fleet_killed(f))
+
+    def test_erased_ship(self):
+        for f in self.fields():
+            ShipService.put_ship(f, 0, 0, 2)
+            ShipService.shoot_to(f, 0, 0)
+            f.set(1, 0, 'border')
+            self.assertEqual(f.fleet_status(), dict(ships_alive=0, cells_alive=0, sunk={}))
+            self.assertEqual(ShipService.get_ship_if_killed(f, 0, 0)['ship'], [(0, 0)])
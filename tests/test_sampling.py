@@ -0,0 +1,77 @@
+import gc
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService
+from seawar_core.sampling import SamplingStrategy, sample_layouts
+
+from .helpers import play
+
+
+class SampleLayoutsTest(unittest.TestCase):
+
+    def test_hit_is_covered(self):
+        # 3x3 field, ship of length 2 is hit on (0, 0), (1, 0) is missed: ship is only (0, 0) - (0, 1)
+        counts, accepted = sample_layouts(3, 3, (2,), 1 << 1, 1 << 0, 50, 1)
+        self.assertEqual(accepted, 50)
+        self.assertEqual(counts, [0, 0, 0, 50, 0, 0, 0, 0, 0])
+
+    def test_blocked_cells(self):
+        blocked = sum(1 << position for position in (0, 4, 8))
+        counts, accepted = sample_layouts(3, 3, (2,), blocked, 0, 100, 2)
+        self.assertEqual(accepted, 100)
+        self.assertEqual([counts[p] for p in (0, 4, 8)], [0, 0, 0])
+        self.assertEqual(sum(counts), 200)
+
+    def test_impossible(self):
+        self.assertEqual(sample_layouts(3, 3, (3, 3, 3), 0, 0, 20, 3), ([0] * 9, 0))
+
+
+class SamplingStrategyTest(unittest.TestCase):
+
+    def test_hit_neighbour(self):
+        target = TargetField(3, 3, SamplingStrategy([2], time_budget=None, max_samples=200))
+        target.shoot_response(0, 0, True)
+        target.shoot_response(1, 0, False)
+        self.assertEqual(target.select_cell(), (0, 1))
+
+    def test_killed_ship_is_blocked(self):
+        strategy = SamplingStrategy([2, 1], time_budget=None, max_samples=100)
+        target = TargetField(4, 1, strategy)
+        target.shoot_response(0, 0, True)
+        target.mark_killed([(1, 0)], [(0, 0)])
+        self.assertEqual(strategy.observations(target), ((2,), 0b11, 0))
+        # the rest of the 2-ship covers both free cells in every sample
+        self.assertIn(target.select_cell(), [(2, 0), (3, 0)])
+
+    def test_game(self):
+        rng = random.Random(4)
+        field = Field(6, 6)
+        ShipService.put_ships_random(field, [3, 2, 1], rng)
+        target = TargetField(6, 6, SamplingStrategy([3, 2, 1], time_budget=None, max_samples=100), rng=rng)
+        self.assertLess(play(field, target), 36)
+        self.assertTrue(ShipService.is_fleet_killed(field))
+
+    def test_pool(self):
+        strategy = SamplingStrategy([2], workers=2, time_budget=5, max_samples=300)
+        try:
+            target = TargetField(3, 3, strategy)
+            target.shoot_response(0, 0, True)
+            target.shoot_response(1, 0, False)
+            self.assertEqual(target.select_cell(), (0, 1))
+        finally:
+            strategy.close()
+
+    def test_pool_lifetime(self):
+        with SamplingStrategy([2], workers=2, time_budget=5, max_samples=100) as strategy:
+            TargetField(3, 3, strategy).select_cell()
+            pool = strategy.pool
+        self.assertIsNone(strategy.pool)
+        self.assertTrue(pool._shutdown_thread)
+
+        target = TargetField(3, 3, SamplingStrategy([2], workers=2, time_budget=5, max_samples=100))
+        target.select_cell()
+        pool = target.strategy.pool
+        del target
+        gc.collect()
+        self.assertTrue(pool._shutdown_thread)
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, TargetField, ShipService, SERIAL_HEADER
+from seawar_core.bitboard import BitField
+from seawar_core.density import DensityStrategy
+
+
+def state(field):
+    return [(c.value, c.is_shooted) for c in field.cells], field.fleet_status()
+
+
+class FieldSerializeTest(unittest.TestCase):
+
+    def field(self, seed=1):
+        rng = random.Random(seed)
+        f = Field()
+        ShipService.put_ships_random(f, rng=rng)
+        for _ in range(40):
+            ShipService.fire(f, rng.randrange(10), rng.randrange(10))
+        return f
+
+    def test_round_trip(self):
+        f = self.field()
+        data = f.to_bytes()
+        self.assertEqual(len(data), 44)
+        restored = Field.from_bytes(data)
+        self.assertEqual(state(restored), state(f))
+        self.assertEqual(sorted((s.coords, s.alive) for s in restored.ships),
+                         sorted((s.coords, s.alive) for s in f.ships))
+        self.assertEqual(restored.to_bytes(), data)
+
+    def test_other_engine(self):
+        f = self.field(2)
+        self.assertEqual(state(BitField.from_bytes(f.to_bytes())), state(f))
+        self.assertEqual(state(Field.from_bytes(BitField.from_bytes(f.to_bytes()).to_bytes())), state(f))
+
+    def test_iter_from_bytes(self):
+        fields = [self.field(seed) for seed in range(5)] + [Field(3, 7)]
+        data = bytearray(b''.join(f.to_bytes() for f in fields))
+        self.assertEqual([state(f) for f in Field.iter_from_bytes(data)], [state(f) for f in fields])
+
+    def test_bad_data(self):
+        data = self.field().to_bytes()
+        self.assertRaises(ValueError, Field.from_bytes, data[:-1])
+        self.assertRaises(ValueError, Field.from_bytes, data + b'\0')
+        self.assertRaises(ValueError, Field.from_bytes, b'\2' + data[1:])
+        self.assertRaises(ValueError, TargetField.from_bytes, data)
+        self.assertRaises(ValueError, Field.from_bytes, SERIAL_HEADER.pack(1, 0, 1, 1) + b'\6')
+
+
+class TargetFieldSerializeTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = random.Random(3)
+        f = Field()
+        ShipService.put_ships_random(f, rng=rng)
+        target = TargetField(rng=rng)
+        for _ in range(30):
+            target.apply_outcome(ShipService.fire(f, *target.select_cell()))
+        restored = TargetField.from_bytes(target.to_bytes(), strategy=DensityStrategy())
+        self.assertEqual([c.value for c in restored.cells], [c.value for c in target.cells])
+        self.assertEqual(list(restored.probable_cells), list(target.probable_cells))
+        self.assertEqual(list(restored.empty_cells), list(target.empty_cells))
+        self.assertIsInstance(restored.strategy, DensityStrategy)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from seawar_core.seawar_core import Outcome
+from seawar_core.server import SessionManager
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class SessionManagerTest(unittest.TestCase):
+
+    def test_game(self):
+        async def play():
+            manager = SessionManager()
+            session_id = await manager.create((5, 5), [2, 1], seed=3)
+            self.assertEqual(len(manager), 1)
+            session = manager.sessions[session_id]
+            self.assertEqual(session.enemy.fleet_status()['ships_alive'], 2)
+
+            responses = []
+            for x, y in [(c.x, c.y) for c in session.enemy.iter_cells()]:
+                responses.append(await manager.shoot(session_id, x, y))
+                if responses[-1]['winner']:
+                    break
+            status = await manager.status(session_id)
+            await manager.close(session_id)
+            return responses, status, len(manager)
+
+        responses, status, sessions = run(play())
+        self.assertEqual(sessions, 0)
+        self.assertEqual(status['winner'], responses[-1]['winner'])
+        self.assertEqual(status['shots'][0], len(responses))
+        self.assertEqual(status['shots'][1], sum(len(r['replies']) for r in responses))
+        for response in responses:
+            if response['result'] == Outcome.MISS and not response['winner']:
+                self.assertEqual(response['replies'][-1]['result'], Outcome.MISS)
+            elif response['result'] != Outcome.MISS:
+                self.assertEqual(response['replies'], [])
+
+    def test_errors(self):
+        async def requests():
+            manager = SessionManager(max_sessions=1)
+            session_id = (await manager.handle(dict(id=1, cmd='create', board_size=[5, 5], fleet=[2])))['session']
+            return [await manager.handle(request) for request in (
+                dict(id=2, cmd='create'),
+                dict(id=3, cmd='shoot', session=session_id, x=9, y=0),
+                dict(id=4, cmd='shoot', session=session_id + 1, x=0, y=0),
+                dict(id=5, cmd='shoot', session=session_id),
+                dict(id=6, cmd='jump'),
+                dict(id=7, cmd='close', session=session_id),
+                dict(id=8, cmd='create', board_size=[3, 3], fleet=[3, 3, 3]),
+            )]
+
+        responses = run(requests())
+        self.assertEqual([r['id'] for r in responses], list(range(2, 9)))
+        self.assertEqual([r['ok'] for r in responses], [False] * 5 + [True, False])
+        self.assertEqual(responses[0]['error'], 'Too many sessions')
+        self.assertEqual(responses[2]['error'], 'Unknown session: 2')
+        self.assertEqual(responses[4]['error'], 'Unknown command: jump')
+        self.assertIn('can not be placed', responses[6]['error'])
+
+    def test_concurrent_creates(self):
+        async def requests():
+            manager = SessionManager(max_sessions=2)
+            return await asyncio.gather(*(manager.handle(dict(id=i, cmd='create', board_size=[5, 5], fleet=[2]))
+                                          for i in range(5))), len(manager)
+
+        responses, sessions = run(requests())
+        self.assertEqual(sum(r['ok'] for r in responses), 2)
+        self.assertEqual(sessions, 2)
+
+    def test_search_limit(self):
+        async def requests():
+            manager = SessionManager(max_search_states=1)
+            return await manager.handle(dict(id=1, cmd='create', board_size=[5, 5], fleet=[2, 2])), len(manager)
+
+        response, sessions = run(requests())
+        self.assertFalse(response['ok'])
+        self.assertIn('too hard to place', response['error'])
+        self.assertEqual(sessions, 0)
+
+    def test_limits(self):
+        async def requests():
+            manager = SessionManager(max_board_area=400, max_ship_length=5)
+            return [await manager.handle(dict(id=i, cmd='create', **request)) for i, request in enumerate((
+                dict(board_size=[70000, 1]),
+                dict(board_size=[30, 30]),
+                dict(board_size=[10]),
+                dict(board_size=[10, '10']),
+                dict(board_size=[0, 10]),
+                dict(fleet=[0]),
+                dict(fleet=[-1, 2]),
+                dict(fleet=[6]),
+                dict(fleet=[True]),
+                dict(fleet=[]),
+                dict(fleet=5),
+                dict(board_size=[20, 20], fleet=[5, 5, 1]),
+            ))] + [await manager.handle(dict(id='x', cmd='shoot', session=1, x=float('inf'), y=0))]
+
+        responses = run(requests())
+        self.assertEqual([r['ok'] for r in responses], [False] * 11 + [True, False])
+        self.assertTrue(all(r['error'].startswith('Board size') for r in responses[:5]))
+        self.assertTrue(all(r['error'].startswith('Fleet should be') for r in responses[5:11]))
+        self.assertEqual(responses[-1]['id'], 'x')
+
+    def test_internal_error(self):
+        async def requests():
+            manager = SessionManager()
+            session_id = await manager.create((3, 3), [1])
+            manager.sessions[session_id].enemy = None
+            return await manager.handle(dict(id=1, cmd='shoot', session=session_id, x=0, y=0))
+
+        with self.assertLogs('seawar_core.server', 'ERROR'):
+            response = run(requests())
+        self.assertEqual(response, dict(id=1, ok=False, error='Internal error: AttributeError'))
+
+    def test_same_seed(self):
+        async def fields():
+            manager = SessionManager()
+            sessions = [manager.sessions[await manager.create(seed=7)] for _ in range(2)]
+            return [(str(s.field), str(s.enemy), s.target.select_cell()) for s in sessions]
+
+        first, second = run(fields())
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], first[1])
+
+
+class ServerTest(unittest.TestCase):
+
+    async def talk(self, reader, writer, requests):
+        for request in requests:
+            writer.write(request if isinstance(request, bytes) else json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        await writer.wait_closed()
+        return sorted(responses, key=lambda r: r['id'] or 0)
+
+    def check(self, responses):
+        self.assertEqual([r['ok'] for r in responses], [False, True, True, True])
+        self.assertTrue(responses[0]['error'].startswith('Bad JSON'))
+        self.assertEqual(responses[1]['winner'], None)
+        self.assertEqual({responses[2]['session'], responses[3]['session']}, {2, 3})
+
+    def requests(self):
+        return [b'{bad\n', dict(id=1, cmd='status', session=1), dict(id=2, cmd='create', fleet=[1], board_size=[3, 3]),
+                dict(id=3, cmd='create', fleet=[1], board_size=[3, 3])]
+
+    def test_tcp(self):
+        async def session():
+            manager = SessionManager()
+            await manager.create((3, 3), [1])
+            server = await manager.start(port=0)
+            async with server:
+                return await self.talk(*await asyncio.open_connection(*server.sockets[0].getsockname()[:2]),
+                                       self.requests())
+        self.check(run(session()))
+
+    @unittest.skipIf(not hasattr(asyncio, 'start_unix_server'), 'Unix sockets are not supported')
+    def test_unix(self):
+        async def session(path):
+            manager = SessionManager()
+            await manager.create((3, 3), [1])
+            server = await manager.start(path=path)
+            async with server:
+                return await self.talk(*await asyncio.open_unix_connection(path), self.requests())
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.check(run(session(os.path.join(directory, 'seawar.sock'))))
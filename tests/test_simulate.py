@@ -0,0 +1,40 @@
+import unittest
+
+from seawar_core.density import DensityStrategy
+from seawar_core.simulate import game_seed, play_game, simulate, simulate_iter
+
+
+class SimulateTest(unittest.TestCase):
+
+    def test_game_seed(self):
+        self.assertEqual(game_seed(1, 5), game_seed(1, 5))
+        self.assertNotEqual(game_seed(1, 5), game_seed(1, 6))
+        self.assertNotEqual(game_seed(1, 5), game_seed(2, 5))
+
+    def test_replay(self):
+        first, second = play_game(42), play_game(42)
+        self.assertEqual(
+            (first.winner, first.turns, first.shots, first.hits),
+            (second.winner, second.turns, second.shots, second.hits))
+        self.assertGreaterEqual(first.hits, 20)
+
+    def test_small_board(self):
+        result = play_game(1, fleet=[2, 1], board_size=(4, 3), strategy=DensityStrategy)
+        self.assertLessEqual(result.shots, 2 * 12)
+
+    def test_same_stats_for_any_workers(self):
+        single = simulate(12, workers=1, seed=7).as_dict()
+        pooled = simulate(12, workers=2, seed=7).as_dict()
+        for stats in single, pooled:
+            stats.pop('ms_per_game')
+        self.assertEqual(single, pooled)
+        self.assertEqual(single['games'], 12)
+        self.assertEqual(sum(single['wins']), 12)
+
+    def test_longest_game_is_replayable(self):
+        stats = simulate(10, workers=1, seed=3)
+        self.assertEqual(play_game(stats.longest_seed).turns, stats.max_turns)
+
+    def test_stream(self):
+        games = [stats.games for stats in simulate_iter(25, workers=1, seed=1, chunk_size=10)]
+        self.assertEqual(games, [10, 20, 25])
@@ -0,0 +1,107 @@
+import random
+import unittest
+
+from seawar_core.seawar_core import Field, Matrix, ShipService, Outcome, STANDART_FLEET
+from seawar_core.density import DensityStrategy
+from seawar_core.sparse import SparseField, SparseTargetField
+
+
+class SparseFieldTest(unittest.TestCase):
+
+    def test_cells(self):
+        f = SparseField(5, 4)
+        self.assertEqual(len(f.cells), 20)
+        f.set(1, 2, 'ship', True)
+        f.draw_border([(0, 0), (1, 0)])
+        self.assertEqual(f.get(1, 2).value, 'ship')
+        self.assertTrue(f.get(1, 2).is_shooted)
+        self.assertEqual(len(f.occupied_cells), 3)
+        self.assertEqual(f.alive_cells, 0)
+        f.get(0, 0).mark_empty()
+        self.assertEqual(len(f.values), 2)
+
+    def test_same_as_field(self):
+        rng = random.Random(1)
+        sparse = SparseField()
+        ShipService.put_ships_random(sparse, rng=rng)
+        field = Field()
+        for ship in sparse.ships:
+            ShipService.put_ship(field, *Matrix.vektor_by_coords(ship.coords))
+        self.assertEqual([c.value for c in sparse.cells], [c.value for c in field.cells])
+        for _ in range(150):
+            x, y = rng.randrange(10), rng.randrange(10)
+            self.assertEqual(ShipService.fire(sparse, x, y), ShipService.fire(field, x, y))
+            self.assertEqual(sparse.fleet_status(), field.fleet_status())
+
+    def test_big_field(self):
+        f = SparseField(3000, 3000)
+        ShipService.put_ships_random(f, STANDART_FLEET * 50, random.Random(2))
+        self.assertEqual(len(f.ships), 500)
+        self.assertEqual(f.alive_cells, sum(STANDART_FLEET) * 50)
+        self.assertLess(len(f.values), 500 * 20)
+        for ship in list(f.ships):
+            for x, y in ship.coords:
+                ShipService.shoot_to(f, x, y)
+        self.assertTrue(ShipService.is_fleet_killed(f))
+        self.assertEqual(f.fleet_status()['ships_alive'], 0)
+
+    def test_dense_fleet(self):
+        f = SparseField(4, 1)
+        ShipService.put_ships_random(f, [2, 1], random.Random(3))
+        self.assertEqual(f.alive_cells, 3)
+        self.assertRaises(IndexError, ShipService.put_ship_random, f, 1)
+
+    def test_rollback(self):
+        rng = random.Random(6)
+        f, target = SparseField(1000, 1000), SparseTargetField(1000, 1000, rng=rng)
+        ShipService.put_ships_random(f, STANDART_FLEET, rng)
+        ship = f.ships.ships[0]
+        target.apply_outcome(ShipService.fire(f, *ship.coords[0]))
+        before = (dict(f.values), set(f.shot), f.fleet_status(), dict(target.values), list(target.probable))
+
+        f.checkpoint()
+        target.checkpoint()
+        for x, y in ship.coords[1:] + [(999, 999)]:
+            target.apply_outcome(ShipService.fire(f, x, y))
+        ShipService.put_ship(f, 0, 999, 2)
+        self.assertEqual(f.fleet_status()['sunk'], {len(ship.coords): 1})
+        f.rollback()
+        target.rollback()
+        self.assertEqual((dict(f.values), set(f.shot), f.fleet_status(), dict(target.values), list(target.probable)),
+                         before)
+        self.assertEqual(f.ships.get(*ship.coords[0]).alive, len(ship.coords) - 1)
+
+
+class SparseTargetFieldTest(unittest.TestCase):
+
+    def test_game(self):
+        rng = random.Random(4)
+        field = SparseField(200, 200)
+        ShipService.put_ships_random(field, rng=rng)
+        target = SparseTargetField(200, 200, rng=rng)
+        shots = 0
+        while True:
+            outcome = ShipService.fire(field, *target.select_cell())
+            target.apply_outcome(outcome)
+            shots += 1
+            if outcome.result == Outcome.WIN:
+                break
+            if outcome.is_hit and not outcome.is_killed:
+                self.assertTrue(target.probable)
+        self.assertLessEqual(len(target.values), shots + 8 * sum(STANDART_FLEET))
+
+    def test_select_probable(self):
+        target = SparseTargetField(5, 5)
+        target.shoot_response(0, 0, True)
+        self.assertIn(target.select_cell(), [(1, 0), (0, 1)])
+        self.assertEqual(target.get(1, 1).value, 'border')
+        self.assertRaises(ValueError, SparseTargetField, 5, 5, DensityStrategy())
+
+
+class SparseViewsTest(unittest.TestCase):
+
+    def test_cells_by_value(self):
+        f = SparseField(6, 6)
+        f.draw_ship([(4, 1), (0, 3), (2, 0)])
+        self.assertEqual([(c.x, c.y) for c in f.cells_by_value('ship')], [(2, 0), (4, 1), (0, 3)])
+        self.assertEqual(len(list(f.cells_by_value('empty'))), 33)